@@ -0,0 +1,26 @@
+import os
+from celery import Celery
+from celery.signals import beat_init, worker_init
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+
+app = Celery('config')
+
+# settings.py의 CELERY_ 접두사 설정 사용
+app.config_from_object('django.conf:settings', namespace='CELERY')
+app.autodiscover_tasks()
+
+
+@worker_init.connect
+@beat_init.connect
+def require_shared_cache(**kwargs):
+    """
+    워커/비트가 바꾼 캐시와 리더보드를 웹 프로세스가 볼 수 있도록 공유 저장소 없이는 시작하지 않음
+
+    Celery 시그널 핸들러의 예외는 로그만 남기므로 SystemExit로 종료합니다.
+    """
+    from django.conf import settings
+    if not settings.REDIS_CACHE_URL:
+        raise SystemExit('Celery 워커/비트를 실행하려면 REDIS_CACHE_URL로 공유 캐시를 설정해야 합니다.')
+    if not settings.SORTED_SET_REDIS_URL:
+        raise SystemExit('Celery 워커/비트를 실행하려면 SORTED_SET_REDIS_URL로 리더보드 저장소를 설정해야 합니다.')
@@ -0,0 +1,62 @@
+"""
+상세 조회 API용 조건부 GET (ETag)
+
+뷰는 get_validators()에서 응답 내용을 결정하는 수정 시각/개수 값을
+가벼운 쿼리 한 번으로 모아 반환합니다. 값이 같으면 시리얼라이저를 실행하지 않고
+304를 돌려줍니다.
+
+Last-Modified는 보내지 않습니다. 남아 있는 행의 최근 수정 시각만으로는
+참가자/팀원/리뷰 삭제나 요청자별 차이(is_joined 등)를 나타낼 수 없어
+If-Modified-Since만 보내는 클라이언트가 오래된 응답을 재사용하게 되기 때문입니다.
+"""
+import hashlib
+from django.db.models import F, Func, IntegerField, Subquery
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import quote_etag
+
+
+def latest_change(queryset, field='updated_at'):
+    """
+    queryset 중 가장 최근 수정 시각을 반환하는 스칼라 서브쿼리
+    """
+    return Subquery(
+        queryset.order_by().annotate(latest=Func(F(field), function='MAX')).values('latest')[:1]
+    )
+
+
+def row_count(queryset):
+    """
+    queryset 행 수를 반환하는 스칼라 서브쿼리 (삭제 감지용)
+    """
+    return Subquery(
+        queryset.order_by().annotate(total=Func(F('pk'), function='COUNT')).values('total')[:1],
+        output_field=IntegerField()
+    )
+
+
+class ConditionalRetrieveMixin:
+    """
+    RetrieveAPIView에 ETag 검사를 추가하는 믹스인
+    """
+    def get_validators(self):
+        """
+        응답을 결정하는 값들의 dict (객체가 없으면 None)
+        """
+        raise NotImplementedError
+
+    def retrieve(self, request, *args, **kwargs):
+        validators = self.get_validators()
+        if validators is None:
+            # 404 등은 기존 흐름에 맡김
+            return super().retrieve(request, *args, **kwargs)
+
+        # is_joined, is_member 처럼 요청자에 따라 응답이 달라지므로 사용자도 포함
+        signature = repr((request.user.pk, sorted(validators.items())))
+        etag = quote_etag(hashlib.sha1(signature.encode()).hexdigest())
+
+        response = get_conditional_response(request._request, etag=etag)
+        if response is None:
+            response = super().retrieve(request, *args, **kwargs)
+        response['ETag'] = etag
+        patch_vary_headers(response, ['Authorization'])
+        return response
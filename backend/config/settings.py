@@ -13,6 +13,8 @@ https://docs.djangoproject.com/en/5.1/ref/settings/
 import os
 from pathlib import Path
 import dj_database_url
+from celery.schedules import crontab
+from django.core.exceptions import ImproperlyConfigured
 from dotenv import load_dotenv
 
 # .env 파일 로드
@@ -181,3 +183,58 @@ CELERY_ACCEPT_CONTENT = ['json']
 CELERY_TASK_SERIALIZER = 'json'
 CELERY_RESULT_SERIALIZER = 'json'
 CELERY_TIMEZONE = 'Asia/Seoul'
+# 공유 캐시(REDIS_CACHE_URL)가 없으면 워커 없이 요청 프로세스에서 즉시 실행 (테스트/로컬)
+REDIS_CACHE_URL = os.getenv('REDIS_CACHE_URL')
+CELERY_TASK_ALWAYS_EAGER = os.getenv('CELERY_TASK_ALWAYS_EAGER', '0' if REDIS_CACHE_URL else '1') == '1'
+
+CELERY_BEAT_SCHEDULE = {
+    # 종료된 매치 상태 전환
+    'transition-match-statuses': {
+        'task': 'matches.tasks.transition_match_statuses',
+        'schedule': 300.0,
+    },
+    # 매치 추천 후보 집합 (날짜 × 지역) 갱신
+    'build-recommendation-candidates': {
+        'task': 'matches.tasks.build_recommendation_candidates',
+        'schedule': 300.0,
+    },
+    # 팀 매치메이킹 대기열 매칭
+    'run-matchmaking-queue': {
+        'task': 'matches.tasks.run_matchmaking_queue',
+        'schedule': 60.0,
+    },
+    # 구장 일간 통계 (지난 며칠 + 오늘) 재집계
+    'refresh-recent-venue-stats': {
+        'task': 'venues.tasks.refresh_recent_venue_stats',
+        'schedule': crontab(hour=0, minute=10),
+    },
+}
+
+# 캐시 설정 (REDIS_CACHE_URL이 없으면 로컬 메모리 캐시 사용)
+# 캐시 버전 키(매치 목록, 예약 현황, 공간 인덱스 등)는 Celery 작업에서도 올리므로
+# 워커를 쓰는 경우 웹 프로세스와 워커가 같은 캐시를 봐야 함
+if not CELERY_TASK_ALWAYS_EAGER and not REDIS_CACHE_URL:
+    raise ImproperlyConfigured(
+        'Celery 워커를 사용하려면(CELERY_TASK_ALWAYS_EAGER=0) REDIS_CACHE_URL로 공유 캐시를 설정해야 합니다.'
+    )
+if REDIS_CACHE_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_CACHE_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
+# 리더보드 정렬 집합 저장소 (없으면 프로세스 메모리 사용)
+# 리더보드는 Celery 작업에서도 갱신하므로 워커를 쓰는 경우 Redis가 필요함
+# (빈 값으로 지정해도 공유 캐시의 Redis를 사용하고, 워커/비트는 시작 시 확인)
+SORTED_SET_REDIS_URL = os.getenv('SORTED_SET_REDIS_URL') or REDIS_CACHE_URL
+
+# 매치 목록 응답 캐시 유지 시간(초)
+MATCH_FEED_CACHE_TIMEOUT = int(os.getenv('MATCH_FEED_CACHE_TIMEOUT', '60'))
@@ -0,0 +1,183 @@
+"""
+정렬 집합(sorted set) 저장소
+
+멤버별 점수를 보관하고 점수 내림차순 상위 K개 조회, 특정 점수보다 높은 멤버 수 조회를
+제공합니다. SORTED_SET_REDIS_URL이 있으면 Redis ZSET(skiplist, 갱신/순위 O(log n))을,
+없으면 프로세스 메모리의 정렬 리스트(bisect, 순위 O(log n))를 사용합니다.
+메모리 저장소는 프로세스마다 따로 유지되므로 개발/테스트 또는 단일 프로세스용이며,
+Celery 워커/비트는 Redis 저장소 없이는 시작하지 않습니다. (config.celery 참고)
+"""
+import bisect
+import threading
+from django.conf import settings
+
+_stores = {}
+
+
+class BaseSortedSet:
+    """
+    정렬 집합 공통 인터페이스 (멤버는 문자열로 저장)
+    """
+
+    def add(self, key, mapping):
+        """
+        {멤버: 점수}를 추가하거나 점수를 갱신
+        """
+        raise NotImplementedError
+
+    def remove(self, key, members):
+        raise NotImplementedError
+
+    def replace(self, key, items):
+        """
+        (멤버, 점수) 이터러블로 집합 전체를 교체
+        """
+        raise NotImplementedError
+
+    def delete(self, *keys):
+        raise NotImplementedError
+
+    def score(self, key, member):
+        """
+        멤버 점수 (없으면 None)
+        """
+        raise NotImplementedError
+
+    def count_above(self, key, score):
+        """
+        score보다 점수가 높은 멤버 수
+        """
+        raise NotImplementedError
+
+    def top(self, key, count, offset=0):
+        """
+        점수 내림차순 offset번째부터 count개의 (멤버, 점수) 목록
+        """
+        raise NotImplementedError
+
+    def size(self, key):
+        raise NotImplementedError
+
+
+class LocalSortedSet(BaseSortedSet):
+    """
+    프로세스 메모리 정렬 집합
+
+    (-점수, 멤버) 정렬 리스트와 멤버별 점수 사전을 함께 유지합니다.
+    조회는 bisect로 O(log n)이고, 갱신은 리스트 삽입/삭제 때문에 O(n) 메모리 이동이 생깁니다.
+    """
+
+    def __init__(self):
+        self._sets = {}
+        self._lock = threading.Lock()
+
+    def _get(self, key):
+        return self._sets.setdefault(key, ([], {}))
+
+    def add(self, key, mapping):
+        with self._lock:
+            entries, scores = self._get(key)
+            for member, score in mapping.items():
+                member, score = str(member), float(score)
+                if member in scores:
+                    del entries[bisect.bisect_left(entries, (-scores[member], member))]
+                bisect.insort(entries, (-score, member))
+                scores[member] = score
+
+    def remove(self, key, members):
+        with self._lock:
+            entries, scores = self._get(key)
+            for member in map(str, members):
+                if member in scores:
+                    del entries[bisect.bisect_left(entries, (-scores.pop(member), member))]
+
+    def replace(self, key, items):
+        scores = {str(member): float(score) for member, score in items}
+        entries = sorted((-score, member) for member, score in scores.items())
+        with self._lock:
+            self._sets[key] = (entries, scores)
+
+    def delete(self, *keys):
+        with self._lock:
+            for key in keys:
+                self._sets.pop(key, None)
+
+    def score(self, key, member):
+        return self._get(key)[1].get(str(member))
+
+    def count_above(self, key, score):
+        # (-score, '')는 같은 점수의 어떤 멤버보다도 앞에 오므로 더 높은 점수의 개수와 같음
+        return bisect.bisect_left(self._get(key)[0], (-float(score), ''))
+
+    def top(self, key, count, offset=0):
+        return [(member, -score) for score, member in self._get(key)[0][offset:offset + count]]
+
+    def size(self, key):
+        return len(self._get(key)[1])
+
+
+class RedisSortedSet(BaseSortedSet):
+    """
+    Redis ZSET 정렬 집합
+    """
+    REPLACE_BATCH_SIZE = 10000
+
+    def __init__(self, url):
+        import redis
+
+        self.client = redis.Redis.from_url(url)
+
+    def add(self, key, mapping):
+        if mapping:
+            self.client.zadd(key, {str(member): float(score) for member, score in mapping.items()})
+
+    def remove(self, key, members):
+        members = [str(member) for member in members]
+        if members:
+            self.client.zrem(key, *members)
+
+    def replace(self, key, items):
+        # 임시 키에 채운 뒤 RENAME으로 한 번에 교체해 조회 중인 집합이 비는 순간이 없게 함
+        building = f'{key}:rebuild'
+        self.client.delete(building)
+        batch = {}
+        for member, score in items:
+            batch[str(member)] = float(score)
+            if len(batch) >= self.REPLACE_BATCH_SIZE:
+                self.client.zadd(building, batch)
+                batch = {}
+        if batch:
+            self.client.zadd(building, batch)
+        if self.client.exists(building):
+            self.client.rename(building, key)
+        else:
+            self.client.delete(key)
+
+    def delete(self, *keys):
+        if keys:
+            self.client.delete(*keys)
+
+    def score(self, key, member):
+        return self.client.zscore(key, str(member))
+
+    def count_above(self, key, score):
+        return self.client.zcount(key, f'({float(score)!r}', '+inf')
+
+    def top(self, key, count, offset=0):
+        if count <= 0:
+            return []
+        rows = self.client.zrevrange(key, offset, offset + count - 1, withscores=True)
+        return [(member.decode(), score) for member, score in rows]
+
+    def size(self, key):
+        return self.client.zcard(key)
+
+
+def get_sorted_set():
+    """
+    설정에 맞는 정렬 집합 저장소 반환 (프로세스 안에서 재사용)
+    """
+    url = getattr(settings, 'SORTED_SET_REDIS_URL', None)
+    if url not in _stores:
+        _stores[url] = RedisSortedSet(url) if url else LocalSortedSet()
+    return _stores[url]
@@ -1,3 +1,56 @@
 from django.contrib import admin
+from .models import Match, MatchParticipant, MatchResult
 
-# Register your models here.
+class MatchParticipantInline(admin.TabularInline):
+    """
+    매치 상세 화면의 참가자 인라인
+    """
+    model = MatchParticipant
+    extra = 0
+    raw_id_fields = ('user', 'team')
+
+@admin.register(Match)
+class MatchAdmin(admin.ModelAdmin):
+    """
+    매치 관리자 설정
+    """
+    list_display = ('title', 'match_type', 'venue', 'date', 'start_time', 'status', 'registered_count', 'max_players')
+    list_filter = ('status', 'match_type', 'skill_level', 'gender')
+    search_fields = ('title',)
+    raw_id_fields = ('venue', 'host', 'home_team', 'away_team')
+    readonly_fields = ('registered_count',)
+    inlines = [MatchParticipantInline]
+    
+    def save_related(self, request, form, formsets, change):
+        super().save_related(request, form, formsets, change)
+        # 인라인으로 참가자가 바뀌었을 수 있으므로 카운터 재계산
+        form.instance.recount_registered()
+
+@admin.register(MatchParticipant)
+class MatchParticipantAdmin(admin.ModelAdmin):
+    """
+    매치 참가자 관리자 설정
+    """
+    list_display = ('match', 'user', 'status', 'payment_status', 'registered_at')
+    list_filter = ('status', 'payment_status')
+    raw_id_fields = ('match', 'user', 'team')
+    
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        obj.match.recount_registered()
+        # 다른 매치로 옮긴 경우 이전 매치도 재계산
+        if change and 'match' in form.changed_data and form.initial.get('match'):
+            Match.objects.get(pk=form.initial['match']).recount_registered()
+    
+    def delete_model(self, request, obj):
+        match = obj.match
+        super().delete_model(request, obj)
+        match.recount_registered()
+    
+    def delete_queryset(self, request, queryset):
+        matches = list(Match.objects.filter(participants__in=queryset).distinct())
+        super().delete_queryset(request, queryset)
+        for match in matches:
+            match.recount_registered()
+
+admin.site.register(MatchResult)
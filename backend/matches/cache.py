@@ -0,0 +1,88 @@
+"""
+매치 목록(피드) 응답 캐시
+
+캐시 키에 '피드 버전'을 넣어 두고, 매치/참가자/구장이 바뀌면 버전만 올려서
+이전 키들을 한꺼번에 무효화합니다. 키를 훑어 지울 필요가 없어
+LocMem(테스트)과 Redis(운영) 어디서나 같은 방식으로 동작합니다.
+"""
+import hashlib
+import time
+from urllib.parse import urlencode
+from django.conf import settings
+from django.core.cache import cache
+
+FEED_VERSION_KEY = 'matches:feed:version'
+FEED_HITS_KEY = 'matches:feed:hits'
+FEED_MISSES_KEY = 'matches:feed:misses'
+
+# 결과에 영향을 주지 않는 기본값은 키에서 제외
+DEFAULT_PARAMS = {'page': '1'}
+
+
+def get_feed_timeout():
+    return getattr(settings, 'MATCH_FEED_CACHE_TIMEOUT', 60)
+
+
+def get_feed_version():
+    """
+    현재 피드 버전 (없으면 시각 기반 값으로 초기화해 이전 버전과 겹치지 않게 함)
+    """
+    version = cache.get(FEED_VERSION_KEY)
+    if version is None:
+        cache.add(FEED_VERSION_KEY, time.time_ns(), timeout=None)
+        version = cache.get(FEED_VERSION_KEY)
+    return version
+
+
+def bump_feed_version():
+    """
+    피드 버전을 올려 모든 캐시된 목록 응답을 무효화
+    """
+    try:
+        cache.incr(FEED_VERSION_KEY)
+    except ValueError:
+        cache.set(FEED_VERSION_KEY, time.time_ns(), timeout=None)
+
+
+def normalize_params(query_params):
+    """
+    쿼리 파라미터를 정렬하고 빈 값/기본값을 제거한 문자열로 변환
+    """
+    items = []
+    for key in sorted(query_params.keys()):
+        values = sorted(value.strip() for value in query_params.getlist(key) if value.strip())
+        if not values or (len(values) == 1 and DEFAULT_PARAMS.get(key) == values[0]):
+            continue
+        items.extend((key, value) for value in values)
+    return urlencode(items)
+
+
+def get_feed_cache_key(request):
+    """
+    (피드 버전, 호스트, 정규화된 필터/정렬/페이지 파라미터) 기반 캐시 키
+    """
+    # next/previous 링크가 절대 URL이므로 호스트도 키에 포함
+    signature = f'{request.get_host()}?{normalize_params(request.query_params)}'
+    digest = hashlib.sha1(signature.encode()).hexdigest()
+    return f'matches:feed:v{get_feed_version()}:{digest}'
+
+
+def record_feed_lookup(hit):
+    key = FEED_HITS_KEY if hit else FEED_MISSES_KEY
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, 0, timeout=None)
+        cache.incr(key)
+
+
+def get_feed_cache_stats():
+    hits = cache.get(FEED_HITS_KEY, 0)
+    misses = cache.get(FEED_MISSES_KEY, 0)
+    total = hits + misses
+    return {
+        'version': get_feed_version(),
+        'hits': hits,
+        'misses': misses,
+        'hit_rate': hits / total if total else 0.0,
+    }
@@ -0,0 +1,88 @@
+"""
+매치/참가자/결과 스트리밍 내보내기 (NDJSON, CSV)
+
+values() 행을 iterator(chunk_size)로 읽어 바로 응답에 흘려보내므로
+내보내는 행 수와 관계없이 메모리 사용량이 일정합니다.
+PostgreSQL에서는 iterator()가 서버 측 커서를 사용합니다.
+"""
+import csv
+import json
+from itertools import chain
+from django.core.serializers.json import DjangoJSONEncoder
+from .models import Match, MatchParticipant, MatchResult
+
+EXPORT_CHUNK_SIZE = 2000
+
+EXPORT_FORMATS = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv; charset=utf-8',
+}
+
+# 데이터셋별 (모델, 매치 필드 경로, 내보낼 필드)
+EXPORT_DATASETS = {
+    'matches': (Match, 'pk', (
+        'id', 'title', 'match_type', 'status', 'date', 'start_time', 'end_time', 'ends_at',
+        'venue_id', 'venue__name', 'host_id', 'max_players', 'registered_count', 'price',
+        'skill_level', 'gender', 'team_match', 'home_team_id', 'away_team_id',
+        'home_score', 'away_score', 'created_at', 'updated_at',
+    )),
+    'participants': (MatchParticipant, 'match_id', (
+        'id', 'match_id', 'user_id', 'user__username', 'team_id', 'status',
+        'payment_status', 'waitlist_position', 'registered_at', 'updated_at',
+    )),
+    'results': (MatchResult, 'match_id', (
+        'id', 'match_id', 'home_score', 'away_score', 'mvp_id', 'summary',
+        'ratings_applied_at', 'created_at', 'updated_at',
+    )),
+}
+
+
+def export_rows(dataset, matches):
+    """
+    필터링된 매치 쿼리셋 기준으로 데이터셋 행(dict)을 스트리밍
+    """
+    model, match_field, fields = EXPORT_DATASETS[dataset]
+    queryset = model.objects.filter(**{f'{match_field}__in': matches.values('pk')})
+    return queryset.order_by('pk').values(*fields).iterator(chunk_size=EXPORT_CHUNK_SIZE)
+
+
+def batched(lines, size=EXPORT_CHUNK_SIZE):
+    """
+    줄 단위 문자열을 size개씩 묶어 응답 조각 수를 줄임
+    """
+    batch = []
+    for line in lines:
+        batch.append(line)
+        if len(batch) >= size:
+            yield ''.join(batch)
+            batch = []
+    if batch:
+        yield ''.join(batch)
+
+
+class EchoBuffer:
+    """
+    csv.writer가 쓴 값을 그대로 돌려주는 버퍼
+    """
+    def write(self, value):
+        return value
+
+
+def stream_ndjson(rows):
+    return batched(json.dumps(row, cls=DjangoJSONEncoder, ensure_ascii=False) + '\n' for row in rows)
+
+
+def stream_csv(rows, fields):
+    writer = csv.writer(EchoBuffer())
+    header = writer.writerow(fields)
+    return batched(chain([header], (writer.writerow([row[field] for field in fields]) for row in rows)))
+
+
+def stream_export(dataset, output, matches):
+    """
+    데이터셋을 지정한 형식의 문자열 조각으로 스트리밍
+    """
+    rows = export_rows(dataset, matches)
+    if output == 'csv':
+        return stream_csv(rows, EXPORT_DATASETS[dataset][2])
+    return stream_ndjson(rows)
@@ -1,6 +1,10 @@
+from datetime import timedelta
 import django_filters
-from django.db.models import Q
+from django.utils import timezone
+from rest_framework import filters
 from .models import Match
+from .search import search_matches
+from venues.geo import DEFAULT_RADIUS_KM, MAX_RADIUS_KM, filter_within_radius
 
 class MatchFilter(django_filters.FilterSet):
     """
@@ -23,18 +27,66 @@ class MatchFilter(django_filters.FilterSet):
     
     search = django_filters.CharFilter(method='filter_search')
     
+    # 아직 끝나지 않은 매치만 (ends_at 인덱스 사용)
+    upcoming = django_filters.BooleanFilter(method='filter_upcoming')
+    
+    # 위치 기반 반경 검색 (lat, lng가 모두 있어야 적용)
+    lat = django_filters.NumberFilter(method='filter_location', min_value=-90, max_value=90)
+    lng = django_filters.NumberFilter(method='filter_location', min_value=-180, max_value=180)
+    radius_km = django_filters.NumberFilter(method='filter_location', min_value=0, max_value=MAX_RADIUS_KM)
+    
     class Meta:
         model = Match
         fields = ['date', 'date_from', 'date_to', 'skill_level', 'gender', 
                   'status', 'match_type', 'venue', 'venue_name', 'price_min', 
-                  'price_max', 'search']
+                  'price_max', 'search', 'upcoming', 'lat', 'lng', 'radius_km']
+    
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        lat = self.form.cleaned_data.get('lat')
+        lng = self.form.cleaned_data.get('lng')
+        if lat is None or lng is None:
+            return queryset
+        radius_km = self.form.cleaned_data.get('radius_km')
+        if radius_km is None:
+            radius_km = DEFAULT_RADIUS_KM
+        return filter_within_radius(queryset, float(lat), float(lng), float(radius_km), prefix='venue__')
+    
+    def filter_location(self, queryset, name, value):
+        """
+        lat, lng, radius_km는 filter_queryset에서 한 번에 처리
+        """
+        return queryset
+    
+    def filter_upcoming(self, queryset, name, value):
+        # 종료 일시는 경기 날짜 이후이므로(자정을 넘겨도 다음 날) 날짜 하한을 함께 걸어
+        # date로 시작하는 인덱스의 범위 탐색을 사용
+        if value:
+            return queryset.filter(
+                date__gte=timezone.localdate() - timedelta(days=1), ends_at__gt=timezone.now()
+            )
+        return queryset
     
     def filter_search(self, queryset, name, value):
         """
-        제목, 설명, 구장 이름으로 검색
+        제목, 설명, 구장 이름으로 전문 검색 (관련도는 search_rank로 annotate)
         """
-        return queryset.filter(
-            Q(title__icontains=value) | 
-            Q(description__icontains=value) | 
-            Q(venue__name__icontains=value)
-        ) 
\ No newline at end of file
+        return search_matches(queryset, value)
+
+class MatchOrderingFilter(filters.OrderingFilter):
+    """
+    검색어가 있고 정렬을 따로 지정하지 않으면 관련도 순으로 정렬하고
+    위치 조건이 있을 때만 거리(distance) 정렬을 허용하는 필터
+    """
+    def get_ordering(self, request, queryset, view):
+        if not request.query_params.get(self.ordering_param) and 'search_rank' in queryset.query.annotations:
+            return ['-search_rank'] + list(self.get_default_ordering(view) or [])
+        return super().get_ordering(request, queryset, view)
+    
+    def remove_invalid_fields(self, queryset, fields, view, request):
+        # distance 정렬은 위치 조건(lat, lng)이 있을 때만 가능
+        valid_fields = super().remove_invalid_fields(queryset, fields, view, request)
+        return [
+            term for term in valid_fields
+            if term.lstrip('-') != 'distance' or 'distance' in queryset.query.annotations
+        ] 
\ No newline at end of file
@@ -0,0 +1,156 @@
+"""
+팀/선수 리더보드
+
+레이팅을 정렬 집합(config.sortedset)에 미리 유지해 상위 K개와 특정 팀/선수의 순위를
+DB 집계 없이 O(log n)으로 조회합니다.
+팀은 (지역, 수준) 조합과 각각의 전체('*')로 4개, 선수는 실력 수준별/전체로 2개 집합에 속합니다.
+순위는 자신보다 레이팅이 높은 수 + 1이므로 동점이면 같은 순위입니다.
+
+레이팅은 매치 결과 반영 작업과 재생 명령에서, 지역/수준/실력 변경은 시그널에서 갱신합니다.
+집합이 비어 있으면(새 프로세스의 메모리 저장소 등) 처음 조회할 때 DB에서 다시 만듭니다.
+"""
+from collections import defaultdict
+from django.contrib.auth import get_user_model
+from config.sortedset import get_sorted_set
+from teams.models import Team
+
+ALL = '*'
+
+
+def team_board_key(region=None, level=None):
+    return f'leaderboard:team:{region or ALL}:{level or ALL}'
+
+
+def user_board_key(skill_level=None):
+    return f'leaderboard:user:{skill_level or ALL}'
+
+
+def team_board_keys(region, level):
+    """
+    팀이 속하는 리더보드 키 (지역+수준, 지역 전체, 수준 전체, 전체)
+    """
+    return [team_board_key(r, l) for r in (region, None) for l in (level, None)]
+
+
+def user_board_keys(skill_level):
+    return [user_board_key(skill_level), user_board_key()]
+
+
+def all_board_keys():
+    regions = [None] + [value for value, _ in Team.REGION_CHOICES]
+    levels = [None] + [value for value, _ in Team.LEVEL_CHOICES]
+    skills = [None] + [value for value, _ in get_user_model().SKILL_CHOICES]
+    return (
+        [team_board_key(region, level) for region in regions for level in levels],
+        [user_board_key(skill) for skill in skills],
+    )
+
+
+def update_team_rankings(rows):
+    """
+    (팀 id, 지역, 수준, 레이팅) 목록을 리더보드에 반영
+    """
+    boards = defaultdict(dict)
+    for pk, region, level, rating in rows:
+        for key in team_board_keys(region, level):
+            boards[key][pk] = rating
+    store = get_sorted_set()
+    for key, mapping in boards.items():
+        store.add(key, mapping)
+
+
+def update_user_rankings(rows):
+    """
+    (사용자 id, 실력 수준, 레이팅) 목록을 리더보드에 반영
+    """
+    boards = defaultdict(dict)
+    for pk, skill_level, rating in rows:
+        for key in user_board_keys(skill_level):
+            boards[key][pk] = rating
+    store = get_sorted_set()
+    for key, mapping in boards.items():
+        store.add(key, mapping)
+
+
+def ranking_fields_changed(instance, fields, update_fields):
+    """
+    기존 행을 저장하면서 순위 필드가 바뀔 수 있는지 (update_fields에 순위 필드가 없으면 False)
+    """
+    return not instance._state.adding and (update_fields is None or set(fields) & set(update_fields))
+
+
+def remove_rankings(keys, pk):
+    store = get_sorted_set()
+    for key in keys:
+        store.remove(key, [pk])
+
+
+def board_queryset(key):
+    """
+    리더보드 키에 해당하는 (id, 레이팅) 쿼리셋
+    """
+    _, kind, *parts = key.split(':')
+    if kind == 'team':
+        queryset = Team.objects.all()
+        region, level = parts
+        if region != ALL:
+            queryset = queryset.filter(region=region)
+        if level != ALL:
+            queryset = queryset.filter(level=level)
+    else:
+        queryset = get_user_model().objects.all()
+        if parts[0] != ALL:
+            queryset = queryset.filter(skill_level=parts[0])
+    return queryset.values_list('pk', 'rating')
+
+
+def rebuild_board(key, batch_size=10000):
+    get_sorted_set().replace(key, board_queryset(key).iterator(chunk_size=batch_size))
+
+
+def rebuild_leaderboards(batch_size=10000):
+    """
+    모든 리더보드를 DB 기준으로 다시 만듦
+    """
+    team_keys, user_keys = all_board_keys()
+    for key in team_keys + user_keys:
+        rebuild_board(key, batch_size)
+
+
+def ensure_board(key):
+    """
+    비어 있는 리더보드를 DB에서 채움 (대상이 실제로 없으면 그대로 둠)
+    """
+    if not get_sorted_set().size(key) and board_queryset(key).exists():
+        rebuild_board(key)
+
+
+def get_leaderboard(key, limit, offset=0):
+    """
+    (전체 수, [(id, 레이팅, 순위), ...]) 반환
+    """
+    ensure_board(key)
+    store = get_sorted_set()
+    rows = store.top(key, limit, offset)
+    entries = []
+    for position, (member, score) in enumerate(rows, start=offset + 1):
+        if entries and score == entries[-1][1]:
+            rank = entries[-1][2]
+        elif not entries:
+            rank = store.count_above(key, score) + 1
+        else:
+            rank = position
+        entries.append((int(member), score, rank))
+    return store.size(key), entries
+
+
+def get_rank(key, pk):
+    """
+    리더보드에서의 {'rank', 'rating', 'total'} (없으면 None)
+    """
+    ensure_board(key)
+    store = get_sorted_set()
+    score = store.score(key, pk)
+    if score is None:
+        return None
+    return {'rank': store.count_above(key, score) + 1, 'rating': score, 'total': store.size(key)}
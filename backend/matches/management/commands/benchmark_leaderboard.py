@@ -0,0 +1,83 @@
+import random
+import statistics
+import time
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from config.sortedset import get_sorted_set
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    """
+    리더보드 정렬 집합과 DB COUNT 방식의 순위 조회 성능을 비교하는 벤치마크
+
+    트랜잭션 안에서 가짜 사용자를 만들어 별도 벤치마크 키에 적재하고,
+    측정이 끝나면 키를 삭제하고 DB는 롤백합니다.
+    """
+    help = '리더보드 순위/상위 K 조회 성능을 DB COUNT 방식과 비교합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=1_000_000, help='생성할 사용자 수')
+        parser.add_argument('--queries', type=int, default=1000, help='측정할 조회/갱신 횟수')
+        parser.add_argument('--db-queries', type=int, default=20, help='DB COUNT 방식 측정 횟수')
+        parser.add_argument('--top', type=int, default=100, help='상위 K 조회 크기')
+        parser.add_argument('--seed', type=int, default=42)
+
+    def handle(self, *args, **options):
+        random.seed(options['seed'])
+        store = get_sorted_set()
+        key = f'leaderboard:bench:{time.time_ns()}'
+        with transaction.atomic():
+            try:
+                prefix, user_ids = self.seed(options['users'])
+                started = time.perf_counter()
+                rows = User.objects.filter(username__startswith=prefix).values_list('pk', 'rating')
+                store.replace(key, rows.iterator(chunk_size=10000))
+                self.stdout.write(f'{type(store).__name__} 적재: {time.perf_counter() - started:.2f}초 ({store.size(key)}명)')
+                self.run(store, key, user_ids, options)
+            finally:
+                store.delete(key)
+                transaction.set_rollback(True)
+
+    def seed(self, count):
+        started = time.perf_counter()
+        prefix = f'rank-bench-{time.time_ns()}'
+        for start in range(0, count, 10000):
+            User.objects.bulk_create([
+                User(username=f'{prefix}-{i}', rating=round(random.gauss(1000, 200), 1))
+                for i in range(start, min(start + 10000, count))
+            ])
+        user_ids = list(User.objects.filter(username__startswith=prefix).order_by('pk').values_list('pk', flat=True))
+        self.stdout.write(f'사용자 {count}명 생성: {time.perf_counter() - started:.1f}초')
+        return prefix, user_ids
+
+    def measure(self, label, func, repeat):
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            func()
+            timings.append((time.perf_counter() - started) * 1000)
+        timings.sort()
+        p99 = timings[min(len(timings) - 1, int(len(timings) * 0.99))]
+        self.stdout.write(f'{label:<24} p50 {statistics.median(timings):8.3f}ms  p99 {p99:8.3f}ms')
+
+    def run(self, store, key, user_ids, options):
+        queries, top = options['queries'], options['top']
+
+        def rank_from_store():
+            member = random.choice(user_ids)
+            store.count_above(key, store.score(key, member))
+
+        def rank_from_db():
+            rating = User.objects.filter(pk=random.choice(user_ids)).values_list('rating', flat=True).get()
+            User.objects.filter(rating__gt=rating).count()
+
+        self.measure('순위 (정렬 집합)', rank_from_store, queries)
+        self.measure(f'상위 {top} (정렬 집합)', lambda: store.top(key, top, random.randrange(0, 1000)), queries)
+        self.measure('레이팅 갱신 (정렬 집합)', lambda: store.add(key, {random.choice(user_ids): random.gauss(1000, 200)}), queries)
+        self.measure('순위 (DB COUNT)', rank_from_db, options['db_queries'])
+        self.measure(f'상위 {top} (DB ORDER BY)', lambda: list(
+            User.objects.order_by('-rating').values_list('pk', 'rating')[:top]
+        ), options['db_queries'])
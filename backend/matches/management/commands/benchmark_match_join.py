@@ -0,0 +1,111 @@
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, time as dtime, timedelta
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from rest_framework.test import APIRequestFactory, force_authenticate
+from matches.models import Match, MatchParticipant
+from matches.views import MatchJoinView
+from venues.models import Venue
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    """
+    한 매치에 동시 참가 신청을 몰아 보내 정원 초과 여부와 응답 지연을 측정하는 벤치마크
+
+    각 스레드가 자신의 DB 커넥션으로 MatchJoinView를 직접 호출합니다.
+    생성한 데이터는 측정 후 삭제합니다(--keep 지정 시 유지).
+    SQLite는 쓰기를 파일 단위로 잠그므로 의미 있는 수치는 PostgreSQL에서 확인하세요.
+    """
+    help = '매치 동시 참가 신청 시 정원 초과 여부와 지연 시간을 측정합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--joins', type=int, default=500, help='동시 참가 신청 수')
+        parser.add_argument('--capacity', type=int, default=22, help='매치 정원')
+        parser.add_argument('--workers', type=int, default=64,
+                            help='동시 실행 스레드 수 (DB max_connections 이하로 설정)')
+        parser.add_argument('--p99-limit-ms', type=float, default=None,
+                            help='p99 지연 시간 상한 (초과 시 실패 처리)')
+        parser.add_argument('--keep', action='store_true', help='생성한 데이터를 삭제하지 않고 유지')
+
+    def handle(self, *args, **options):
+        match, users = self.seed(options['joins'], options['capacity'])
+        try:
+            results = self.run(match, users, options['workers'])
+            self.report(match, results, options['p99_limit_ms'])
+        finally:
+            if not options['keep']:
+                match.venue.delete()
+                User.objects.filter(pk__in=[user.pk for user in users] + [match.host_id]).delete()
+
+    def seed(self, joins, capacity):
+        prefix = f'join-bench-{time.time_ns()}'
+        host = User.objects.create_user(username=prefix, password=None)
+        venue = Venue.objects.create(name=f'{prefix} 구장', address='서울', surface_type='ARTIFICIAL', size='6',
+                                     opening_time=dtime(6), closing_time=dtime(23))
+        match = Match.objects.create(title='인기 매치', match_type='SOCIAL', venue=venue,
+                                     date=date.today() + timedelta(days=7), start_time=dtime(20),
+                                     end_time=dtime(22), max_players=capacity, price=10000, host=host)
+        User.objects.bulk_create([User(username=f'{prefix}-{i}') for i in range(joins)])
+        users = list(User.objects.filter(username__startswith=f'{prefix}-'))
+        return match, users
+
+    def run(self, match, users, workers):
+        factory = APIRequestFactory()
+        view = MatchJoinView.as_view()
+        chunks = [users[i::workers] for i in range(workers) if users[i::workers]]
+        # 모든 스레드가 커넥션을 연 뒤 동시에 출발
+        barrier = threading.Barrier(len(chunks))
+
+        def join(user):
+            request = factory.post(f'/api/v1/matches/{match.pk}/join/')
+            force_authenticate(request, user=user)
+            started = time.perf_counter()
+            try:
+                status_code = view(request, match_id=match.pk).status_code
+            except Exception as e:
+                status_code = type(e).__name__
+            return status_code, (time.perf_counter() - started) * 1000
+
+        def worker(chunk):
+            try:
+                connection.ensure_connection()
+                barrier.wait()
+                return [join(user) for user in chunk]
+            finally:
+                connection.close()
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=len(chunks)) as executor:
+            results = [result for chunk in executor.map(worker, chunks) for result in chunk]
+        self.stdout.write(f'총 소요 시간: {(time.perf_counter() - started) * 1000:.1f}ms')
+        return results
+
+    def report(self, match, results, p99_limit_ms):
+        match.refresh_from_db()
+        active = MatchParticipant.objects.filter(
+            match=match, status__in=MatchParticipant.ACTIVE_STATUSES
+        ).count()
+        waitlisted = MatchParticipant.objects.filter(match=match, status='WAITLISTED').count()
+        outcomes = {}
+        for status_code, _ in results:
+            outcomes[status_code] = outcomes.get(status_code, 0) + 1
+        latencies = sorted(latency for _, latency in results)
+        p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+
+        self.stdout.write(f'응답 코드별 건수: {outcomes}')
+        self.stdout.write(f'정원 {match.max_players}, 카운터 {match.registered_count}, '
+                          f'실제 참가자 {active}, 대기자 {waitlisted}, 상태 {match.status}')
+        self.stdout.write(f'지연(ms) p50 {statistics.median(latencies):.1f}, p99 {p99:.1f}, '
+                          f'최대 {latencies[-1]:.1f}')
+
+        if active > match.max_players or match.registered_count != active:
+            raise CommandError('정원 초과 또는 카운터 불일치가 발생했습니다.')
+        if p99_limit_ms is not None and p99 > p99_limit_ms:
+            raise CommandError(f'p99 지연 시간이 {p99_limit_ms}ms를 초과했습니다.')
+        self.stdout.write(self.style.SUCCESS('정원 초과 없음'))
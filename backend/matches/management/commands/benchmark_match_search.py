@@ -0,0 +1,96 @@
+import random
+import statistics
+import time
+from datetime import date, time as dtime, timedelta
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from matches.models import Match
+from matches.search import IcontainsMatchSearchBackend, get_search_backend, index_matches
+from venues.models import Venue
+
+User = get_user_model()
+
+AREAS = ['강남', '서초', '송파', '마포', '용산', '성수', '잠실', '목동', '일산', '분당', '수원', '인천']
+KINDS = ['풋살', '축구', '소셜 매치', '팀 매치', '주말 리그', '야간 경기']
+WORDS = ['초보 환영', '실력자 모집', '혼성', '여성 전용', '아침 운동', '퇴근 후', 'friendly', 'league', 'weekend']
+QUERIES = ['강남', '풋살', '성수 풋살', '초보', '야간 경기', 'league', '잠실 주말', '구장']
+
+
+class Command(BaseCommand):
+    """
+    전문 검색과 기존 icontains 검색의 응답 시간을 비교하는 벤치마크
+
+    트랜잭션 안에서 가짜 매치를 만들고 측정이 끝나면 롤백합니다.
+    """
+    help = '매치 전문 검색과 icontains 검색 성능을 비교합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=1_000_000, help='생성할 매치 수')
+        parser.add_argument('--venues', type=int, default=500, help='생성할 구장 수')
+        parser.add_argument('--repeat', type=int, default=5, help='검색어당 반복 횟수')
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--keep', action='store_true', help='생성한 데이터를 롤백하지 않고 유지')
+
+    def handle(self, *args, **options):
+        random.seed(options['seed'])
+        with transaction.atomic():
+            self.seed(options['rows'], options['venues'])
+            self.run(options['repeat'])
+            if not options['keep']:
+                transaction.set_rollback(True)
+
+    def seed(self, rows, venue_count):
+        started = time.perf_counter()
+        host = User.objects.create_user(username=f'bench-{time.time_ns()}', password=None)
+        venues = Venue.objects.bulk_create([
+            Venue(name=f'{random.choice(AREAS)} {random.choice(KINDS)} 구장 {i}',
+                  address='서울', surface_type='ARTIFICIAL', size='6',
+                  opening_time=dtime(6), closing_time=dtime(23))
+            for i in range(venue_count)
+        ])
+        start_date = date.today()
+        batch = []
+        for i in range(rows):
+            # 구장 일정 배제 제약에 걸리지 않도록 (구장, 날짜, 시간)을 겹치지 않게 배정
+            day, slot = divmod(i // venue_count, 16)
+            batch.append(Match(
+                title=f'{random.choice(AREAS)} {random.choice(KINDS)} {random.choice(WORDS)}',
+                description=' '.join(random.sample(WORDS, 3)),
+                match_type='SOCIAL', venue=venues[i % venue_count],
+                date=start_date + timedelta(days=day), start_time=dtime(6 + slot), end_time=dtime(7 + slot),
+                max_players=12, price=10000, host=host,
+            ))
+            if len(batch) >= 5000:
+                Match.objects.bulk_create(batch)
+                batch = []
+        Match.objects.bulk_create(batch)
+        seeded = time.perf_counter()
+        index_matches(Match.objects.filter(host=host))
+        indexed = time.perf_counter()
+        self.stdout.write(f'생성 {rows}건: {seeded - started:.1f}s, 색인: {indexed - seeded:.1f}s')
+
+    def run(self, repeat):
+        search_backend = get_search_backend()
+        backends = [
+            ('icontains', IcontainsMatchSearchBackend(search_backend.connection)),
+            (type(search_backend).__name__, search_backend),
+        ]
+        self.stdout.write(f'{"검색어":<12}{"방식":<32}{"건수":>10}{"중앙값(ms)":>14}{"최대(ms)":>12}')
+        for query in QUERIES:
+            for label, backend in backends:
+                timings = []
+                for _ in range(repeat):
+                    queryset = backend.search(Match.objects.all(), query)
+                    if 'search_rank' in queryset.query.annotations:
+                        queryset = queryset.order_by('-search_rank')
+                    else:
+                        queryset = queryset.order_by('date', 'start_time')
+                    started = time.perf_counter()
+                    count = queryset.count()
+                    list(queryset.values_list('id', flat=True)[:10])
+                    timings.append((time.perf_counter() - started) * 1000)
+                self.stdout.write(
+                    f'{query:<12}{label:<32}{count:>10}'
+                    f'{statistics.median(timings):>14.1f}{max(timings):>12.1f}'
+                )
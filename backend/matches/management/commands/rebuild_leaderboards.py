@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+from matches.leaderboard import all_board_keys, rebuild_leaderboards
+
+
+class Command(BaseCommand):
+    """
+    팀/선수 리더보드 정렬 집합을 DB 기준으로 다시 만드는 명령
+    """
+    help = '팀/선수 리더보드를 다시 만듭니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=10000, help='한 번에 읽을 행 수')
+
+    def handle(self, *args, **options):
+        rebuild_leaderboards(batch_size=options['batch_size'])
+        team_keys, user_keys = all_board_keys()
+        self.stdout.write(self.style.SUCCESS(f'리더보드 {len(team_keys) + len(user_keys)}개를 다시 만들었습니다.'))
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+from matches.models import Match
+from matches.search import index_matches
+
+
+class Command(BaseCommand):
+    """
+    매치 전문 검색 테이블을 전체 재색인하는 명령
+    """
+    help = '매치 검색 테이블(matches_match_search)을 다시 색인합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=2000, help='한 번에 색인할 매치 수')
+
+    def handle(self, *args, **options):
+        queryset = Match.objects.order_by('pk')
+        index_matches(queryset, batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'{queryset.count()}개 매치를 색인했습니다.'))
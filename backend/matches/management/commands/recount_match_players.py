@@ -0,0 +1,49 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Count, F, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+from matches.cache import bump_feed_version
+from matches.models import Match, MatchParticipant
+
+
+class Command(BaseCommand):
+    """
+    Match.registered_count 카운터를 참가자 테이블 기준으로 복구하는 명령
+    """
+    help = '매치 등록 인원 카운터(registered_count)를 실제 참가자 수로 재계산합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--match', type=int, action='append', dest='match_ids',
+                            help='재계산할 매치 ID (여러 번 지정 가능, 생략 시 전체)')
+        parser.add_argument('--dry-run', action='store_true',
+                            help='수정하지 않고 어긋난 매치 수만 출력')
+
+    def handle(self, *args, **options):
+        active_count = (
+            MatchParticipant.objects
+            .filter(match=OuterRef('pk'), status__in=MatchParticipant.ACTIVE_STATUSES)
+            .order_by()
+            .values('match')
+            .annotate(total=Count('pk'))
+            .values('total')
+        )
+        queryset = Match.objects.all()
+        if options['match_ids']:
+            queryset = queryset.filter(pk__in=options['match_ids'])
+
+        drifted = (
+            queryset
+            .annotate(actual=Coalesce(Subquery(active_count), 0))
+            .filter(~Q(registered_count=F('actual')))
+        )
+        drifted_count = drifted.count()
+
+        if options['dry_run']:
+            self.stdout.write(f'카운터가 어긋난 매치: {drifted_count}개')
+            return
+
+        # 인원과 함께 모집 상태(OPEN/CLOSED)도 바로잡음
+        updated = Match.objects.filter(pk__in=drifted.values('pk')).update(**Match.recount_values())
+        if updated:
+            # update()는 시그널을 보내지 않으므로 목록 캐시를 직접 무효화
+            bump_feed_version()
+        self.stdout.write(self.style.SUCCESS(f'{updated}개 매치의 등록 인원을 복구했습니다.'))
@@ -0,0 +1,277 @@
+import time
+from itertools import islice
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+from matches.cache import bump_feed_version
+from matches.leaderboard import rebuild_leaderboards
+from matches.models import MatchParticipant, MatchResult, RatingHistory
+from matches.rating import ELO_K_FACTOR, ELO_SCALE
+from matches.tasks import PLAYED_STATUSES
+from teams.models import Team
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+User = get_user_model()
+
+USER_COUNTERS = ('matches_played', 'wins', 'draws', 'losses')
+TEAM_COUNTERS = USER_COUNTERS + ('goals_scored', 'goals_conceded')
+
+
+class RatingTable:
+    """
+    DB id를 연속 인덱스로 매핑하고 레이팅/전적을 NumPy 배열로 보관
+    """
+    def __init__(self, model, counters, history_field):
+        self.model = model
+        self.history_field = history_field
+        # 단계별 (인덱스, 결과 id, 기록 시각, 반영 후 레이팅, 변동량) 배열
+        self.history = []
+        self.ids = np.fromiter(model.objects.order_by('pk').values_list('pk', flat=True).iterator(), dtype=np.int64)
+        self.rating = np.full(len(self.ids), model._meta.get_field('rating').default, dtype=np.float64)
+        self.counters = {name: np.zeros(len(self.ids), dtype=np.int64) for name in counters}
+
+    def index(self, ids):
+        """
+        DB id 배열을 인덱스 배열로 변환 (없는 id는 -1)
+        """
+        ids = np.asarray(ids, dtype=np.int64)
+        if not len(self.ids):
+            return np.full(len(ids), -1, dtype=np.int64)
+        positions = np.minimum(np.searchsorted(self.ids, ids), len(self.ids) - 1)
+        return np.where(self.ids[positions] == ids, positions, -1)
+
+    def add(self, name, indexes, values=1):
+        np.add.at(self.counters[name], indexes, values)
+
+    def apply(self, indexes, deltas, result_ids, recorded_at):
+        """
+        레이팅 변동을 반영하고 이력으로 기록 (indexes는 중복 없음)
+        """
+        self.rating[indexes] += deltas
+        self.history.append((indexes, result_ids, recorded_at, self.rating[indexes], deltas))
+
+    def write_history(self, batch_size):
+        objs = []
+        for indexes, result_ids, recorded_at, ratings, deltas in self.history:
+            for pk, result_id, at, rating, delta in zip(
+                self.ids[indexes].tolist(), result_ids.tolist(), recorded_at.tolist(), ratings.tolist(), deltas.tolist()
+            ):
+                objs.append(RatingHistory(**{self.history_field: pk}, result_id=result_id, rating=rating,
+                                          delta=delta, recorded_at=at))
+                if len(objs) >= batch_size:
+                    RatingHistory.objects.bulk_create(objs)
+                    objs = []
+        RatingHistory.objects.bulk_create(objs)
+
+    def write_back(self, batch_size, now):
+        """
+        batch_size 단위 bulk_update로 전체 행을 덮어씀
+        """
+        fields = ['rating', *self.counters, 'updated_at']
+        for start in range(0, len(self.ids), batch_size):
+            stop = start + batch_size
+            columns = [self.ids[start:stop].tolist(), self.rating[start:stop].tolist()]
+            columns += [values[start:stop].tolist() for values in self.counters.values()]
+            objs = []
+            for pk, rating, *counts in zip(*columns):
+                obj = self.model(pk=pk, rating=rating, updated_at=now, **dict(zip(self.counters, counts)))
+                objs.append(obj)
+            self.model.objects.bulk_update(objs, fields, batch_size=batch_size)
+
+
+def nullable_ids(values):
+    return np.array([-1 if value is None else value for value in values], dtype=np.int64)
+
+
+def expected_scores(ratings):
+    """
+    (n, 2) 레이팅 배열의 편별 기대 승점
+    """
+    return 1 / (1 + 10 ** ((ratings[:, ::-1] - ratings) / ELO_SCALE))
+
+
+class Command(BaseCommand):
+    """
+    모든 매치 결과를 시간 순으로 다시 재생해 사용자/팀 레이팅과 전적을 재계산
+
+    결과는 iterator() 커서로 스트리밍하고, 레이팅은 연속 인덱스의 NumPy 배열로 계산합니다.
+    청크마다 같은 팀/선수를 공유하지 않는 결과끼리 묶은 단계(wave)를 만들어,
+    선수/팀별 시간 순서를 지키면서 단계 안의 결과를 한 번에 벡터 연산으로 처리합니다.
+    전적(경기 수/승무패/득실)은 순서와 무관하므로 청크 단위로 한 번에 누적합니다.
+
+    계산 규칙은 tasks.apply_match_result와 같고, 레이팅 이력(RatingHistory)도 다시 만듭니다.
+    시작 시점까지 등록된 결과만 재생하며, 재생한 결과는 반영 완료로 표시해 대기 중인 비동기 작업이 중복 반영하지 않게 합니다.
+    재생 중 반영된 결과는 덮어쓰므로 가능하면 워커를 멈춘 상태에서 실행하세요.
+    """
+    help = '모든 매치 결과를 재생해 사용자/팀 레이팅과 전적을 재계산합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--k-factor', type=float, default=ELO_K_FACTOR, help='Elo K 계수')
+        parser.add_argument('--chunk-size', type=int, default=5000, help='한 번에 처리할 결과 수')
+        parser.add_argument('--batch-size', type=int, default=1000, help='bulk_update 배치 크기')
+        parser.add_argument('--dry-run', action='store_true', help='계산만 하고 저장하지 않음')
+
+    def handle(self, *args, **options):
+        if np is None:
+            raise CommandError('numpy가 설치되어 있지 않습니다. (pip install numpy)')
+
+        started = time.perf_counter()
+        last_result_id = MatchResult.objects.order_by('-pk').values_list('pk', flat=True).first()
+        if last_result_id is None:
+            self.stdout.write('재생할 매치 결과가 없습니다.')
+            return
+
+        users = RatingTable(User, USER_COUNTERS, 'user_id')
+        teams = RatingTable(Team, TEAM_COUNTERS, 'team_id')
+        rows = MatchResult.objects.filter(pk__lte=last_result_id).order_by('match__ends_at', 'match_id').values_list(
+            'pk', 'match_id', 'match__ends_at', 'home_score', 'away_score', 'match__home_team_id', 'match__away_team_id'
+        ).iterator(chunk_size=options['chunk_size'])
+
+        replayed = 0
+        while chunk := list(islice(rows, options['chunk_size'])):
+            self.replay_chunk(chunk, users, teams, options['k_factor'])
+            replayed += len(chunk)
+        elapsed = time.perf_counter() - started
+        self.stdout.write(f'결과 {replayed}건 재생: {elapsed:.1f}초 ({replayed / max(elapsed, 1e-9) * 60:,.0f}건/분)')
+
+        if options['dry_run']:
+            self.stdout.write('--dry-run: 저장하지 않았습니다.')
+            return
+
+        now = timezone.now()
+        with transaction.atomic():
+            users.write_back(options['batch_size'], now)
+            teams.write_back(options['batch_size'], now)
+            # 이력은 재생 결과로 다시 만듦
+            RatingHistory.objects.all().delete()
+            users.write_history(options['batch_size'])
+            teams.write_history(options['batch_size'])
+            MatchResult.objects.filter(
+                pk__lte=last_result_id, ratings_applied_at__isnull=True
+            ).update(ratings_applied_at=now)
+            # bulk_update()는 시그널을 보내지 않으므로 목록 캐시와 리더보드를 직접 갱신
+            transaction.on_commit(bump_feed_version)
+            transaction.on_commit(lambda: rebuild_leaderboards(options['batch_size']))
+        self.stdout.write(self.style.SUCCESS(
+            f'사용자 {len(users.ids)}명, 팀 {len(teams.ids)}개 저장 완료 ({time.perf_counter() - started:.1f}초)'
+        ))
+
+    def replay_chunk(self, chunk, users, teams, k_factor):
+        result_ids, match_ids, ends_at, home_scores, away_scores, home_team_ids, away_team_ids = zip(*chunk)
+        result_ids = np.array(result_ids, dtype=np.int64)
+        ends_at = np.array(ends_at, dtype=object)
+        home_scores = np.array(home_scores, dtype=np.int64)
+        away_scores = np.array(away_scores, dtype=np.int64)
+        home_team_ids, away_team_ids = nullable_ids(home_team_ids), nullable_ids(away_team_ids)
+        home, away = teams.index(home_team_ids), teams.index(away_team_ids)
+        # 홈 기준 승점 (승 1, 무 0.5, 패 0)
+        score = np.sign(home_scores - away_scores) * 0.5 + 0.5
+        team_match = (home >= 0) & (away >= 0)
+
+        # 청크의 참가자를 한 번에 조회해 결과 위치/편(홈 0, 원정 1, 없음 -1)으로 변환
+        position = {match_id: i for i, match_id in enumerate(match_ids)}
+        participants = list(MatchParticipant.objects.filter(
+            match_id__in=match_ids, status__in=PLAYED_STATUSES
+        ).values_list('match_id', 'user_id', 'team_id'))
+        p_result = np.array([position[match_id] for match_id, _, _ in participants], dtype=np.int64)
+        p_user = users.index([user_id for _, user_id, _ in participants])
+        p_team = nullable_ids([team_id for _, _, team_id in participants])
+        known = p_user >= 0
+        p_result, p_user, p_team = p_result[known], p_user[known], p_team[known]
+        p_team_match = team_match[p_result]
+        p_side = np.where(p_team_match & (p_team == home_team_ids[p_result]), 0,
+                          np.where(p_team_match & (p_team == away_team_ids[p_result]), 1, -1))
+
+        self.accumulate_records(users, teams, home, away, home_scores, away_scores, score, team_match,
+                                p_result, p_user, p_side)
+
+        results = np.flatnonzero(team_match)
+        if not len(results):
+            return
+        sided = p_side >= 0
+        p_result, p_user, p_side = p_result[sided], p_user[sided], p_side[sided]
+        waves = self.assign_waves(results, home, away, p_result, p_user, len(chunk), users, teams)
+
+        result_wave = waves[results]
+        result_order = np.argsort(result_wave, kind='stable')
+        result_bounds = np.searchsorted(result_wave[result_order], np.arange(result_wave.max() + 2))
+        p_wave = waves[p_result]
+        p_order = np.argsort(p_wave, kind='stable')
+        p_bounds = np.searchsorted(p_wave[p_order], np.arange(result_wave.max() + 2))
+        local = np.full(len(chunk), -1, dtype=np.int64)
+
+        for wave in range(result_wave.max() + 1):
+            wave_results = results[result_order[result_bounds[wave]:result_bounds[wave + 1]]]
+            selected = p_order[p_bounds[wave]:p_bounds[wave + 1]]
+            h, a, s = home[wave_results], away[wave_results], score[wave_results]
+            team_ratings = np.stack([teams.rating[h], teams.rating[a]], axis=1)
+
+            # 편별 선수 평균 레이팅 (선수가 없는 편은 팀 레이팅 사용)
+            local[wave_results] = np.arange(len(wave_results))
+            rows, sides = local[p_result[selected]], p_side[selected]
+            sums = np.zeros_like(team_ratings)
+            counts = np.zeros_like(team_ratings)
+            np.add.at(sums, (rows, sides), users.rating[p_user[selected]])
+            np.add.at(counts, (rows, sides), 1)
+            averages = np.where(counts > 0, sums / np.maximum(counts, 1), team_ratings)
+
+            side_scores = np.stack([s, 1 - s], axis=1)
+            player_delta = k_factor * (side_scores - expected_scores(averages))
+            player_results = p_result[selected]
+            users.apply(p_user[selected], player_delta[rows, sides], result_ids[player_results], ends_at[player_results])
+
+            team_delta = k_factor * (side_scores - expected_scores(team_ratings))
+            for indexes, deltas in ((h, team_delta[:, 0]), (a, team_delta[:, 1])):
+                teams.apply(indexes, deltas, result_ids[wave_results], ends_at[wave_results])
+
+    def accumulate_records(self, users, teams, home, away, home_scores, away_scores, score, team_match,
+                           p_result, p_user, p_side):
+        """
+        경기 수/승무패/득실 누적 (순서와 무관하므로 청크 단위로 처리)
+        """
+        h, a, s = home[team_match], away[team_match], score[team_match]
+        for indexes, side_score, scored, conceded in (
+            (h, s, home_scores[team_match], away_scores[team_match]),
+            (a, 1 - s, away_scores[team_match], home_scores[team_match]),
+        ):
+            teams.add('matches_played', indexes)
+            teams.add('wins', indexes[side_score == 1])
+            teams.add('draws', indexes[side_score == 0.5])
+            teams.add('losses', indexes[side_score == 0])
+            teams.add('goals_scored', indexes, scored)
+            teams.add('goals_conceded', indexes, conceded)
+
+        users.add('matches_played', p_user)
+        sided = p_side >= 0
+        side_score = np.where(p_side[sided] == 0, score[p_result[sided]], 1 - score[p_result[sided]])
+        players = p_user[sided]
+        users.add('wins', players[side_score == 1])
+        users.add('draws', players[side_score == 0.5])
+        users.add('losses', players[side_score == 0])
+
+    def assign_waves(self, results, home, away, p_result, p_user, size, users, teams):
+        """
+        결과별 단계 번호 계산
+
+        각 결과는 관련 팀/선수가 마지막으로 등장한 단계의 다음 단계에 배치되므로,
+        같은 단계의 결과끼리는 팀/선수가 겹치지 않고 각자의 시간 순서도 유지됩니다.
+        """
+        order = np.argsort(p_result, kind='stable')
+        bounds = np.searchsorted(p_result[order], np.arange(size + 1))
+        players = p_user[order]
+        team_last = np.full(len(teams.ids), -1, dtype=np.int64)
+        user_last = np.full(len(users.ids), -1, dtype=np.int64)
+        waves = np.zeros(size, dtype=np.int64)
+        for i in results.tolist():
+            roster = players[bounds[i]:bounds[i + 1]]
+            entities = [home[i], away[i]]
+            wave = max(team_last[entities].max(), user_last[roster].max(initial=-1)) + 1
+            team_last[entities] = wave
+            user_last[roster] = wave
+            waves[i] = wave
+        return waves
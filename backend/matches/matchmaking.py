@@ -0,0 +1,209 @@
+"""
+팀 매치메이킹
+
+대기 중인 항목을 (지역, 날짜) 버킷으로 나누고 버킷 안에서 팀 레이팅 순으로 정렬해 둔 뒤,
+오래 기다린 항목부터 자신의 레이팅 위치에서 양옆으로 가까운 상대를 찾습니다.
+허용 레이팅 차이(밴드)는 기다린 시간에 비례해 넓어지고, 두 팀 모두의 밴드 안에 있어야 매칭됩니다.
+정렬 리스트를 이분 탐색하므로 버킷 전체를 쌍으로 비교하지 않고, 매칭된 항목은 리스트에서 바로 뺍니다.
+
+상대가 정해지면 두 팀이 함께 고른 구장에서 겹치는 시간대 중 비어 있는 가장 이른 슬롯에
+팀 매치를 만듭니다. 항목 상태 변경, 구장 일정 검사, 매치 생성은 한 트랜잭션에서 처리합니다.
+"""
+import bisect
+import logging
+from collections import defaultdict
+from datetime import datetime, timedelta
+from django.db import transaction
+from django.utils import timezone
+from venues.models import Venue
+from .models import Match, MatchmakingTicket
+from .scheduling import find_schedule_conflicts, lock_venue_schedule
+
+logger = logging.getLogger(__name__)
+
+MATCHMAKING_DURATION = timedelta(hours=2)
+SLOT_STEP = timedelta(minutes=30)
+
+BASE_RATING_BAND = 50.0
+BAND_GROWTH_PER_MINUTE = 5.0
+MAX_RATING_BAND = 400.0
+
+# 팀 수준 → 매치 실력 수준 (매치에는 프로 단계가 없음)
+MATCH_SKILL_LEVELS = {'BEG': 'BEG', 'INT': 'INT', 'ADV': 'ADV'}
+
+
+def rating_band(created_at, now):
+    """
+    기다린 시간에 따라 넓어지는 허용 레이팅 차이
+    """
+    waited = max((now - created_at).total_seconds(), 0) / 60
+    return min(BASE_RATING_BAND + BAND_GROWTH_PER_MINUTE * waited, MAX_RATING_BAND)
+
+
+def common_window(ticket, other):
+    """
+    두 항목의 희망 시간대가 겹치는 [시작, 종료) (경기 시간보다 짧으면 None)
+    """
+    start = max(ticket['earliest_start'], other['earliest_start'])
+    end = min(ticket['latest_end'], other['latest_end'])
+    if datetime.combine(ticket['date'], end) - datetime.combine(ticket['date'], start) < MATCHMAKING_DURATION:
+        return None
+    return start, end
+
+
+def candidate_slots(day, start, end):
+    """
+    [start, end) 안에서 SLOT_STEP 간격으로 시작하는 경기 슬롯 목록
+    """
+    slots = []
+    slot_start = datetime.combine(day, start)
+    last_start = datetime.combine(day, end) - MATCHMAKING_DURATION
+    while slot_start <= last_start:
+        slots.append((day, slot_start.time(), (slot_start + MATCHMAKING_DURATION).time()))
+        slot_start += SLOT_STEP
+    return slots
+
+
+def load_waiting_tickets():
+    """
+    대기 중인 항목을 dict 목록으로 읽음 (쿼리 2번: 항목+팀 레이팅, 희망 구장)
+    """
+    tickets = {
+        row['pk']: dict(row, venues=set())
+        for row in MatchmakingTicket.objects.filter(status='WAITING').values(
+            'pk', 'team_id', 'team__name', 'team__level', 'team__rating', 'created_by_id',
+            'region', 'date', 'earliest_start', 'latest_end', 'created_at',
+        )
+    }
+    for ticket_id, venue_id in MatchmakingTicket.venues.through.objects.filter(
+        matchmakingticket_id__in=tickets
+    ).values_list('matchmakingticket_id', 'venue_id'):
+        tickets[ticket_id]['venues'].add(venue_id)
+    return list(tickets.values())
+
+
+def create_team_match(ticket, other, window, now):
+    """
+    두 항목을 매칭 상태로 바꾸고 팀 매치를 생성 (빈 슬롯이 없거나 항목이 이미 처리됐으면 None)
+
+    먼저 등록한 팀이 홈팀이 되고, 그 팀 주장이 매치 개설자가 됩니다.
+    """
+    home, away = sorted((ticket, other), key=lambda row: (row['created_at'], row['pk']))
+    # 오늘 날짜라면 이미 시작 시간이 지난 슬롯은 제외
+    slots = [
+        slot for slot in candidate_slots(ticket['date'], *window)
+        if timezone.make_aware(datetime.combine(slot[0], slot[1])) > now
+    ]
+    for venue_id in sorted(ticket['venues'] & other['venues']):
+        with transaction.atomic():
+            lock_venue_schedule(venue_id)
+            busy = {slot for slot, _ in find_schedule_conflicts(venue_id, slots)}
+            free = [slot for slot in slots if slot not in busy]
+            if not free:
+                continue
+            claimed = MatchmakingTicket.objects.filter(
+                pk__in=[home['pk'], away['pk']], status='WAITING'
+            ).update(status='MATCHED', matched_at=now, updated_at=now)
+            if claimed != 2:
+                # 그 사이 취소된 항목이 있으면 되돌리고 포기
+                transaction.set_rollback(True)
+                return None
+
+            day, start_time, end_time = free[0]
+            size = int(Venue.objects.filter(pk=venue_id).values_list('size', flat=True).get())
+            match = Match.objects.create(
+                title=f"{home['team__name']} vs {away['team__name']}", match_type='TEAM',
+                venue_id=venue_id, date=day, start_time=start_time, end_time=end_time,
+                max_players=size * 2, price=0, host_id=home['created_by_id'],
+                skill_level=MATCH_SKILL_LEVELS.get(home['team__level'], 'ALL'),
+                team_match=True, home_team_id=home['team_id'], away_team_id=away['team_id'],
+            )
+            MatchmakingTicket.objects.filter(pk__in=[home['pk'], away['pk']]).update(match=match)
+            return match
+    return None
+
+
+def match_bucket(tickets, now):
+    """
+    같은 (지역, 날짜) 버킷의 항목들을 매칭하고 생성한 매치 목록을 반환
+    """
+    entries = sorted(tickets, key=lambda row: (row['team__rating'], row['pk']))
+    ratings = [row['team__rating'] for row in entries]
+    bands = {row['pk']: rating_band(row['created_at'], now) for row in entries}
+    created = []
+
+    for ticket in sorted(tickets, key=lambda row: (row['created_at'], row['pk'])):
+        position = bisect.bisect_left(ratings, ticket['team__rating'])
+        while position < len(entries) and entries[position]['pk'] != ticket['pk']:
+            position += 1
+        if position == len(entries):
+            continue  # 이미 매칭되어 빠진 항목
+
+        band = bands[ticket['pk']]
+        left, right = position - 1, position + 1
+        while True:
+            # 레이팅 차이가 더 작은 쪽부터 하나씩 확인하고, 밴드를 벗어나면 그쪽은 멈춤
+            left_gap = ticket['team__rating'] - ratings[left] if left >= 0 else None
+            right_gap = ratings[right] - ticket['team__rating'] if right < len(entries) else None
+            if left_gap is not None and left_gap > band:
+                left_gap, left = None, -1
+            if right_gap is not None and right_gap > band:
+                right_gap, right = None, len(entries)
+            if left_gap is None and right_gap is None:
+                break
+            if right_gap is None or (left_gap is not None and left_gap <= right_gap):
+                index, gap, left = left, left_gap, left - 1
+            else:
+                index, gap, right = right, right_gap, right + 1
+
+            other = entries[index]
+            if other['team_id'] == ticket['team_id'] or gap > bands[other['pk']]:
+                continue
+            window = common_window(ticket, other)
+            if window is None or not ticket['venues'] & other['venues']:
+                continue
+            match = create_team_match(ticket, other, window, now)
+            if match is None:
+                continue
+            created.append(match)
+            for matched in sorted((position, index), reverse=True):
+                del entries[matched]
+                del ratings[matched]
+            break
+    return created
+
+
+def expire_tickets(now):
+    """
+    희망 시간대에 경기를 더 이상 시작할 수 없는 대기 항목을 만료 처리
+    """
+    local_now = timezone.localtime(now)
+    today = local_now.date()
+    latest_end = (local_now + MATCHMAKING_DURATION).time()
+    waiting = MatchmakingTicket.objects.filter(status='WAITING')
+    expired = waiting.filter(date__lt=today).update(status='EXPIRED', updated_at=now)
+    if local_now.date() == (local_now + MATCHMAKING_DURATION).date():
+        expired += waiting.filter(date=today, latest_end__lt=latest_end).update(status='EXPIRED', updated_at=now)
+    else:
+        expired += waiting.filter(date=today).update(status='EXPIRED', updated_at=now)
+    return expired
+
+
+def run_matchmaking(now=None):
+    """
+    만료 처리 후 모든 버킷을 매칭하고 {'expired', 'waiting', 'matched'} 건수를 반환
+    """
+    now = now or timezone.now()
+    expired = expire_tickets(now)
+    buckets = defaultdict(list)
+    tickets = load_waiting_tickets()
+    for ticket in tickets:
+        buckets[ticket['region'], ticket['date']].append(ticket)
+
+    matched = 0
+    for bucket in buckets.values():
+        if len(bucket) > 1:
+            matched += len(match_bucket(bucket, now))
+    counts = {'expired': expired, 'waiting': len(tickets), 'matched': matched}
+    logger.info('팀 매치메이킹: %s', counts)
+    return counts
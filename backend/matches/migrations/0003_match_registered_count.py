@@ -0,0 +1,42 @@
+# Generated by Django 4.2.7 on 2026-10-18 13:26
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.db.models.functions
+
+
+def backfill_registered_count(apps, schema_editor):
+    Match = apps.get_model('matches', 'Match')
+    MatchParticipant = apps.get_model('matches', 'MatchParticipant')
+    active_count = (
+        MatchParticipant.objects
+        .filter(match=models.OuterRef('pk'), status__in=['REGISTERED', 'ATTENDED', 'NOSHOW'])
+        .order_by()
+        .values('match')
+        .annotate(total=models.Count('pk'))
+        .values('total')
+    )
+    Match.objects.update(
+        registered_count=models.functions.Coalesce(models.Subquery(active_count), 0)
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('matches', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='match',
+            name='registered_count',
+            field=models.PositiveIntegerField(default=0, verbose_name='등록 인원'),
+        ),
+        migrations.AlterField(
+            model_name='matchparticipant',
+            name='match',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='participants', to='matches.match'),
+        ),
+        migrations.RunPython(backfill_registered_count, migrations.RunPython.noop),
+    ]
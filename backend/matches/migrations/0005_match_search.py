@@ -0,0 +1,43 @@
+from django.db import migrations, models
+import django.db.models.deletion
+import matches.search
+
+
+def create_search_table(apps, schema_editor):
+    from matches.search import get_search_backend, index_matches
+
+    backend = get_search_backend(schema_editor.connection.alias)
+    backend.create_schema(schema_editor)
+
+    Match = apps.get_model('matches', 'Match')
+    index_matches(Match.objects.using(schema_editor.connection.alias).all())
+
+
+def drop_search_table(apps, schema_editor):
+    from matches.search import get_search_backend
+
+    get_search_backend(schema_editor.connection.alias).drop_schema(schema_editor)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('matches', '0004_match_feed_keyset_idx'),
+        ('venues', '0001_initial'),
+    ]
+
+    operations = [
+        # 테이블은 DB 종류에 따라 직접 생성하므로 모델은 managed=False
+        migrations.CreateModel(
+            name='MatchSearchDocument',
+            fields=[
+                ('match', models.OneToOneField(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, primary_key=True, related_name='search_document', serialize=False, to='matches.match')),
+                ('document', matches.search.SearchDocumentField()),
+            ],
+            options={
+                'db_table': 'matches_match_search',
+                'managed': False,
+            },
+        ),
+        migrations.RunPython(create_search_table, drop_search_table),
+    ]
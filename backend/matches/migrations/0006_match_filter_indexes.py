@@ -0,0 +1,45 @@
+# Generated by Django 4.2.7 on 2026-10-18 13:39
+
+from django.db import migrations, models
+from matches.operations import AddIndexConcurrentlyOnPostgres
+
+
+class Migration(migrations.Migration):
+
+    # PostgreSQL에서 CREATE INDEX CONCURRENTLY는 트랜잭션 밖에서 실행해야 함
+    atomic = False
+
+    dependencies = [
+        ('matches', '0005_match_search'),
+    ]
+
+    operations = [
+        AddIndexConcurrentlyOnPostgres(
+            model_name='match',
+            index=models.Index(condition=models.Q(('status', 'OPEN')), fields=['date', 'start_time'], name='match_open_feed_idx'),
+        ),
+        AddIndexConcurrentlyOnPostgres(
+            model_name='match',
+            index=models.Index(fields=['status', 'date', 'start_time'], name='match_status_date_idx'),
+        ),
+        AddIndexConcurrentlyOnPostgres(
+            model_name='match',
+            index=models.Index(fields=['skill_level', 'date', 'start_time'], name='match_skill_date_idx'),
+        ),
+        AddIndexConcurrentlyOnPostgres(
+            model_name='match',
+            index=models.Index(fields=['gender', 'date', 'start_time'], name='match_gender_date_idx'),
+        ),
+        AddIndexConcurrentlyOnPostgres(
+            model_name='match',
+            index=models.Index(fields=['match_type', 'date', 'start_time'], name='match_type_date_idx'),
+        ),
+        AddIndexConcurrentlyOnPostgres(
+            model_name='match',
+            index=models.Index(fields=['venue', 'date', 'start_time'], name='match_venue_date_idx'),
+        ),
+        AddIndexConcurrentlyOnPostgres(
+            model_name='match',
+            index=models.Index(fields=['price', 'id'], name='match_price_idx'),
+        ),
+    ]
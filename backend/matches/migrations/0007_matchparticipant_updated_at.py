@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-18 13:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('matches', '0006_match_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='matchparticipant',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, verbose_name='수정일'),
+        ),
+    ]
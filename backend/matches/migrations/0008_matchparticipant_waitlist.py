@@ -0,0 +1,27 @@
+# Generated by Django 4.2.7 on 2026-10-18 13:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('matches', '0007_matchparticipant_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='matchparticipant',
+            name='waitlist_position',
+            field=models.PositiveIntegerField(blank=True, null=True, verbose_name='대기 순번'),
+        ),
+        migrations.AlterField(
+            model_name='matchparticipant',
+            name='status',
+            field=models.CharField(choices=[('REGISTERED', '등록됨'), ('CANCELED', '취소됨'), ('ATTENDED', '참석함'), ('NOSHOW', '불참'), ('WAITLISTED', '대기중')], default='REGISTERED', max_length=10, verbose_name='상태'),
+        ),
+        migrations.AddIndex(
+            model_name='matchparticipant',
+            index=models.Index(condition=models.Q(('status', 'WAITLISTED')), fields=['match', 'waitlist_position'], name='participant_waitlist_idx'),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 4.2.7 on 2026-10-18 13:51
+
+from django.db import migrations, models
+
+
+def backfill_ends_at(apps, schema_editor):
+    from matches.models import compute_ends_at
+
+    Match = apps.get_model('matches', 'Match')
+    matches = list(Match.objects.only('date', 'start_time', 'end_time'))
+    for match in matches:
+        match.ends_at = compute_ends_at(match.date, match.start_time, match.end_time)
+    Match.objects.bulk_update(matches, ['ends_at'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('matches', '0008_matchparticipant_waitlist'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='match',
+            name='ends_at',
+            field=models.DateTimeField(blank=True, db_index=True, editable=False, null=True, verbose_name='종료 일시'),
+        ),
+        migrations.RunPython(backfill_ends_at, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='match',
+            index=models.Index(fields=['status', 'ends_at'], name='match_status_ends_idx'),
+        ),
+    ]
@@ -0,0 +1,53 @@
+# Generated by Django 4.2.7 on 2026-10-18 13:55
+
+from django.db import migrations, models
+from matches.operations import AddIndexConcurrentlyOnPostgres
+
+# 같은 구장에서 취소되지 않은 매치의 시간 구간이 겹치지 않도록 하는 배제 제약
+# (자정을 넘기는 매치는 종료 시각을 다음 날로 계산)
+# 기존 데이터에 겹치는 매치가 있으면 생성에 실패하므로 먼저 정리해야 합니다.
+CREATE_OVERLAP_CONSTRAINT = """
+CREATE EXTENSION IF NOT EXISTS btree_gist;
+ALTER TABLE matches_match ADD CONSTRAINT match_no_overlap EXCLUDE USING gist (
+    venue_id WITH =,
+    tsrange(
+        date + start_time,
+        date + end_time + CASE WHEN end_time <= start_time THEN interval '1 day' ELSE interval '0 days' END
+    ) WITH &&
+) WHERE (status <> 'CANCELED');
+"""
+
+DROP_OVERLAP_CONSTRAINT = 'ALTER TABLE matches_match DROP CONSTRAINT IF EXISTS match_no_overlap;'
+
+
+def create_overlap_constraint(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(CREATE_OVERLAP_CONSTRAINT)
+
+
+def drop_overlap_constraint(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(DROP_OVERLAP_CONSTRAINT)
+
+
+class Migration(migrations.Migration):
+
+    # PostgreSQL에서 CREATE INDEX CONCURRENTLY는 트랜잭션 밖에서 실행해야 함
+    atomic = False
+
+    dependencies = [
+        ('matches', '0009_match_ends_at'),
+    ]
+
+    operations = [
+        AddIndexConcurrentlyOnPostgres(
+            model_name='match',
+            index=models.Index(fields=['venue', 'date', 'start_time', 'end_time'], name='match_venue_slot_idx'),
+        ),
+        # 새 인덱스가 앞부분 컬럼을 그대로 포함하므로 기존 인덱스는 제거
+        migrations.RemoveIndex(
+            model_name='match',
+            name='match_venue_date_idx',
+        ),
+        migrations.RunPython(create_overlap_constraint, drop_overlap_constraint),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-18 13:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('matches', '0010_match_venue_slot'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='matchresult',
+            name='ratings_applied_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True, verbose_name='레이팅 반영일'),
+        ),
+    ]
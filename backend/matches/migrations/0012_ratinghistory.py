@@ -0,0 +1,39 @@
+# Generated by Django 4.2.7 on 2026-10-18 14:01
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('teams', '0007_teammember_updated_at'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('matches', '0011_matchresult_ratings_applied_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RatingHistory',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('rating', models.FloatField(verbose_name='레이팅')),
+                ('delta', models.FloatField(verbose_name='변동량')),
+                ('recorded_at', models.DateTimeField(verbose_name='기록 시각')),
+                ('result', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='rating_changes', to='matches.matchresult')),
+                ('team', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='rating_history', to='teams.team')),
+                ('user', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='rating_history', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': '레이팅 이력',
+                'verbose_name_plural': '레이팅 이력들',
+                'ordering': ['recorded_at', 'id'],
+                'indexes': [models.Index(condition=models.Q(('user__isnull', False)), fields=['user', 'recorded_at'], name='rating_history_user_idx'), models.Index(condition=models.Q(('team__isnull', False)), fields=['team', 'recorded_at'], name='rating_history_team_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='ratinghistory',
+            constraint=models.CheckConstraint(check=models.Q(models.Q(('team__isnull', True), ('user__isnull', False)), models.Q(('team__isnull', False), ('user__isnull', True)), _connector='OR'), name='rating_history_single_owner'),
+        ),
+    ]
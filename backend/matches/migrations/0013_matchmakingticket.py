@@ -0,0 +1,45 @@
+# Generated by Django 4.2.7 on 2026-10-18 14:20
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('teams', '0007_teammember_updated_at'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('venues', '0003_venuedailystats'),
+        ('matches', '0012_ratinghistory'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MatchmakingTicket',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('region', models.CharField(max_length=20, verbose_name='지역')),
+                ('date', models.DateField(verbose_name='희망 날짜')),
+                ('earliest_start', models.TimeField(verbose_name='가장 이른 시작 시간')),
+                ('latest_end', models.TimeField(verbose_name='가장 늦은 종료 시간')),
+                ('status', models.CharField(choices=[('WAITING', '대기중'), ('MATCHED', '매칭됨'), ('CANCELED', '취소됨'), ('EXPIRED', '만료됨')], default='WAITING', max_length=10, verbose_name='상태')),
+                ('matched_at', models.DateTimeField(blank=True, null=True, verbose_name='매칭일')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='등록일')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='수정일')),
+                ('created_by', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='matchmaking_tickets', to=settings.AUTH_USER_MODEL)),
+                ('match', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='matchmaking_tickets', to='matches.match')),
+                ('team', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='matchmaking_tickets', to='teams.team')),
+                ('venues', models.ManyToManyField(related_name='matchmaking_tickets', to='venues.venue', verbose_name='희망 구장')),
+            ],
+            options={
+                'verbose_name': '매치메이킹 대기',
+                'verbose_name_plural': '매치메이킹 대기들',
+                'indexes': [models.Index(condition=models.Q(('status', 'WAITING')), fields=['region', 'date'], name='matchmaking_waiting_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='matchmakingticket',
+            constraint=models.UniqueConstraint(condition=models.Q(('status', 'WAITING')), fields=('team',), name='matchmaking_one_waiting_per_team'),
+        ),
+    ]
@@ -1,6 +1,20 @@
+from datetime import datetime, timedelta
 from django.db import models
+from django.db.models import Case, Count, F, Max, OuterRef, Q, Subquery, Value, When
+from django.db.models.functions import Coalesce
+from django.db.models.lookups import GreaterThanOrEqual
 from django.utils.translation import gettext_lazy as _
 from django.utils import timezone
+from .search import SearchDocumentField
+
+def compute_ends_at(match_date, start_time, end_time):
+    """
+    경기 날짜와 시작/종료 시간으로 종료 일시 계산 (종료 시간이 시작 시간 이전이면 자정을 넘긴 경기)
+    """
+    ends_at = timezone.make_aware(datetime.combine(match_date, end_time))
+    if end_time <= start_time:
+        ends_at += timedelta(days=1)
+    return ends_at
 
 class Match(models.Model):
     """
@@ -31,8 +45,10 @@ class Match(models.Model):
     date = models.DateField(_('경기 날짜'))
     start_time = models.TimeField(_('시작 시간'))
     end_time = models.TimeField(_('종료 시간'))
+    ends_at = models.DateTimeField(_('종료 일시'), null=True, blank=True, editable=False, db_index=True)
     status = models.CharField(_('상태'), max_length=10, choices=STATUS_CHOICES, default='OPEN')
     max_players = models.IntegerField(_('최대 인원'))
+    registered_count = models.PositiveIntegerField(_('등록 인원'), default=0)
     current_players = models.ManyToManyField('users.User', through='MatchParticipant', related_name='matches')
     skill_level = models.CharField(_('실력 수준'), max_length=3, choices=[
         ('BEG', '입문'),
@@ -58,28 +74,166 @@ class Match(models.Model):
         verbose_name = _('매치')
         verbose_name_plural = _('매치들')
         ordering = ['-date', '-start_time']
+        indexes = [
+            # 매치 피드 키셋 페이지네이션 (date, start_time, id)
+            models.Index(fields=['date', 'start_time', 'id'], name='match_feed_keyset_idx'),
+            # MatchFilter 조합별 인덱스 (등호 조건 컬럼 + 날짜 범위/정렬)
+            models.Index(fields=['date', 'start_time'], condition=Q(status='OPEN'), name='match_open_feed_idx'),
+            models.Index(fields=['status', 'date', 'start_time'], name='match_status_date_idx'),
+            models.Index(fields=['skill_level', 'date', 'start_time'], name='match_skill_date_idx'),
+            models.Index(fields=['gender', 'date', 'start_time'], name='match_gender_date_idx'),
+            models.Index(fields=['match_type', 'date', 'start_time'], name='match_type_date_idx'),
+            # 구장별 일정 조회/시간 겹침 검사 (venue, date 범위 + 시간 비교)
+            models.Index(fields=['venue', 'date', 'start_time', 'end_time'], name='match_venue_slot_idx'),
+            models.Index(fields=['price', 'id'], name='match_price_idx'),
+            # 종료된 매치 상태 전환 (status IN (...) AND ends_at <= now)
+            models.Index(fields=['status', 'ends_at'], name='match_status_ends_idx'),
+        ]
         
     def __str__(self):
         return f"{self.title} ({self.date} {self.start_time})"
     
+    def save(self, *args, **kwargs):
+        # 상태 전환/지난 매치 제외용 종료 일시를 날짜, 시간과 함께 갱신
+        self.ends_at = compute_ends_at(self.date, self.start_time, self.end_time)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and {'date', 'start_time', 'end_time'} & set(update_fields):
+            kwargs['update_fields'] = set(update_fields) | {'ends_at'}
+        super().save(*args, **kwargs)
+    
     @property
     def is_full(self):
         """매치가 가득 찼는지 확인"""
-        return self.current_players.count() >= self.max_players
+        return self.registered_count >= self.max_players
     
     @property
     def available_spots(self):
         """남은 자리 수 계산"""
-        return max(0, self.max_players - self.current_players.count())
+        return max(0, self.max_players - self.registered_count)
+    
+    def reserve_spot(self):
+        """
+        모집 중이고 자리가 남아 있을 때만 등록 인원을 1 늘림 (UPDATE ... WHERE 한 번)
+        
+        마지막 자리를 채우면 같은 문장에서 상태를 CLOSED로 바꿉니다.
+        SET 절의 registered_count는 갱신 전 값이므로 max_players - 1과 비교합니다.
+        성공 여부를 반환합니다.
+        """
+        reserved = Match.objects.filter(
+            pk=self.pk, status='OPEN', registered_count__lt=F('max_players')
+        ).update(
+            registered_count=F('registered_count') + 1,
+            status=Case(
+                When(registered_count__gte=F('max_players') - 1, then=Value('CLOSED')),
+                default=F('status'),
+            ),
+            updated_at=timezone.now(),
+        )
+        self.refresh_from_db(fields=['registered_count', 'status', 'updated_at'])
+        return reserved == 1
+    
+    def release_spot(self):
+        """
+        등록 인원을 1 줄이고, 인원 마감(CLOSED) 상태였다면 같은 문장에서 다시 OPEN으로 변경
+        """
+        Match.objects.filter(pk=self.pk, registered_count__gt=0).update(
+            registered_count=F('registered_count') - 1,
+            status=Case(When(status='CLOSED', then=Value('OPEN')), default=F('status')),
+            updated_at=timezone.now(),
+        )
+        self.refresh_from_db(fields=['registered_count', 'status', 'updated_at'])
+    
+    def lock_for_update(self):
+        """
+        매치 행을 잠그고 잠근 시점의 상태와 등록 인원을 다시 읽음 (트랜잭션 안에서 호출)
+        
+        대기열 추가와 참가 취소가 같은 잠금으로 직렬화되어, 취소 쪽이 아직 커밋되지 않은
+        대기자를 놓치고 자리를 비워 두는 일이 없게 합니다.
+        """
+        self.status, self.registered_count = (
+            Match.objects.select_for_update().filter(pk=self.pk).values_list('status', 'registered_count').get()
+        )
+    
+    def enqueue_waitlist(self, user):
+        """
+        대기열 마지막 순번으로 참가 신청 추가 (트랜잭션 안에서 호출)
+        
+        매치 행을 잠근 뒤 자리를 다시 확인하므로, 그 사이 취소로 빈자리가 생겼다면
+        대기열 대신 바로 등록합니다. 모집 중인 매치가 아니면 None을 반환합니다.
+        """
+        # 매치 행을 잠가 같은 매치의 순번 할당과 취소를 직렬화
+        self.lock_for_update()
+        if self.reserve_spot():
+            return MatchParticipant.objects.create(match=self, user=user, status='REGISTERED')
+        if self.status not in ('OPEN', 'CLOSED') or not self.is_full:
+            return None
+        last_position = self.participants.filter(status='WAITLISTED').aggregate(
+            last=Max('waitlist_position')
+        )['last'] or 0
+        return MatchParticipant.objects.create(
+            match=self, user=user, status='WAITLISTED', waitlist_position=last_position + 1
+        )
+    
+    def promote_waitlisted(self):
+        """
+        대기열 첫 번째 참가자를 등록 상태로 승격 (트랜잭션 안에서 호출, 대기자가 없으면 None)
+        
+        빠진 자리를 그대로 넘겨받으므로 등록 인원 카운터와 상태는 바뀌지 않습니다.
+        동시에 여러 명이 취소해도 서로 다른 대기자를 잡도록 잠긴 행은 건너뜁니다.
+        """
+        participant = (
+            self.participants.select_for_update(skip_locked=True)
+            .filter(status='WAITLISTED')
+            .order_by('waitlist_position', 'id')
+            .first()
+        )
+        if participant is None:
+            return None
+        participant.status = 'REGISTERED'
+        participant.waitlist_position = None
+        participant.save(update_fields=['status', 'waitlist_position', 'updated_at'])
+        return participant
+    
+    @staticmethod
+    def recount_values():
+        """
+        참가자 테이블 기준 등록 인원과 모집 상태를 다시 계산하는 UPDATE 값
+
+        SET 절은 갱신 전 값을 보므로 상태 계산에도 같은 서브쿼리를 사용합니다.
+        모집 중/마감 상태만 인원에 맞춰 OPEN/CLOSED로 바꾸고 취소/완료 상태는 그대로 둡니다.
+        """
+        active_count = Coalesce(Subquery(
+            MatchParticipant.objects
+            .filter(match=OuterRef('pk'), status__in=MatchParticipant.ACTIVE_STATUSES)
+            .order_by()
+            .values('match')
+            .annotate(total=Count('pk'))
+            .values('total')
+        ), 0)
+        return {
+            'registered_count': active_count,
+            'status': Case(
+                When(Q(status__in=('OPEN', 'CLOSED')) & GreaterThanOrEqual(active_count, F('max_players')),
+                     then=Value('CLOSED')),
+                When(status='CLOSED', then=Value('OPEN')),
+                default=F('status'),
+            ),
+        }
+    
+    def recount_registered(self):
+        """
+        참가자 테이블 기준으로 등록 인원 카운터와 모집 상태를 다시 계산 (관리자 수정, 복구용)
+        
+        UPDATE 한 번으로 계산하므로 그 사이 커밋된 reserve_spot/release_spot을 덮어쓰지 않습니다.
+        """
+        Match.objects.filter(pk=self.pk).update(**self.recount_values(), updated_at=timezone.now())
+        self.refresh_from_db(fields=['registered_count', 'status', 'updated_at'])
     
     @property
     def is_past(self):
         """지난 매치인지 확인"""
-        now = timezone.now()
-        match_datetime = timezone.make_aware(
-            timezone.datetime.combine(self.date, self.end_time)
-        )
-        return now > match_datetime
+        ends_at = self.ends_at or compute_ends_at(self.date, self.start_time, self.end_time)
+        return timezone.now() > ends_at
 
 class MatchParticipant(models.Model):
     """
@@ -90,19 +244,30 @@ class MatchParticipant(models.Model):
         ('CANCELED', '취소됨'),
         ('ATTENDED', '참석함'),
         ('NOSHOW', '불참'),
+        ('WAITLISTED', '대기중'),
     ]
     
-    match = models.ForeignKey(Match, on_delete=models.CASCADE)
+    # 자리를 차지하는 상태 (취소/대기 중인 참가는 인원에 포함하지 않음)
+    ACTIVE_STATUSES = ('REGISTERED', 'ATTENDED', 'NOSHOW')
+    
+    match = models.ForeignKey(Match, on_delete=models.CASCADE, related_name='participants')
     user = models.ForeignKey('users.User', on_delete=models.CASCADE)
     status = models.CharField(_('상태'), max_length=10, choices=STATUS_CHOICES, default='REGISTERED')
     team = models.ForeignKey('teams.Team', on_delete=models.SET_NULL, null=True, blank=True)
     payment_status = models.BooleanField(_('결제 상태'), default=False)
+    waitlist_position = models.PositiveIntegerField(_('대기 순번'), null=True, blank=True)
     registered_at = models.DateTimeField(_('등록일'), auto_now_add=True)
+    updated_at = models.DateTimeField(_('수정일'), auto_now=True)
     
     class Meta:
         verbose_name = _('매치 참가자')
         verbose_name_plural = _('매치 참가자들')
         unique_together = ('match', 'user')  # 한 사용자는 한 매치에 한 번만 등록 가능
+        indexes = [
+            # 매치별 대기열 FIFO 조회
+            models.Index(fields=['match', 'waitlist_position'], condition=Q(status='WAITLISTED'),
+                         name='participant_waitlist_idx'),
+        ]
         
     def __str__(self):
         return f"{self.match.title} - {self.user.username} ({self.get_status_display()})"
@@ -116,6 +281,8 @@ class MatchResult(models.Model):
     away_score = models.IntegerField(_('원정팀 점수'))
     mvp = models.ForeignKey('users.User', on_delete=models.SET_NULL, null=True, blank=True, related_name='mvp_matches')
     summary = models.TextField(_('경기 요약'), blank=True)
+    # 레이팅/전적 반영 시각 (비동기 작업의 중복 실행 방지)
+    ratings_applied_at = models.DateTimeField(_('레이팅 반영일'), null=True, blank=True, editable=False)
     created_at = models.DateTimeField(_('생성일'), auto_now_add=True)
     updated_at = models.DateTimeField(_('수정일'), auto_now=True)
     
@@ -125,3 +292,85 @@ class MatchResult(models.Model):
         
     def __str__(self):
         return f"{self.match.title} - {self.home_score}:{self.away_score}"
+
+class RatingHistory(models.Model):
+    """
+    레이팅 변동 이력 (경기 결과 반영 시 추가만 하는 시계열)
+    """
+    user = models.ForeignKey('users.User', on_delete=models.CASCADE, null=True, blank=True, related_name='rating_history')
+    team = models.ForeignKey('teams.Team', on_delete=models.CASCADE, null=True, blank=True, related_name='rating_history')
+    result = models.ForeignKey(MatchResult, on_delete=models.CASCADE, related_name='rating_changes')
+    rating = models.FloatField(_('레이팅'))
+    delta = models.FloatField(_('변동량'))
+    recorded_at = models.DateTimeField(_('기록 시각'))  # 경기 종료 시각
+    
+    class Meta:
+        verbose_name = _('레이팅 이력')
+        verbose_name_plural = _('레이팅 이력들')
+        ordering = ['recorded_at', 'id']
+        indexes = [
+            # 사용자/팀별 시계열 조회
+            models.Index(fields=['user', 'recorded_at'], condition=Q(user__isnull=False), name='rating_history_user_idx'),
+            models.Index(fields=['team', 'recorded_at'], condition=Q(team__isnull=False), name='rating_history_team_idx'),
+        ]
+        constraints = [
+            # 사용자 또는 팀 중 정확히 하나
+            models.CheckConstraint(
+                check=Q(user__isnull=False, team__isnull=True) | Q(user__isnull=True, team__isnull=False),
+                name='rating_history_single_owner',
+            ),
+        ]
+    
+    def __str__(self):
+        return f"{self.user or self.team} - {self.rating:.1f} ({self.delta:+.1f})"
+
+class MatchmakingTicket(models.Model):
+    """
+    팀 매치메이킹 대기열 항목 (주장이 등록, matchmaking.run_matchmaking이 상대 팀과 매칭)
+    """
+    STATUS_CHOICES = [
+        ('WAITING', '대기중'),
+        ('MATCHED', '매칭됨'),
+        ('CANCELED', '취소됨'),
+        ('EXPIRED', '만료됨'),
+    ]
+
+    team = models.ForeignKey('teams.Team', on_delete=models.CASCADE, related_name='matchmaking_tickets')
+    created_by = models.ForeignKey('users.User', on_delete=models.CASCADE, related_name='matchmaking_tickets')
+    region = models.CharField(_('지역'), max_length=20)
+    date = models.DateField(_('희망 날짜'))
+    earliest_start = models.TimeField(_('가장 이른 시작 시간'))
+    latest_end = models.TimeField(_('가장 늦은 종료 시간'))
+    venues = models.ManyToManyField('venues.Venue', related_name='matchmaking_tickets', verbose_name=_('희망 구장'))
+    status = models.CharField(_('상태'), max_length=10, choices=STATUS_CHOICES, default='WAITING')
+    match = models.ForeignKey(Match, on_delete=models.SET_NULL, null=True, blank=True, related_name='matchmaking_tickets')
+    matched_at = models.DateTimeField(_('매칭일'), null=True, blank=True)
+    created_at = models.DateTimeField(_('등록일'), auto_now_add=True)
+    updated_at = models.DateTimeField(_('수정일'), auto_now=True)
+
+    class Meta:
+        verbose_name = _('매치메이킹 대기')
+        verbose_name_plural = _('매치메이킹 대기들')
+        indexes = [
+            # 매칭 작업의 대기 항목 조회 (지역, 날짜 버킷)
+            models.Index(fields=['region', 'date'], condition=Q(status='WAITING'), name='matchmaking_waiting_idx'),
+        ]
+        constraints = [
+            # 팀당 대기 중인 항목은 하나
+            models.UniqueConstraint(fields=['team'], condition=Q(status='WAITING'), name='matchmaking_one_waiting_per_team'),
+        ]
+
+    def __str__(self):
+        return f"{self.team} - {self.date} {self.earliest_start:%H:%M}~{self.latest_end:%H:%M} ({self.get_status_display()})"
+
+class MatchSearchDocument(models.Model):
+    """
+    매치 전문 검색 문서 (DB별 테이블은 마이그레이션에서 직접 생성)
+    """
+    match = models.OneToOneField(Match, on_delete=models.DO_NOTHING, primary_key=True,
+                                 related_name='search_document', db_constraint=False)
+    document = SearchDocumentField()
+    
+    class Meta:
+        managed = False
+        db_table = 'matches_match_search'
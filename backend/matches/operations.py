@@ -0,0 +1,24 @@
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db.migrations.operations import AddIndex
+
+
+class AddIndexConcurrentlyOnPostgres(AddIndexConcurrently):
+    """
+    PostgreSQL에서는 CREATE INDEX CONCURRENTLY로, 그 외 DB에서는 일반 AddIndex로 인덱스 생성
+
+    운영 DB(PostgreSQL)에서는 테이블 쓰기를 막지 않고 인덱스를 만들고
+    개발/테스트용 SQLite에서도 같은 마이그레이션을 그대로 쓸 수 있게 합니다.
+    마이그레이션에 atomic = False가 필요합니다.
+    """
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == 'postgresql':
+            super().database_forwards(app_label, schema_editor, from_state, to_state)
+        else:
+            AddIndex.database_forwards(self, app_label, schema_editor, from_state, to_state)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == 'postgresql':
+            super().database_backwards(app_label, schema_editor, from_state, to_state)
+        else:
+            AddIndex.database_backwards(self, app_label, schema_editor, from_state, to_state)
@@ -0,0 +1,161 @@
+import base64
+import json
+from functools import reduce
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class MatchCursorPagination(BasePagination):
+    """
+    매치 피드용 키셋(커서) 페이지네이션
+
+    OrderingFilter가 적용한 정렬 필드 뒤에 id를 붙인 (date, start_time, id) 같은
+    복합 키로 다음 페이지 위치를 찾기 때문에 COUNT(*)와 OFFSET 없이
+    어느 페이지든 인덱스 범위 스캔 한 번으로 조회됩니다.
+    """
+    cursor_query_param = 'cursor'
+    page_size = api_settings.PAGE_SIZE
+    invalid_cursor_message = '유효하지 않은 커서입니다.'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(queryset)
+
+        self.reverse = False
+        position = None
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded:
+            self.reverse, position = self.decode_cursor(encoded)
+
+        # 이전 페이지는 정렬을 뒤집어 조회한 뒤 다시 뒤집음
+        ordering = self.ordering
+        if self.reverse:
+            ordering = [self._flip(field) for field in ordering]
+
+        queryset = queryset.order_by(*ordering)
+        if position is not None:
+            try:
+                queryset = queryset.filter(self.build_keyset_filter(queryset, ordering, position))
+            except (TypeError, ValueError, ValidationError):
+                raise NotFound(self.invalid_cursor_message)
+
+        results = list(queryset[:self.page_size + 1])
+        has_more = len(results) > self.page_size
+        results = results[:self.page_size]
+
+        if self.reverse:
+            results.reverse()
+            self.has_next = position is not None
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = position is not None
+
+        self.page = results
+        return results
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_link(False, self.page[-1])
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_link(True, self.page[0])
+
+    def get_ordering(self, queryset):
+        """
+        OrderingFilter(또는 뷰 기본값)가 적용한 정렬에 유일성을 보장하는 id를 덧붙임
+        """
+        ordering = [
+            field for field in queryset.query.order_by
+            if isinstance(field, str) and field.lstrip('-') not in ('id', 'pk')
+        ]
+        if not ordering:
+            ordering = list(queryset.model._meta.ordering)
+        descending = bool(ordering) and ordering[-1].startswith('-')
+        return ordering + ['-id' if descending else 'id']
+
+    def build_keyset_filter(self, queryset, ordering, position):
+        """
+        (a, b, id) > (x, y, z) 형태의 사전식 비교를 Q 조건으로 펼침
+
+        정렬 방향이 모두 같으면 첫 필드에 대한 범위 조건을 함께 걸어
+        복합 인덱스의 범위 스캔으로 바로 시작 위치를 찾게 합니다.
+        """
+        names = [field.lstrip('-') for field in ordering]
+        values = [self.parse_value(queryset, name, value) for name, value in zip(names, position)]
+
+        clauses = []
+        for index, field in enumerate(ordering):
+            lookup = 'lt' if field.startswith('-') else 'gt'
+            equal = {name: value for name, value in zip(names[:index], values[:index])}
+            clauses.append(Q(**equal, **{f'{names[index]}__{lookup}': values[index]}))
+        condition = reduce(lambda left, right: left | right, clauses)
+
+        if len({field.startswith('-') for field in ordering}) == 1:
+            lookup = 'lte' if ordering[0].startswith('-') else 'gte'
+            condition &= Q(**{f'{names[0]}__{lookup}': values[0]})
+        return condition
+
+    def parse_value(self, queryset, name, value):
+        # search_rank 같은 annotate 값은 실수형 관련도 점수
+        if name in queryset.query.annotations:
+            try:
+                return float(value)
+            except (TypeError, ValueError):
+                raise ValidationError(self.invalid_cursor_message)
+        return queryset.model._meta.get_field(name).to_python(value)
+
+    def encode_link(self, reverse, instance):
+        position = []
+        for field in self.ordering:
+            value = getattr(instance, field.lstrip('-'))
+            position.append(value.isoformat() if hasattr(value, 'isoformat') else str(value))
+        payload = json.dumps({'o': self.ordering, 'r': int(reverse), 'p': position})
+        encoded = base64.urlsafe_b64encode(payload.encode()).decode()
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def decode_cursor(self, encoded):
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(encoded.encode()).decode())
+            ordering, reverse, position = payload['o'], bool(payload['r']), payload['p']
+        except (TypeError, ValueError, KeyError):
+            raise NotFound(self.invalid_cursor_message)
+
+        # 정렬 조건이 바뀌었거나 위치가 문자열 목록이 아닌 커서는 해석할 수 없음
+        if ordering != self.ordering:
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(position, list) or len(position) != len(ordering) \
+                or not all(isinstance(value, str) for value in position):
+            raise NotFound(self.invalid_cursor_message)
+        return reverse, position
+
+    def _flip(self, field):
+        return field[1:] if field.startswith('-') else f'-{field}'
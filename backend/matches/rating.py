@@ -0,0 +1,84 @@
+"""
+Elo 레이팅 계산과 레이팅 이력 다운샘플링
+
+경기 결과(홈 기준 승=1, 무=0.5, 패=0)와 양쪽 레이팅으로 변동량을 계산합니다.
+DB 반영은 tasks.apply_match_result가 F 표현식으로 처리합니다.
+"""
+
+ELO_K_FACTOR = 32
+ELO_SCALE = 400
+
+
+def expected_score(rating, opponent_rating):
+    """
+    상대 대비 기대 승점 (0~1)
+    """
+    return 1 / (1 + 10 ** ((opponent_rating - rating) / ELO_SCALE))
+
+
+def match_outcome(home_score, away_score):
+    """
+    홈 기준 실제 승점
+    """
+    if home_score > away_score:
+        return 1.0
+    if home_score < away_score:
+        return 0.0
+    return 0.5
+
+
+def elo_delta(rating, opponent_rating, score, k_factor=ELO_K_FACTOR):
+    """
+    한 경기 후 레이팅 변동량
+    """
+    return k_factor * (score - expected_score(rating, opponent_rating))
+
+
+def downsample_lttb(points, threshold):
+    """
+    Largest-Triangle-Three-Buckets 다운샘플링
+
+    x 오름차순 (x, y) 점들을 threshold개 구간으로 나눠 구간마다 앞에서 고른 점,
+    다음 구간 평균점과 만드는 삼각형 넓이가 가장 큰 점을 고릅니다.
+    처음/마지막 점은 항상 유지하므로 모양(최고/최저점)이 잘 보존됩니다.
+    """
+    if threshold >= len(points):
+        return list(points)
+    if threshold < 3:
+        return [points[0], points[-1]][:max(threshold, 0)]
+
+    sampled = [points[0]]
+    bucket_size = (len(points) - 2) / (threshold - 2)
+    previous = 0
+    for bucket in range(threshold - 2):
+        start = int(bucket * bucket_size) + 1
+        end = int((bucket + 1) * bucket_size) + 1
+        following = points[end:min(int((bucket + 2) * bucket_size) + 1, len(points))]
+        avg_x = sum(x for x, _ in following) / len(following)
+        avg_y = sum(y for _, y in following) / len(following)
+        ax, ay = points[previous]
+        previous = max(range(start, end), key=lambda i: abs(
+            (ax - avg_x) * (points[i][1] - ay) - (ax - points[i][0]) * (avg_y - ay)
+        ))
+        sampled.append(points[previous])
+    sampled.append(points[-1])
+    return sampled
+
+
+def downsample_average(points, threshold):
+    """
+    점들을 순서대로 threshold개 구간으로 나눠 구간별 (x, y) 평균으로 대체
+    """
+    if threshold >= len(points):
+        return list(points)
+    sampled = []
+    for bucket in range(threshold):
+        chunk = points[bucket * len(points) // threshold:(bucket + 1) * len(points) // threshold]
+        sampled.append((sum(x for x, _ in chunk) / len(chunk), sum(y for _, y in chunk) / len(chunk)))
+    return sampled
+
+
+DOWNSAMPLE_METHODS = {
+    'lttb': downsample_lttb,
+    'average': downsample_average,
+}
@@ -0,0 +1,308 @@
+"""
+개인화 매치 추천
+
+모집 중인 매치를 날짜 × 지역(위도/경도 REGION_SIZE_DEG 타일)별 후보 집합으로 미리 만들어
+캐시에 numpy 배열로 저장합니다(tasks.build_recommendation_candidates가 주기적으로 갱신).
+요청 시에는 사용자 정보(친구, 이전에 뛴 구장, 이미 신청한 매치)를 쿼리 몇 번으로 읽은 뒤
+후보 전체를 한 번의 벡터 연산으로 점수화하므로 매치 수만큼 쿼리가 늘지 않습니다.
+
+점수는 실력 수준, 참가자 평균 레이팅과의 차이, 성별 조건, 구장까지 거리, 참가 중인 친구 수,
+이전에 뛴 구장 여부를 0~1로 정규화해 RECOMMEND_WEIGHTS로 가중합한 값입니다.
+"""
+import math
+from collections import defaultdict
+from datetime import datetime, timedelta
+import numpy as np
+from django.core.cache import cache
+from django.db.models import Count, F, Q
+from django.utils import timezone
+from users.models import Friendship
+from venues.geo import EARTH_RADIUS_KM, bounding_box
+from .models import Match, MatchParticipant
+
+RECOMMEND_DAYS = 7
+RECOMMEND_RADIUS_KM = 20.0
+REGION_SIZE_DEG = 0.5  # 위도 기준 약 55km
+NO_REGION = 'none'  # 좌표가 없는 구장의 매치
+CANDIDATE_TIMEOUT = 15 * 60
+
+SKILL_CODES = {'BEG': 0, 'INT': 1, 'ADV': 2, 'PRO': 3}
+GENDER_CODES = {'MIXED': 0, 'MALE': 1, 'FEMALE': 2}
+ANY_SKILL = -1
+
+RATING_FIT_SCALE = 200.0  # 평균 레이팅과 이만큼 차이 나면 적합도 약 0.37
+DISTANCE_SCALE_KM = 5.0
+FRIENDS_CAP = 3
+VENUE_VISITS_CAP = 5
+
+RECOMMEND_WEIGHTS = {
+    'skill': 2.0,
+    'rating': 1.0,
+    'gender': 1.0,
+    'distance': 2.0,
+    'friends': 1.5,
+    'venue': 1.0,
+}
+
+CANDIDATE_ARRAYS = (
+    ('match', np.int64), ('venue', np.int64), ('host', np.int64),
+    ('latitude', np.float64), ('longitude', np.float64),
+    ('skill', np.int8), ('gender', np.int8), ('starts_at', np.float64),
+    ('open_spots', np.int32), ('avg_rating', np.float64),
+)
+
+
+def region_key(latitude, longitude):
+    if latitude is None or longitude is None:
+        return NO_REGION
+    row = int(math.floor((latitude + 90.0) / REGION_SIZE_DEG))
+    column = int(math.floor((longitude + 180.0) / REGION_SIZE_DEG))
+    return f'{row}:{column}'
+
+
+def region_keys_around(latitude, longitude, radius_km):
+    """
+    중심점에서 radius_km 반경과 겹치는 지역 키 목록
+    """
+    min_lat, max_lat, min_lng, max_lng = bounding_box(latitude, longitude, radius_km)
+    rows = range(int(math.floor((min_lat + 90.0) / REGION_SIZE_DEG)),
+                 int(math.floor((max_lat + 90.0) / REGION_SIZE_DEG)) + 1)
+    columns = range(int(math.floor((min_lng + 180.0) / REGION_SIZE_DEG)),
+                    int(math.floor((max_lng + 180.0) / REGION_SIZE_DEG)) + 1)
+    return [f'{row}:{column}' for row in rows for column in columns]
+
+
+def regions_cache_key(day):
+    return f'matches:recommend:{day:%Y%m%d}:regions'
+
+
+def candidates_cache_key(day, region):
+    return f'matches:recommend:{day:%Y%m%d}:{region}'
+
+
+def empty_candidates():
+    candidates = {name: np.empty(0, dtype=dtype) for name, dtype in CANDIDATE_ARRAYS}
+    candidates['participant_owner'] = np.empty(0, dtype=np.int64)
+    candidates['participant_user'] = np.empty(0, dtype=np.int64)
+    return candidates
+
+
+def build_candidates(day):
+    """
+    day의 모집 중인 매치로 지역별 후보 집합을 만들어 캐시에 저장하고 지역 목록을 반환
+
+    참가자는 (후보 위치, 사용자 id) 쌍 배열로 함께 저장해 친구 참가 수를 벡터 연산으로 셉니다.
+    """
+    matches = list(Match.objects.filter(
+        date=day, status='OPEN', registered_count__lt=F('max_players')
+    ).order_by('pk').values_list(
+        'pk', 'venue_id', 'host_id', 'venue__latitude', 'venue__longitude',
+        'skill_level', 'gender', 'start_time', 'max_players', 'registered_count',
+    ))
+    participants = defaultdict(list)
+    for match_id, user_id, rating in MatchParticipant.objects.filter(
+        match__date=day, match__status='OPEN', status__in=MatchParticipant.ACTIVE_STATUSES
+    ).values_list('match_id', 'user_id', 'user__rating'):
+        participants[match_id].append((user_id, rating))
+
+    rows_by_region = defaultdict(list)
+    for row in matches:
+        rows_by_region[region_key(row[3], row[4])].append(row)
+
+    entries = {}
+    for region, rows in rows_by_region.items():
+        candidates = empty_candidates()
+        columns = defaultdict(list)
+        owners, users = [], []
+        for index, (pk, venue_id, host_id, latitude, longitude, skill, gender, start_time,
+                    max_players, registered) in enumerate(rows):
+            joined = participants.get(pk, ())
+            columns['match'].append(pk)
+            columns['venue'].append(venue_id)
+            columns['host'].append(host_id)
+            columns['latitude'].append(np.nan if latitude is None else latitude)
+            columns['longitude'].append(np.nan if longitude is None else longitude)
+            columns['skill'].append(SKILL_CODES.get(skill, ANY_SKILL))
+            columns['gender'].append(GENDER_CODES[gender])
+            columns['starts_at'].append(timezone.make_aware(datetime.combine(day, start_time)).timestamp())
+            columns['open_spots'].append(max_players - registered)
+            columns['avg_rating'].append(
+                sum(rating for _, rating in joined) / len(joined) if joined else np.nan
+            )
+            owners.extend([index] * len(joined))
+            users.extend(user_id for user_id, _ in joined)
+        for name, dtype in CANDIDATE_ARRAYS:
+            candidates[name] = np.array(columns[name], dtype=dtype)
+        candidates['participant_owner'] = np.array(owners, dtype=np.int64)
+        candidates['participant_user'] = np.array(users, dtype=np.int64)
+        entries[candidates_cache_key(day, region)] = candidates
+
+    regions = set(rows_by_region)
+    previous = cache.get(regions_cache_key(day)) or set()
+    cache.set_many(entries, CANDIDATE_TIMEOUT)
+    cache.set(regions_cache_key(day), regions, CANDIDATE_TIMEOUT)
+    # 매치가 모두 없어진 지역의 이전 후보 집합 제거
+    cache.delete_many([candidates_cache_key(day, region) for region in previous - regions])
+    return regions
+
+
+def merge_candidates(parts):
+    """
+    여러 후보 집합을 하나로 합침 (참가자 위치는 앞선 후보 수만큼 밀어 줌)
+    """
+    merged = empty_candidates()
+    if not parts:
+        return merged
+    offsets = np.cumsum([0] + [len(part['match']) for part in parts[:-1]])
+    for name, _ in CANDIDATE_ARRAYS:
+        merged[name] = np.concatenate([part[name] for part in parts])
+    merged['participant_owner'] = np.concatenate([
+        part['participant_owner'] + offset for part, offset in zip(parts, offsets)
+    ])
+    merged['participant_user'] = np.concatenate([part['participant_user'] for part in parts])
+    return merged
+
+
+def load_candidates(days, regions=None):
+    """
+    날짜 목록과 지역 키(None이면 전체)에 해당하는 후보를 캐시에서 읽어 합침
+
+    캐시에 없는 날짜(첫 조회, 만료)는 그 자리에서 만듭니다.
+    """
+    day_regions = cache.get_many([regions_cache_key(day) for day in days])
+    keys = []
+    for day in days:
+        built = day_regions.get(regions_cache_key(day))
+        if built is None:
+            built = build_candidates(day)
+        wanted = built if regions is None else built & set(regions)
+        keys.extend(candidates_cache_key(day, region) for region in wanted)
+    found = cache.get_many(keys)
+    return merge_candidates([found[key] for key in keys if key in found])
+
+
+def get_user_profile(user, days):
+    """
+    점수 계산용 사용자 정보 (쿼리 3번: 친구, 이전 구장별 참가 수, 기간 내 신청한 매치)
+    """
+    friends = set()
+    for from_user, to_user in Friendship.objects.filter(
+        Q(from_user=user) | Q(to_user=user), status='ACCEPTED'
+    ).values_list('from_user_id', 'to_user_id'):
+        friends.update((from_user, to_user))
+    friends.discard(user.pk)
+
+    visits = dict(MatchParticipant.objects.filter(
+        user=user, status__in=MatchParticipant.ACTIVE_STATUSES, match__date__lt=timezone.localdate()
+    ).order_by().values('match__venue_id').annotate(count=Count('id')).values_list('match__venue_id', 'count'))
+
+    joined = MatchParticipant.objects.filter(
+        user=user, match__date__range=(min(days), max(days))
+    ).exclude(status='CANCELED').values_list('match_id', flat=True)
+
+    return {
+        'user_id': user.pk,
+        'skill': SKILL_CODES.get(user.skill_level, ANY_SKILL),
+        'rating': user.rating,
+        'friends': np.fromiter(friends, dtype=np.int64),
+        'visit_venues': np.fromiter(visits.keys(), dtype=np.int64),
+        'visit_counts': np.fromiter(visits.values(), dtype=np.int64),
+        'joined': np.fromiter(joined, dtype=np.int64),
+    }
+
+
+def haversine_km_array(latitude, longitude, latitudes, longitudes):
+    phi0, phi = math.radians(latitude), np.radians(latitudes)
+    d_phi = phi - phi0
+    d_lambda = np.radians(longitudes - longitude)
+    a = np.sin(d_phi / 2) ** 2 + math.cos(phi0) * np.cos(phi) * np.sin(d_lambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+
+def score_candidates(candidates, profile, latitude=None, longitude=None, radius_km=RECOMMEND_RADIUS_KM,
+                     gender=None, now=None, weights=RECOMMEND_WEIGHTS):
+    """
+    후보별 (총점, 거리(km), 참가 중인 친구 수) 배열
+
+    추천 대상이 아닌 후보(이미 신청/직접 개설/시작함/마감/성별 불일치/반경 밖)는 총점이 -inf입니다.
+    """
+    count = len(candidates['match'])
+    now = (now or timezone.now()).timestamp()
+
+    skill = candidates['skill']
+    skill_fit = np.where(skill == ANY_SKILL, 1.0,
+                         np.clip(1.0 - np.abs(skill - profile['skill']) / 2.0, 0.0, 1.0))
+
+    avg_rating = candidates['avg_rating']
+    rating_fit = np.where(np.isnan(avg_rating), 0.5,
+                          np.exp(-((np.nan_to_num(avg_rating) - profile['rating']) / RATING_FIT_SCALE) ** 2))
+
+    mixed = candidates['gender'] == GENDER_CODES['MIXED']
+    if gender is None:
+        gender_fit = np.where(mixed, 1.0, 0.5)
+        excluded = np.zeros(count, dtype=bool)
+    else:
+        gender_fit = np.ones(count)
+        excluded = ~(mixed | (candidates['gender'] == GENDER_CODES[gender]))
+
+    if latitude is None or longitude is None:
+        distance = np.full(count, np.nan)
+        distance_fit = np.zeros(count)
+    else:
+        distance = haversine_km_array(latitude, longitude, candidates['latitude'], candidates['longitude'])
+        excluded |= ~(distance <= radius_km)  # 좌표가 없는 구장(NaN)도 제외
+        distance_fit = np.exp(-np.nan_to_num(distance, nan=np.inf) / DISTANCE_SCALE_KM)
+
+    with_friends = np.isin(candidates['participant_user'], profile['friends'])
+    friends = np.bincount(candidates['participant_owner'][with_friends], minlength=count)
+    friends_fit = np.minimum(friends, FRIENDS_CAP) / FRIENDS_CAP
+
+    visits = np.zeros(count, dtype=np.int64)
+    if len(profile['visit_venues']):
+        order = np.argsort(profile['visit_venues'])
+        visit_venues = profile['visit_venues'][order]
+        visit_counts = profile['visit_counts'][order]
+        position = np.minimum(np.searchsorted(visit_venues, candidates['venue']), len(visit_venues) - 1)
+        visits = np.where(visit_venues[position] == candidates['venue'], visit_counts[position], 0)
+    venue_fit = np.minimum(visits, VENUE_VISITS_CAP) / VENUE_VISITS_CAP
+
+    score = (
+        weights['skill'] * skill_fit + weights['rating'] * rating_fit + weights['gender'] * gender_fit +
+        weights['distance'] * distance_fit + weights['friends'] * friends_fit + weights['venue'] * venue_fit
+    )
+    excluded |= (
+        np.isin(candidates['match'], profile['joined']) | (candidates['host'] == profile['user_id']) |
+        (candidates['starts_at'] <= now) | (candidates['open_spots'] <= 0)
+    )
+    return np.where(excluded, -np.inf, score), distance, friends
+
+
+def top_candidates(score, starts_at, limit):
+    """
+    점수 상위 limit개 후보 위치 (동점이면 먼저 시작하는 매치 우선)
+    """
+    eligible = np.flatnonzero(np.isfinite(score))
+    if len(eligible) > limit:
+        eligible = eligible[np.argpartition(-score[eligible], limit - 1)[:limit]]
+    return eligible[np.lexsort((starts_at[eligible], -score[eligible]))]
+
+
+def recommend_matches(user, latitude=None, longitude=None, radius_km=RECOMMEND_RADIUS_KM,
+                      gender=None, days=RECOMMEND_DAYS, limit=20):
+    """
+    사용자에게 추천할 [(매치 id, 점수, 거리(km) 또는 None, 참가 중인 친구 수)] 목록
+    """
+    today = timezone.localdate()
+    dates = [today + timedelta(days=offset) for offset in range(days)]
+    regions = None
+    if latitude is not None and longitude is not None:
+        regions = region_keys_around(latitude, longitude, radius_km)
+
+    candidates = load_candidates(dates, regions)
+    profile = get_user_profile(user, dates)
+    score, distance, friends = score_candidates(candidates, profile, latitude, longitude, radius_km, gender)
+    return [
+        (int(candidates['match'][index]), float(score[index]),
+         None if np.isnan(distance[index]) else float(distance[index]), int(friends[index]))
+        for index in top_candidates(score, candidates['starts_at'], limit)
+    ]
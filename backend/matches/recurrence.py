@@ -0,0 +1,51 @@
+"""
+반복 매치 일정 전개 (RRULE의 FREQ/INTERVAL/BYDAY/UNTIL/COUNT 부분집합)
+"""
+from datetime import timedelta
+
+WEEKDAYS = ['MO', 'TU', 'WE', 'TH', 'FR', 'SA', 'SU']
+FREQ_CHOICES = [
+    ('DAILY', '매일'),
+    ('WEEKLY', '매주'),
+]
+
+
+def expand_recurrence(dtstart, freq='WEEKLY', interval=1, byweekday=None, until=None, count=None, limit=None):
+    """
+    반복 규칙을 날짜 목록으로 전개
+
+    WEEKLY에서 byweekday를 생략하면 dtstart의 요일을 사용합니다.
+    until(포함)과 count 중 먼저 도달하는 조건에서 멈추고,
+    limit를 넘으면 limit + 1개까지만 만들어 호출 측에서 초과를 판단하게 합니다.
+    """
+    if until is None and count is None and limit is None:
+        raise ValueError('until, count, limit 중 하나는 지정해야 합니다.')
+    weekdays = sorted({WEEKDAYS.index(day) for day in byweekday}) if byweekday else [dtstart.weekday()]
+    if count is not None:
+        limit = count if limit is None else min(count, limit + 1)
+    elif limit is not None:
+        limit += 1
+
+    dates = []
+    if freq == 'DAILY':
+        current = dtstart
+        while (until is None or current <= until) and (limit is None or len(dates) < limit):
+            if not byweekday or current.weekday() in weekdays:
+                dates.append(current)
+            current += timedelta(days=interval)
+        return dates
+
+    # WEEKLY: dtstart가 속한 주의 월요일부터 interval 주씩 이동
+    week_start = dtstart - timedelta(days=dtstart.weekday())
+    while limit is None or len(dates) < limit:
+        for weekday in weekdays:
+            current = week_start + timedelta(days=weekday)
+            if current < dtstart:
+                continue
+            if until is not None and current > until:
+                return dates
+            dates.append(current)
+            if limit is not None and len(dates) >= limit:
+                return dates
+        week_start += timedelta(weeks=interval)
+    return dates
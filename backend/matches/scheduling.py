@@ -0,0 +1,74 @@
+"""
+구장 일정 충돌(시간 겹침) 검사
+
+같은 구장에서 취소되지 않은 매치끼리 시간이 겹치면 충돌로 봅니다.
+(venue, date, start_time, end_time) 인덱스로 필요한 날짜 범위만 읽으므로
+구장에 몇 년치 기록이 쌓여도 조회 비용은 O(log n + 해당 기간 매치 수)입니다.
+자정을 넘기는 매치(종료 시간 <= 시작 시간)는 다음 날까지 이어지는 구간으로 취급합니다.
+
+DB 수준 보장은 PostgreSQL에서는 배제 제약(match_no_overlap, 마이그레이션 0010)이 맡고,
+SQLite에서는 lock_venue_schedule()로 쓰기 잠금을 먼저 잡아 검사와 저장을 직렬화합니다.
+"""
+from datetime import datetime, timedelta
+from django.db import connections
+from django.db.models import F
+
+
+def slot_bounds(match_date, start_time, end_time):
+    """
+    매치 시간 구간 [시작, 종료) (자정을 넘기면 종료를 다음 날로)
+    """
+    start = datetime.combine(match_date, start_time)
+    end = datetime.combine(match_date, end_time)
+    if end <= start:
+        end += timedelta(days=1)
+    return start, end
+
+
+def lock_venue_schedule(venue_id, using='default'):
+    """
+    같은 구장의 일정 검사/저장을 직렬화 (트랜잭션 안에서 호출)
+
+    PostgreSQL은 구장 행을 SELECT ... FOR UPDATE로 잠그고,
+    SQLite는 SELECT FOR UPDATE가 없으므로 빈 UPDATE로 쓰기 잠금을 먼저 확보합니다.
+    """
+    from venues.models import Venue
+
+    venues = Venue.objects.using(using).filter(pk=venue_id)
+    if connections[using].features.has_select_for_update:
+        list(venues.select_for_update().values_list('pk', flat=True))
+    else:
+        venues.update(updated_at=F('updated_at'))
+
+
+def find_schedule_conflicts(venue_id, slots, exclude_pk=None, using='default'):
+    """
+    slots [(date, start_time, end_time), ...]와 겹치는 기존 매치를 찾아
+    [(slot, 충돌 매치 id), ...]로 반환 (범위 쿼리 한 번)
+    """
+    from .models import Match
+
+    if not slots:
+        return []
+    dates = [slot[0] for slot in slots]
+    # 전날 밤에 시작해 자정을 넘긴 매치, 다음 날로 이어지는 새 매치까지 포함
+    candidates = Match.objects.using(using).filter(
+        venue_id=venue_id,
+        date__range=(min(dates) - timedelta(days=1), max(dates) + timedelta(days=1)),
+    ).exclude(status='CANCELED')
+    if exclude_pk is not None:
+        candidates = candidates.exclude(pk=exclude_pk)
+
+    existing = [
+        (slot_bounds(match_date, start_time, end_time), match_id)
+        for match_id, match_date, start_time, end_time
+        in candidates.values_list('id', 'date', 'start_time', 'end_time')
+    ]
+    conflicts = []
+    for slot in slots:
+        start, end = slot_bounds(*slot)
+        for (other_start, other_end), match_id in existing:
+            if other_start < end and start < other_end:
+                conflicts.append((slot, match_id))
+                break
+    return conflicts
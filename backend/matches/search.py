@@ -0,0 +1,325 @@
+"""
+매치 전문 검색 (Full-text search)
+
+제목, 설명, 구장 이름을 n-gram으로 토큰화해 별도의 검색 테이블에 저장하고
+PostgreSQL에서는 GIN 인덱스가 걸린 tsvector, SQLite에서는 FTS5 가상 테이블로
+검색합니다. 한국어는 띄어쓰기만으로 단어를 나누기 어렵기 때문에
+한글/한자는 2글자 단위(bigram)로 잘라 부분 일치 검색이 가능하게 합니다.
+
+영문/숫자는 단어 단위 접두사 검색이라 이전 icontains 검색과 달리 단어 중간의
+부분 문자열로는 찾지 않습니다. (예: 'foot'은 'football'을 찾지만 'ball'은 찾지 않음)
+"""
+import re
+from collections import defaultdict
+from django.db import DEFAULT_DB_ALIAS, NotSupportedError, connections, models
+from django.db.models import Q
+
+SEARCH_TABLE = 'matches_match_search'
+
+# 제목 > 구장명 > 설명 순으로 가중치 부여 (SQLite FTS5에서는 컬럼별 bm25 가중치)
+FIELD_WEIGHTS = (
+    ('title', 'A', 10.0),
+    ('venue', 'B', 5.0),
+    ('document', 'D', 1.0),
+)
+
+TOKEN_RE = re.compile(r'[0-9a-z]+|[ㄱ-ㆎ가-힣一-鿿]+')
+CJK_RE = re.compile(r'[ㄱ-ㆎ가-힣一-鿿]')
+
+# tsvector 위치 값의 최댓값
+MAX_POSITION = 16383
+
+
+def tokenize(text):
+    """
+    텍스트를 검색 토큰 목록으로 변환
+
+    영문/숫자는 단어 단위, 한글/한자는 bigram으로 자르고
+    한 글자짜리 한글 단어는 그대로 둡니다.
+    """
+    tokens = []
+    for word in TOKEN_RE.findall((text or '').lower()):
+        if CJK_RE.match(word) and len(word) > 1:
+            tokens.extend(word[i:i + 2] for i in range(len(word) - 1))
+        else:
+            tokens.append(word)
+    return tokens
+
+
+def build_query_terms(query):
+    """
+    검색어를 (토큰, 접두사 검색 여부) 목록으로 변환
+
+    bigram으로 만들 수 없는 영문 단어나 한 글자 검색어는
+    icontains처럼 부분 일치하도록 접두사 검색을 사용합니다.
+    """
+    terms = []
+    for token in dict.fromkeys(tokenize(query)):
+        prefix = not (CJK_RE.match(token) and len(token) == 2)
+        terms.append((token, prefix))
+    return terms
+
+
+class SearchDocumentField(models.TextField):
+    """
+    검색 문서 컬럼 (PostgreSQL은 tsvector, SQLite는 FTS5 가상 테이블)
+    """
+
+
+@SearchDocumentField.register_lookup
+class FullTextMatch(models.Lookup):
+    """
+    search_document__document__fulltext=<백엔드별 검색식> 조회
+    """
+    lookup_name = 'fulltext'
+
+    def as_sql(self, compiler, connection):
+        raise NotSupportedError('전문 검색은 PostgreSQL과 SQLite에서만 지원합니다.')
+
+    def as_postgresql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return f'{lhs} @@ {rhs}::tsquery', lhs_params + rhs_params
+
+    def as_sqlite(self, compiler, connection):
+        # FTS5는 테이블 이름에 MATCH를 걸어야 모든 컬럼을 대상으로 검색
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return f'{compiler.quote_name_unless_alias(self.lhs.alias)} MATCH {rhs}', rhs_params
+
+
+class SearchRank(models.Func):
+    """
+    검색 관련도 점수 (값이 클수록 관련도가 높음)
+    """
+    output_field = models.FloatField()
+
+    def __init__(self, document, query):
+        super().__init__(document, models.Value(query))
+
+    def as_sql(self, compiler, connection, **extra_context):
+        raise NotSupportedError('전문 검색은 PostgreSQL과 SQLite에서만 지원합니다.')
+
+    def as_postgresql(self, compiler, connection, **extra_context):
+        document, document_params = compiler.compile(self.source_expressions[0])
+        query, query_params = compiler.compile(self.source_expressions[1])
+        return f'ts_rank({document}, {query}::tsquery)', document_params + query_params
+
+    def as_sqlite(self, compiler, connection, **extra_context):
+        # bm25는 현재 MATCH 결과 행 기준으로 계산되고 값이 작을수록 관련도가 높음
+        table = compiler.quote_name_unless_alias(self.source_expressions[0].alias)
+        weights = ', '.join(str(weight) for _, _, weight in FIELD_WEIGHTS)
+        return f'-bm25({table}, 0.0, {weights})', []
+
+
+class BaseMatchSearchBackend:
+    """
+    검색 백엔드 공통 인터페이스
+    """
+    vendor = None
+
+    def __init__(self, connection):
+        self.connection = connection
+
+    def is_available(self):
+        return True
+
+    def create_schema(self, schema_editor):
+        pass
+
+    def drop_schema(self, schema_editor):
+        pass
+
+    def index_rows(self, rows):
+        """
+        (match_id, title, description, venue_name) 튜플 목록을 검색 테이블에 반영
+        """
+        pass
+
+    def remove(self, match_ids):
+        pass
+
+    def build_query(self, terms):
+        raise NotImplementedError
+
+    def search(self, queryset, query):
+        terms = build_query_terms(query)
+        if not terms or not self.is_available():
+            return IcontainsMatchSearchBackend(self.connection).search(queryset, query)
+        search_query = self.build_query(terms)
+        return queryset.filter(
+            search_document__document__fulltext=search_query
+        ).annotate(
+            search_rank=SearchRank(models.F('search_document__document'), search_query)
+        )
+
+
+class IcontainsMatchSearchBackend(BaseMatchSearchBackend):
+    """
+    전문 검색을 쓸 수 없는 환경을 위한 기존 icontains 검색
+    """
+
+    def search(self, queryset, query):
+        return queryset.filter(
+            Q(title__icontains=query) |
+            Q(description__icontains=query) |
+            Q(venue__name__icontains=query)
+        )
+
+
+class PostgresMatchSearchBackend(BaseMatchSearchBackend):
+    """
+    tsvector + GIN 인덱스 기반 검색 (PostgreSQL)
+
+    텍스트 검색 파서의 로케일 의존성을 피하려고 토큰화는 파이썬에서 하고
+    위치와 가중치를 포함한 tsvector 리터럴을 직접 만들어 저장합니다.
+    """
+    vendor = 'postgresql'
+
+    def create_schema(self, schema_editor):
+        schema_editor.execute(
+            f'CREATE TABLE IF NOT EXISTS {SEARCH_TABLE} ('
+            ' match_id bigint PRIMARY KEY REFERENCES matches_match (id)'
+            ' ON DELETE CASCADE DEFERRABLE INITIALLY DEFERRED,'
+            ' document tsvector NOT NULL)'
+        )
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS {SEARCH_TABLE}_document_gin '
+            f'ON {SEARCH_TABLE} USING GIN (document)'
+        )
+
+    def drop_schema(self, schema_editor):
+        schema_editor.execute(f'DROP TABLE IF EXISTS {SEARCH_TABLE}')
+
+    def build_document(self, title, description, venue_name):
+        texts = {'title': title, 'venue': venue_name, 'document': description}
+        positions = defaultdict(list)
+        position = 0
+        for field, weight, _ in FIELD_WEIGHTS:
+            for token in tokenize(texts[field]):
+                position = min(position + 1, MAX_POSITION)
+                positions[token].append(f'{position}{weight}')
+        return ' '.join(
+            f"'{token}':{','.join(marks)}" for token, marks in positions.items()
+        )
+
+    def index_rows(self, rows):
+        params = [
+            (match_id, self.build_document(title, description, venue_name))
+            for match_id, title, description, venue_name in rows
+        ]
+        if not params:
+            return
+        with self.connection.cursor() as cursor:
+            cursor.executemany(
+                f'INSERT INTO {SEARCH_TABLE} (match_id, document) VALUES (%s, %s::tsvector) '
+                'ON CONFLICT (match_id) DO UPDATE SET document = EXCLUDED.document',
+                params
+            )
+
+    def remove(self, match_ids):
+        with self.connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {SEARCH_TABLE} WHERE match_id = ANY(%s)', [list(match_ids)])
+
+    def build_query(self, terms):
+        return ' & '.join(f"'{token}':*" if prefix else f"'{token}'" for token, prefix in terms)
+
+
+class SqliteMatchSearchBackend(BaseMatchSearchBackend):
+    """
+    FTS5 가상 테이블 기반 검색 (SQLite)
+
+    rowid와 match_id 컬럼 모두 매치 id를 저장하고
+    컬럼별 bm25 가중치로 관련도를 계산합니다.
+    """
+    vendor = 'sqlite'
+    _available = {}
+
+    def is_available(self):
+        key = self.connection.settings_dict['NAME']
+        if key not in self._available:
+            self._available[key] = SEARCH_TABLE in self.connection.introspection.table_names()
+        return self._available[key]
+
+    def create_schema(self, schema_editor):
+        columns = ', '.join(field for field, _, _ in FIELD_WEIGHTS)
+        try:
+            schema_editor.execute(
+                f'CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} '
+                f'USING fts5(match_id UNINDEXED, {columns})'
+            )
+        except Exception:
+            # FTS5 없이 빌드된 SQLite에서는 icontains 검색으로 대체
+            pass
+        self._available.clear()
+
+    def drop_schema(self, schema_editor):
+        schema_editor.execute(f'DROP TABLE IF EXISTS {SEARCH_TABLE}')
+        self._available.clear()
+
+    def index_rows(self, rows):
+        rows = list(rows)
+        if not rows or not self.is_available():
+            return
+        with self.connection.cursor() as cursor:
+            cursor.executemany(
+                f'DELETE FROM {SEARCH_TABLE} WHERE rowid = %s',
+                [(match_id,) for match_id, _, _, _ in rows]
+            )
+            cursor.executemany(
+                f'INSERT INTO {SEARCH_TABLE} (rowid, match_id, title, venue, document) '
+                'VALUES (%s, %s, %s, %s, %s)',
+                [
+                    (match_id, match_id, ' '.join(tokenize(title)),
+                     ' '.join(tokenize(venue_name)), ' '.join(tokenize(description)))
+                    for match_id, title, description, venue_name in rows
+                ]
+            )
+
+    def remove(self, match_ids):
+        if not self.is_available():
+            return
+        with self.connection.cursor() as cursor:
+            cursor.executemany(
+                f'DELETE FROM {SEARCH_TABLE} WHERE rowid = %s',
+                [(match_id,) for match_id in match_ids]
+            )
+
+    def build_query(self, terms):
+        return ' AND '.join(f'"{token}"*' if prefix else f'"{token}"' for token, prefix in terms)
+
+
+BACKENDS = {
+    'postgresql': PostgresMatchSearchBackend,
+    'sqlite': SqliteMatchSearchBackend,
+}
+
+
+def get_search_backend(using=None):
+    """
+    데이터베이스 종류에 맞는 검색 백엔드 반환
+    """
+    conn = connections[using or DEFAULT_DB_ALIAS]
+    backend_class = BACKENDS.get(conn.vendor, IcontainsMatchSearchBackend)
+    return backend_class(conn)
+
+
+def search_matches(queryset, query):
+    """
+    매치 쿼리셋을 검색어로 필터링하고 search_rank(높을수록 관련도 높음)를 붙여 반환
+    """
+    return get_search_backend(queryset.db).search(queryset, query)
+
+
+def index_matches(queryset, batch_size=2000):
+    """
+    주어진 매치들을 검색 테이블에 (재)색인
+    """
+    backend = get_search_backend(queryset.db)
+    rows = queryset.values_list('id', 'title', 'description', 'venue__name')
+    batch = []
+    for row in rows.iterator(chunk_size=batch_size):
+        batch.append(row)
+        if len(batch) >= batch_size:
+            backend.index_rows(batch)
+            batch = []
+    backend.index_rows(batch)
@@ -1,7 +1,23 @@
+from datetime import datetime
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
-from .models import Match, MatchParticipant, MatchResult
+from django.db import transaction
+from django.utils import timezone
+from venues.availability import invalidate_availability
+from venues.geo import MAX_RADIUS_KM
+from venues.stats import schedule_today_stats_refresh
+from .cache import bump_feed_version
+from .export import EXPORT_DATASETS, EXPORT_FORMATS
+from .matchmaking import MATCHMAKING_DURATION, rating_band
+from .models import Match, MatchmakingTicket, MatchParticipant, MatchResult, compute_ends_at
+from .rating import DOWNSAMPLE_METHODS
+from .recommendation import RECOMMEND_DAYS, RECOMMEND_RADIUS_KM
+from .recurrence import FREQ_CHOICES, WEEKDAYS, expand_recurrence
+from .scheduling import find_schedule_conflicts, lock_venue_schedule
+from .search import get_search_backend
+from .tasks import apply_match_result
 from venues.serializers import VenueSerializer
+from teams.models import Team
 from teams.serializers import TeamSerializer
 
 User = get_user_model()
@@ -22,7 +38,7 @@ class MatchParticipantSerializer(serializers.ModelSerializer):
     
     class Meta:
         model = MatchParticipant
-        fields = ('id', 'user', 'status', 'team', 'payment_status', 'registered_at')
+        fields = ('id', 'user', 'status', 'waitlist_position', 'team', 'payment_status', 'registered_at')
 
 class MatchResultSerializer(serializers.ModelSerializer):
     """
@@ -40,16 +56,24 @@ class MatchListSerializer(serializers.ModelSerializer):
     """
     venue_name = serializers.CharField(source='venue.name', read_only=True)
     host_name = serializers.CharField(source='host.username', read_only=True)
-    current_players_count = serializers.SerializerMethodField()
+    current_players_count = serializers.IntegerField(source='registered_count', read_only=True)
     
     class Meta:
         model = Match
         fields = ('id', 'title', 'match_type', 'venue_name', 'date', 'start_time', 
                   'end_time', 'status', 'max_players', 'current_players_count', 
                   'skill_level', 'gender', 'price', 'host_name')
+
+class RecommendedMatchSerializer(MatchListSerializer):
+    """
+    추천 매치 시리얼라이저 (추천 점수, 구장까지 거리, 참가 중인 친구 수 포함)
+    """
+    score = serializers.FloatField(read_only=True)
+    distance_km = serializers.FloatField(read_only=True, allow_null=True)
+    friends_attending = serializers.IntegerField(read_only=True)
     
-    def get_current_players_count(self, obj):
-        return obj.current_players.count()
+    class Meta(MatchListSerializer.Meta):
+        fields = MatchListSerializer.Meta.fields + ('score', 'distance_km', 'friends_attending')
 
 class MatchDetailSerializer(serializers.ModelSerializer):
     """
@@ -59,6 +83,7 @@ class MatchDetailSerializer(serializers.ModelSerializer):
     host = UserSimpleSerializer(read_only=True)
     home_team = TeamSerializer(read_only=True)
     away_team = TeamSerializer(read_only=True)
+    current_players_count = serializers.IntegerField(source='registered_count', read_only=True)
     participants = serializers.SerializerMethodField()
     result = MatchResultSerializer(read_only=True)
     is_joined = serializers.SerializerMethodField()
@@ -66,21 +91,33 @@ class MatchDetailSerializer(serializers.ModelSerializer):
     class Meta:
         model = Match
         fields = ('id', 'title', 'match_type', 'venue', 'date', 'start_time', 
-                  'end_time', 'status', 'max_players', 'skill_level', 'gender', 
-                  'price', 'description', 'host', 'team_match', 'home_team', 
-                  'away_team', 'participants', 'result', 'is_joined', 
+                  'end_time', 'status', 'max_players', 'current_players_count',
+                  'skill_level', 'gender', 'price', 'description', 'host', 
+                  'team_match', 'home_team', 'away_team', 'participants', 'result', 'is_joined', 
                   'created_at', 'updated_at')
     
     def get_participants(self, obj):
-        participants = MatchParticipant.objects.filter(match=obj)
+        # MatchDetailView에서 user까지 prefetch한 참가자 목록 사용
+        participants = obj.participants.all()
         return MatchParticipantSerializer(participants, many=True).data
     
     def get_is_joined(self, obj):
         user = self.context['request'].user
         if user.is_authenticated:
-            return MatchParticipant.objects.filter(match=obj, user=user).exists()
+            return any(participant.user_id == user.id for participant in obj.participants.all())
         return False
 
+def check_schedule_conflicts(venue_id, slots, exclude_pk=None):
+    """
+    같은 구장에서 시간이 겹치는 매치가 있으면 ValidationError (lock_venue_schedule 이후 호출)
+    """
+    conflicts = find_schedule_conflicts(venue_id, slots, exclude_pk=exclude_pk)
+    if conflicts:
+        raise serializers.ValidationError({
+            "date": [f"{slot[0]} {slot[1]:%H:%M}-{slot[2]:%H:%M} 시간대에 이미 매치(#{match_id})가 있습니다."
+                     for slot, match_id in conflicts]
+        })
+
 class MatchCreateSerializer(serializers.ModelSerializer):
     """
     매치 생성 시리얼라이저
@@ -93,9 +130,104 @@ class MatchCreateSerializer(serializers.ModelSerializer):
     
     def create(self, validated_data):
         user = self.context['request'].user
-        match = Match.objects.create(host=user, **validated_data)
+        venue = validated_data['venue']
+        with transaction.atomic():
+            # 같은 구장의 일정 검사와 저장을 직렬화한 뒤 시간 겹침 확인
+            lock_venue_schedule(venue.pk)
+            check_schedule_conflicts(venue.pk, [
+                (validated_data['date'], validated_data['start_time'], validated_data['end_time'])
+            ])
+            match = Match.objects.create(host=user, **validated_data)
         return match
 
+class MatchTemplateSerializer(serializers.ModelSerializer):
+    """
+    일괄 생성용 매치 템플릿 시리얼라이저 (날짜 제외)
+    """
+    class Meta:
+        model = Match
+        fields = tuple(field for field in MatchCreateSerializer.Meta.fields if field != 'date')
+    
+    def validate(self, data):
+        # 종료 시간이 시작 시간보다 이르면 자정을 넘기는 매치로 처리
+        if data['start_time'] == data['end_time']:
+            raise serializers.ValidationError("시작 시간과 종료 시간이 같을 수 없습니다.")
+        return data
+
+class MatchRecurrenceSerializer(serializers.Serializer):
+    """
+    반복 규칙 시리얼라이저 (RRULE의 FREQ/INTERVAL/BYDAY/UNTIL/COUNT)
+    """
+    freq = serializers.ChoiceField(choices=FREQ_CHOICES, default='WEEKLY')
+    interval = serializers.IntegerField(min_value=1, max_value=52, default=1)
+    byweekday = serializers.ListField(child=serializers.ChoiceField(choices=WEEKDAYS), required=False, allow_empty=False)
+    dtstart = serializers.DateField()
+    until = serializers.DateField(required=False)
+    count = serializers.IntegerField(min_value=1, required=False)
+    
+    def validate(self, data):
+        if 'until' not in data and 'count' not in data:
+            raise serializers.ValidationError("until 또는 count 중 하나는 지정해야 합니다.")
+        if 'until' in data and data['until'] < data['dtstart']:
+            raise serializers.ValidationError("until은 dtstart 이후여야 합니다.")
+        return data
+
+class MatchBulkCreateSerializer(serializers.Serializer):
+    """
+    반복/일괄 매치 생성 시리얼라이저
+    
+    템플릿 하나에 날짜 목록(dates) 또는 반복 규칙(recurrence)을 받아
+    모든 일정을 메모리에서 검증하고, 구장 일정 충돌은 저장 직전에 범위 쿼리 한 번으로 확인합니다.
+    """
+    MAX_MATCHES = 500
+    
+    template = MatchTemplateSerializer()
+    dates = serializers.ListField(child=serializers.DateField(), required=False, allow_empty=False)
+    recurrence = MatchRecurrenceSerializer(required=False)
+    
+    def validate(self, data):
+        if ('dates' in data) == ('recurrence' in data):
+            raise serializers.ValidationError("dates와 recurrence 중 하나만 지정해야 합니다.")
+        
+        if 'recurrence' in data:
+            dates = expand_recurrence(limit=self.MAX_MATCHES, **data['recurrence'])
+        else:
+            dates = data['dates']
+        dates = sorted(set(dates))
+        if not dates:
+            raise serializers.ValidationError("생성할 매치 일정이 없습니다.")
+        if len(dates) > self.MAX_MATCHES:
+            raise serializers.ValidationError(f"한 번에 최대 {self.MAX_MATCHES}개까지 생성할 수 있습니다.")
+        
+        data['dates'] = dates
+        return data
+    
+    def create(self, validated_data):
+        user = self.context['request'].user
+        template = validated_data['template']
+        matches = [
+            Match(host=user, date=match_date,
+                  ends_at=compute_ends_at(match_date, template['start_time'], template['end_time']),
+                  **template)
+            for match_date in validated_data['dates']
+        ]
+        
+        with transaction.atomic():
+            # 같은 구장의 겹치는 시간대 매치를 범위 쿼리 한 번으로 확인
+            lock_venue_schedule(template['venue'].pk)
+            check_schedule_conflicts(template['venue'].pk, [
+                (match.date, match.start_time, match.end_time) for match in matches
+            ])
+            matches = Match.objects.bulk_create(matches)
+            # bulk_create는 post_save 시그널을 보내지 않으므로 검색 색인과 목록 캐시를 직접 갱신
+            get_search_backend().index_rows([
+                (match.pk, match.title, match.description, match.venue.name) for match in matches
+            ])
+            transaction.on_commit(bump_feed_version)
+            transaction.on_commit(lambda: invalidate_availability(template['venue'].pk, validated_data['dates']))
+            transaction.on_commit(lambda: schedule_today_stats_refresh(template['venue'].pk, validated_data['dates']))
+        return matches
+
 class MatchUpdateSerializer(serializers.ModelSerializer):
     """
     매치 업데이트 시리얼라이저
@@ -111,6 +243,18 @@ class MatchUpdateSerializer(serializers.ModelSerializer):
         if instance.is_past:
             raise serializers.ValidationError("이미 종료된 매치는 수정할 수 없습니다.")
         return data
+    
+    def update(self, instance, validated_data):
+        slot = tuple(validated_data.get(field, getattr(instance, field)) for field in ('date', 'start_time', 'end_time'))
+        status = validated_data.get('status', instance.status)
+        old_slot = (instance.date, instance.start_time, instance.end_time)
+        # 시간이 바뀌거나 취소된 매치를 되살리는 경우에만 겹침 확인
+        needs_check = status != 'CANCELED' and (slot != old_slot or instance.status == 'CANCELED')
+        with transaction.atomic():
+            if needs_check:
+                lock_venue_schedule(instance.venue_id)
+                check_schedule_conflicts(instance.venue_id, [slot], exclude_pk=instance.pk)
+            return super().update(instance, validated_data)
 
 class MatchResultCreateSerializer(serializers.ModelSerializer):
     """
@@ -122,14 +266,96 @@ class MatchResultCreateSerializer(serializers.ModelSerializer):
     
     def create(self, validated_data):
         match_id = self.context['match_id']
-        match = Match.objects.get(id=match_id)
-        
-        # 매치 상태 업데이트
-        match.status = 'COMPLETED'
-        match.home_score = validated_data.get('home_score')
-        match.away_score = validated_data.get('away_score')
-        match.save()
-        
-        # 결과 생성
-        result = MatchResult.objects.create(match=match, **validated_data)
-        return result 
\ No newline at end of file
+        with transaction.atomic():
+            match = Match.objects.get(id=match_id)
+            
+            # 매치 상태 업데이트
+            match.status = 'COMPLETED'
+            match.home_score = validated_data.get('home_score')
+            match.away_score = validated_data.get('away_score')
+            match.save()
+            
+            # 결과 생성
+            result = MatchResult.objects.create(match=match, **validated_data)
+            # 레이팅/전적 반영은 커밋 후 Celery 작업으로 처리해 응답을 지연시키지 않음
+            transaction.on_commit(lambda: apply_match_result.delay(result.pk))
+        return result
+
+
+class RatingHistoryQuerySerializer(serializers.Serializer):
+    """
+    레이팅 이력 조회 옵션 시리얼라이저
+    """
+    points = serializers.IntegerField(min_value=2, max_value=1000, default=200)
+    method = serializers.ChoiceField(choices=list(DOWNSAMPLE_METHODS), default='lttb')
+
+
+class MatchExportQuerySerializer(serializers.Serializer):
+    """
+    매치 데이터 내보내기 옵션 시리얼라이저 (매치 필터는 MatchFilter로 별도 처리)
+    """
+    dataset = serializers.ChoiceField(choices=list(EXPORT_DATASETS), default='matches')
+    output = serializers.ChoiceField(choices=list(EXPORT_FORMATS), default='ndjson')
+
+
+class MatchRecommendationQuerySerializer(serializers.Serializer):
+    """
+    매치 추천 옵션 시리얼라이저 (lat, lng를 모두 주면 반경 안의 매치만 거리 순 가점)
+    """
+    lat = serializers.FloatField(min_value=-90, max_value=90, required=False)
+    lng = serializers.FloatField(min_value=-180, max_value=180, required=False)
+    radius_km = serializers.FloatField(min_value=0, max_value=MAX_RADIUS_KM, default=RECOMMEND_RADIUS_KM)
+    gender = serializers.ChoiceField(choices=['MALE', 'FEMALE'], required=False)
+    days = serializers.IntegerField(min_value=1, max_value=RECOMMEND_DAYS, default=RECOMMEND_DAYS)
+    limit = serializers.IntegerField(min_value=1, max_value=50, default=20)
+    
+    def validate(self, data):
+        if ('lat' in data) != ('lng' in data):
+            raise serializers.ValidationError("lat과 lng는 함께 지정해야 합니다.")
+        return data
+
+
+MAX_MATCHMAKING_VENUES = 10
+
+class MatchmakingTicketSerializer(serializers.ModelSerializer):
+    """
+    팀 매치메이킹 대기 등록/조회 시리얼라이저 (지역을 비우면 팀 활동 지역 사용)
+    """
+    region = serializers.ChoiceField(choices=Team.REGION_CHOICES, required=False)
+    rating_band = serializers.SerializerMethodField()
+    
+    class Meta:
+        model = MatchmakingTicket
+        fields = ('id', 'team', 'region', 'date', 'earliest_start', 'latest_end', 'venues',
+                  'status', 'match', 'matched_at', 'rating_band', 'created_at')
+        read_only_fields = ('status', 'match', 'matched_at', 'created_at')
+    
+    def get_rating_band(self, obj):
+        # 대기 중일 때 현재 허용 레이팅 차이
+        if obj.status != 'WAITING':
+            return None
+        return rating_band(obj.created_at, timezone.now())
+    
+    def validate_date(self, value):
+        if value < timezone.localdate():
+            raise serializers.ValidationError("지난 날짜로는 등록할 수 없습니다.")
+        return value
+    
+    def validate_venues(self, value):
+        if not value:
+            raise serializers.ValidationError("희망 구장을 하나 이상 지정해야 합니다.")
+        if len(value) > MAX_MATCHMAKING_VENUES:
+            raise serializers.ValidationError(f"희망 구장은 최대 {MAX_MATCHMAKING_VENUES}곳까지 지정할 수 있습니다.")
+        return value
+    
+    def validate(self, data):
+        window = (datetime.combine(data['date'], data['latest_end']) -
+                  datetime.combine(data['date'], data['earliest_start']))
+        if window < MATCHMAKING_DURATION:
+            raise serializers.ValidationError(
+                f"희망 시간대는 경기 시간({MATCHMAKING_DURATION.seconds // 3600}시간) 이상이어야 합니다."
+            )
+        if MatchmakingTicket.objects.filter(team=data['team'], status='WAITING').exists():
+            raise serializers.ValidationError("이미 매치메이킹 대기 중인 팀입니다.")
+        data.setdefault('region', data['team'].region)
+        return data
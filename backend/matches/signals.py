@@ -0,0 +1,124 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+from venues.availability import invalidate_availability
+from venues.stats import schedule_today_stats_refresh
+from .cache import bump_feed_version
+from .models import Match, MatchParticipant
+from .search import get_search_backend
+
+
+# 검색 문서에 들어가는 필드
+SEARCH_FIELDS = ('title', 'description', 'venue_id')
+
+
+@receiver(pre_save, sender=Match)
+def remember_match_search_fields(sender, instance, raw=False, using=None, update_fields=None, **kwargs):
+    """
+    검색 문서가 바뀐 경우에만 다시 색인할 수 있도록 저장 전 제목/설명/구장을 기록
+    (상태만 저장하는 경우처럼 관련 없는 update_fields면 조회하지 않음)
+    """
+    instance._previous_search = None
+    instance._search_changed = True
+    if raw or not instance.pk:
+        return
+    if update_fields is not None and not {'title', 'description', 'venue', 'venue_id'} & set(update_fields):
+        instance._search_changed = False
+        return
+    instance._previous_search = Match.objects.using(using).filter(
+        pk=instance.pk
+    ).values_list(*SEARCH_FIELDS).first()
+    if instance._previous_search is not None:
+        instance._search_changed = instance._previous_search != tuple(
+            getattr(instance, field) for field in SEARCH_FIELDS
+        )
+
+
+@receiver(post_save, sender=Match)
+def index_match_on_save(sender, instance, raw=False, using=None, **kwargs):
+    """
+    매치 생성 또는 제목/설명/구장 변경 시 검색 테이블 갱신
+    """
+    if raw or not getattr(instance, '_search_changed', True):
+        return
+    get_search_backend(using).index_rows([
+        (instance.pk, instance.title, instance.description, instance.venue.name)
+    ])
+
+
+@receiver(post_delete, sender=Match)
+def remove_match_on_delete(sender, instance, using=None, **kwargs):
+    """
+    매치 삭제 시 검색 테이블에서 제거
+    """
+    get_search_backend(using).remove([instance.pk])
+
+
+@receiver(post_save, sender=Match)
+@receiver(post_delete, sender=Match)
+@receiver(post_save, sender=MatchParticipant)
+@receiver(post_delete, sender=MatchParticipant)
+def invalidate_match_feed(sender, using=None, **kwargs):
+    """
+    매치/참가자가 바뀌면 커밋 후 매치 목록 캐시 버전을 올림
+    """
+    transaction.on_commit(bump_feed_version, using=using)
+
+
+@receiver(pre_save, sender=Match)
+def remember_match_slot(sender, instance, raw=False, using=None, update_fields=None, **kwargs):
+    """
+    구장/날짜가 바뀌는 경우 이전 날짜 캐시도 지울 수 있도록 저장 전 값을 기록
+    (update_fields에 구장/날짜가 없으면 조회하지 않음)
+    """
+    instance._previous_slot = None
+    if update_fields is not None and not {'venue', 'venue_id', 'date'} & set(update_fields):
+        return
+    if instance.pk and not raw:
+        instance._previous_slot = Match.objects.using(using).filter(
+            pk=instance.pk
+        ).values_list('venue_id', 'date').first()
+
+
+@receiver(post_save, sender=Match)
+@receiver(post_delete, sender=Match)
+def invalidate_match_availability(sender, instance, using=None, **kwargs):
+    """
+    매치가 바뀌면 해당 구장/날짜의 예약 현황 캐시 삭제
+    """
+    slots = {(instance.venue_id, instance.date)}
+    if getattr(instance, '_previous_slot', None):
+        slots.add(instance._previous_slot)
+
+    def invalidate():
+        for venue_id, match_date in slots:
+            invalidate_availability(venue_id, [match_date])
+    transaction.on_commit(invalidate, using=using)
+
+
+@receiver(post_save, sender=Match)
+@receiver(post_delete, sender=Match)
+def refresh_match_venue_stats(sender, instance, using=None, **kwargs):
+    """
+    오늘 매치가 바뀌면 커밋 후 해당 구장의 오늘 일간 통계 갱신을 예약
+    """
+    slots = {(instance.venue_id, instance.date)}
+    if getattr(instance, '_previous_slot', None):
+        slots.add(instance._previous_slot)
+
+    def refresh():
+        for venue_id, match_date in slots:
+            schedule_today_stats_refresh(venue_id, [match_date])
+    transaction.on_commit(refresh, using=using)
+
+
+@receiver(post_save, sender=MatchParticipant)
+@receiver(post_delete, sender=MatchParticipant)
+def refresh_participant_venue_stats(sender, instance, using=None, **kwargs):
+    """
+    오늘 매치의 참가/출석 상태가 바뀌면 커밋 후 해당 구장의 오늘 일간 통계 갱신을 예약
+    (참가 신청 요청 안에서 집계하지 않음)
+    """
+    match = instance.match
+    venue_id, match_date = match.venue_id, match.date
+    transaction.on_commit(lambda: schedule_today_stats_refresh(venue_id, [match_date]), using=using)
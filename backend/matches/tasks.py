@@ -0,0 +1,190 @@
+import logging
+from datetime import timedelta
+from celery import shared_task
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+from teams.models import Team
+from .cache import bump_feed_version
+from .leaderboard import update_team_rankings, update_user_rankings
+from .matchmaking import run_matchmaking
+from .models import Match, MatchParticipant, MatchResult, RatingHistory
+from .rating import elo_delta, match_outcome
+from .recommendation import RECOMMEND_DAYS, build_candidates
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def transition_match_statuses():
+    """
+    종료 일시가 지난 모집중/모집완료 매치를 경기완료로 일괄 전환
+
+    ends_at 인덱스를 타는 UPDATE 문으로만 처리하며, 남아 있는 대기자는 취소합니다.
+    실행마다 변경된 행 수를 반환하고 로그로 남깁니다.
+    """
+    now = timezone.now()
+    expired = Match.objects.filter(status__in=['OPEN', 'CLOSED'], ends_at__lte=now)
+
+    with transaction.atomic():
+        waitlist_canceled = MatchParticipant.objects.filter(
+            match__in=expired, status='WAITLISTED'
+        ).update(status='CANCELED', waitlist_position=None, updated_at=now)
+        completed = expired.update(status='COMPLETED', updated_at=now)
+        if completed:
+            # update()는 시그널을 보내지 않으므로 목록 캐시를 직접 무효화
+            transaction.on_commit(bump_feed_version)
+
+    counts = {'completed': completed, 'waitlist_canceled': waitlist_canceled}
+    logger.info('매치 상태 전환: %s', counts)
+    return counts
+
+
+@shared_task
+def build_recommendation_candidates(days=RECOMMEND_DAYS):
+    """
+    오늘부터 days일 동안의 추천 후보 집합을 다시 만들어 캐시에 저장
+    """
+    today = timezone.localdate()
+    regions = {
+        str(day): len(build_candidates(day))
+        for day in (today + timedelta(days=offset) for offset in range(days))
+    }
+    logger.info('추천 후보 갱신: %s', regions)
+    return regions
+
+
+@shared_task
+def run_matchmaking_queue():
+    """
+    팀 매치메이킹 대기열을 매칭 (대기 시간이 길수록 허용 레이팅 차이가 넓어짐)
+    """
+    return run_matchmaking()
+
+
+# 실제로 경기를 뛴 참가 상태 (불참/취소/대기는 전적에 포함하지 않음)
+PLAYED_STATUSES = ('REGISTERED', 'ATTENDED')
+
+OUTCOME_FIELDS = {1.0: 'wins', 0.5: 'draws', 0.0: 'losses'}
+
+
+def record_counters(score, now):
+    """
+    경기 수/승무패 증가와 수정일 갱신용 update() 인자
+    """
+    field = OUTCOME_FIELDS[score]
+    return {'matches_played': F('matches_played') + 1, field: F(field) + 1, 'updated_at': now}
+
+
+def side_average(ratings, fallback):
+    return sum(ratings) / len(ratings) if ratings else fallback
+
+
+@shared_task
+def apply_match_result(result_id):
+    """
+    매치 결과를 팀/참가자 레이팅과 전적에 반영
+
+    반영 시각(ratings_applied_at)을 조건부 UPDATE로 먼저 선점하므로 같은 결과로
+    여러 번 실행되어도 한 번만 반영됩니다. 선점과 모든 증감은 한 트랜잭션에서
+    F 표현식으로 처리해 다른 결과 반영과 동시에 실행되어도 값을 잃지 않습니다.
+
+    참가자는 소속 팀(홈/원정)으로 편을 나누고, 상대편 평균 레이팅(없으면 상대 팀
+    레이팅)을 기준으로 같은 편 전원에게 같은 변동량을 적용합니다.
+    편을 알 수 없는 참가자는 경기 수만 늘립니다.
+    레이팅이 바뀐 팀/선수마다 반영 후 레이팅을 RatingHistory에 한 번에 추가하고,
+    커밋 후 리더보드에도 반영합니다.
+    """
+    User = get_user_model()
+    now = timezone.now()
+
+    with transaction.atomic():
+        claimed = MatchResult.objects.filter(
+            pk=result_id, ratings_applied_at__isnull=True
+        ).update(ratings_applied_at=now, updated_at=now)
+        if not claimed:
+            logger.info('이미 반영된 매치 결과: %s', result_id)
+            return {'applied': False}
+
+        result = MatchResult.objects.select_related('match__home_team', 'match__away_team').get(pk=result_id)
+        match = result.match
+        home_team, away_team = match.home_team, match.away_team
+        home_score = match_outcome(result.home_score, result.away_score)
+
+        sides = {}
+        if home_team:
+            sides[home_team.pk] = {'score': home_score, 'team': home_team, 'users': [], 'ratings': [],
+                                   'goals_scored': result.home_score, 'goals_conceded': result.away_score}
+        if away_team:
+            sides[away_team.pk] = {'score': 1 - home_score, 'team': away_team, 'users': [], 'ratings': [],
+                                   'goals_scored': result.away_score, 'goals_conceded': result.home_score}
+        unsided = []
+        participants = MatchParticipant.objects.filter(
+            match=match, status__in=PLAYED_STATUSES
+        ).values_list('user_id', 'team_id', 'user__rating')
+        for user_id, team_id, rating in participants:
+            if team_id in sides:
+                sides[team_id]['users'].append(user_id)
+                sides[team_id]['ratings'].append(rating)
+            else:
+                unsided.append(user_id)
+
+        team_deltas, user_deltas = {}, {}
+        if len(sides) == 2:
+            home, away = sides[home_team.pk], sides[away_team.pk]
+            home['opponent'], away['opponent'] = away, home
+            for side in (home, away):
+                team = side['team']
+                team_deltas[team.pk] = elo_delta(team.rating, side['opponent']['team'].rating, side['score'])
+                Team.objects.filter(pk=team.pk).update(
+                    rating=F('rating') + team_deltas[team.pk],
+                    goals_scored=F('goals_scored') + side['goals_scored'],
+                    goals_conceded=F('goals_conceded') + side['goals_conceded'],
+                    **record_counters(side['score'], now),
+                )
+            for side in (home, away):
+                if not side['users']:
+                    continue
+                opponent = side['opponent']
+                delta = elo_delta(
+                    side_average(side['ratings'], side['team'].rating),
+                    side_average(opponent['ratings'], opponent['team'].rating),
+                    side['score'],
+                )
+                user_deltas.update(dict.fromkeys(side['users'], delta))
+                User.objects.filter(pk__in=side['users']).update(
+                    rating=F('rating') + delta, **record_counters(side['score'], now)
+                )
+        else:
+            # 상대 팀이 없는 매치는 승패를 가릴 수 없으므로 경기 수만 반영
+            unsided += [user_id for side in sides.values() for user_id in side['users']]
+
+        if unsided:
+            User.objects.filter(pk__in=unsided).update(matches_played=F('matches_played') + 1, updated_at=now)
+
+        # F 표현식으로 바뀐 최종 레이팅을 다시 읽어 이력과 리더보드에 반영
+        team_rows = list(Team.objects.filter(pk__in=team_deltas).values_list('pk', 'region', 'level', 'rating'))
+        user_rows = list(User.objects.filter(pk__in=user_deltas).values_list('pk', 'skill_level', 'rating'))
+        RatingHistory.objects.bulk_create([
+            RatingHistory(team_id=pk, result=result, rating=rating, delta=team_deltas[pk], recorded_at=match.ends_at)
+            for pk, _, _, rating in team_rows
+        ] + [
+            RatingHistory(user_id=pk, result=result, rating=rating, delta=user_deltas[pk], recorded_at=match.ends_at)
+            for pk, _, rating in user_rows
+        ])
+
+        def update_leaderboards():
+            update_team_rankings(team_rows)
+            update_user_rankings(user_rows)
+        transaction.on_commit(update_leaderboards)
+        # update()는 시그널을 보내지 않으므로 목록 캐시를 직접 무효화
+        transaction.on_commit(bump_feed_version)
+
+    counts = {
+        'applied': True,
+        'teams': 2 if len(sides) == 2 else 0,
+        'players': len(participants),
+    }
+    logger.info('매치 결과 반영 (%s): %s', result_id, counts)
+    return counts
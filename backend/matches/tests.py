@@ -1,3 +1,1148 @@
+import base64
+import csv
+import io
+import json
+import random
+import re
+import time as time_module
+from datetime import date, time, timedelta
+from unittest import mock
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.db.models import QuerySet
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from django.utils.http import http_date
+from django.urls import reverse
+from rest_framework.test import APIClient
+from venues.geo import grid_cell, haversine_km
+from teams.models import Team, TeamMember
+from users.models import Friendship
+from venues.models import Venue, VenueImage, VenueReview
+from config.sortedset import get_sorted_set
+from .cache import get_feed_cache_stats
+from .filters import MatchFilter
+from .leaderboard import all_board_keys
+from .matchmaking import run_matchmaking
+from .models import Match, MatchmakingTicket, MatchParticipant, MatchResult, RatingHistory, compute_ends_at
+from .search import get_search_backend, search_matches
+from .tasks import apply_match_result, build_recommendation_candidates, transition_match_statuses
 
-# Create your tests here.
+User = get_user_model()
+
+
+class MatchFilterQueryPlanTests(TestCase):
+    """
+    MatchFilter 대표 조합의 실행 계획에 매치 테이블 순차 스캔이 없는지 검사
+    """
+    SEED_MATCHES = 20000
+    SEED_DAYS = 730
+    BASE_DATE = date(2025, 1, 1)
+    TODAY = BASE_DATE + timedelta(days=365)
+
+    # 프론트엔드와 매치 피드에서 실제로 쓰는 필터 조합
+    CANONICAL_FILTERS = [
+        {'status': 'OPEN', 'date_from': TODAY},
+        {'date': TODAY},
+        {'date': TODAY, 'skill_level': 'BEG', 'gender': 'MIXED'},
+        {'status': 'OPEN', 'date_from': TODAY, 'skill_level': 'INT'},
+        {'status': 'OPEN', 'date_from': TODAY, 'gender': 'FEMALE'},
+        {'status': 'OPEN', 'venue': 1},
+        {'match_type': 'TEAM', 'date_from': TODAY},
+        {'skill_level': 'ADV', 'date_from': TODAY, 'date_to': TODAY + timedelta(days=7)},
+        {'gender': 'MALE', 'date_from': TODAY, 'date_to': TODAY + timedelta(days=7)},
+        {'date_from': TODAY, 'date_to': TODAY + timedelta(days=7), 'price_min': 5000, 'price_max': 10000},
+        {'status': 'CLOSED', 'date_from': TODAY},
+        {'upcoming': True},
+        {'status': 'OPEN', 'upcoming': True},
+        {'lat': 37.5, 'lng': 127.0, 'radius_km': 5},
+        {'status': 'OPEN', 'date_from': TODAY, 'lat': 37.5, 'lng': 127.0, 'radius_km': 10},
+    ]
+
+    @classmethod
+    def setUpTestData(cls):
+        rng = random.Random(0)
+        host = User.objects.create_user(username='planner', password='password')
+        venues = []
+        for i in range(500):
+            # 전국 범위에 흩어진 구장
+            venue = Venue(name=f'구장 {i}', address='서울', surface_type='ARTIFICIAL', size='6',
+                          latitude=rng.uniform(34.5, 38.5), longitude=rng.uniform(126.0, 129.5),
+                          opening_time=time(6), closing_time=time(23))
+            venue.grid_cell = grid_cell(venue.latitude, venue.longitude)
+            venues.append(venue)
+        venues = Venue.objects.bulk_create(venues)
+        matches = []
+        # PostgreSQL 배제 제약(match_no_overlap)에 걸리지 않도록 (구장, 날짜, 시간)을 겹치지 않게 배정
+        slots = set()
+        while len(matches) < cls.SEED_MATCHES:
+            venue = rng.choice(venues)
+            match_date = cls.BASE_DATE + timedelta(days=rng.randrange(cls.SEED_DAYS))
+            hour = rng.randrange(6, 22)
+            if (venue.pk, match_date, hour) in slots:
+                continue
+            slots.add((venue.pk, match_date, hour))
+            if match_date < cls.TODAY:
+                status = rng.choice(['COMPLETED'] * 9 + ['CANCELED'])
+            else:
+                status = rng.choice(['OPEN'] * 7 + ['CLOSED'] * 2 + ['CANCELED'])
+            start_time, end_time = time(hour), time(hour + 1)
+            matches.append(Match(
+                title='매치', match_type=rng.choice(['SOCIAL'] * 4 + ['TEAM', 'TOURNAMENT']),
+                venue=venue, date=match_date, start_time=start_time,
+                end_time=end_time, ends_at=compute_ends_at(match_date, start_time, end_time),
+                status=status, max_players=12,
+                skill_level=rng.choice(['BEG', 'INT', 'ADV', 'ALL']),
+                gender=rng.choice(['MALE', 'FEMALE', 'MIXED']),
+                price=rng.choice([5000, 8000, 10000, 12000, 15000, 20000]), host=host,
+            ))
+        Match.objects.bulk_create(matches, batch_size=2000)
+        cls.venue_id = venues[0].id
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+
+    def get_plan(self, params):
+        params = {key: (self.venue_id if key == 'venue' else value) for key, value in params.items()}
+        queryset = MatchFilter(params, queryset=Match.objects.all()).qs
+        return queryset.order_by('date', 'start_time')[:10].explain()
+
+    def is_sequential_scan(self, plan):
+        table = Match._meta.db_table
+        if connection.vendor == 'postgresql':
+            return re.search(rf'Seq Scan on {table}\b', plan) is not None
+        # SQLite: SCAN ... USING INDEX도 인덱스 전체를 훑으므로 매치 테이블은 SEARCH(범위 탐색)만 허용
+        return re.search(rf'\bSCAN {table}\b', plan) is not None or not re.search(rf'\bSEARCH {table}\b', plan)
+
+    def test_upcoming_seeks_date_range(self):
+        # ends_at 조건만으로는 인덱스 시작 위치를 정할 수 없어 날짜 하한으로 범위 탐색해야 함
+        for params in ({'upcoming': True}, {'status': 'OPEN', 'upcoming': True}):
+            with self.subTest(params=params):
+                plan = self.get_plan(params)
+                if connection.vendor == 'sqlite':
+                    self.assertRegex(plan, rf'SEARCH {Match._meta.db_table} USING .*\(.*date>\?')
+                self.assertFalse(self.is_sequential_scan(plan), plan)
+
+    def test_canonical_filters_use_indexes(self):
+        for params in self.CANONICAL_FILTERS:
+            with self.subTest(params=params):
+                plan = self.get_plan(params)
+                self.assertFalse(self.is_sequential_scan(plan), f'{params} 조건에서 순차 스캔 발생:\n{plan}')
+
+
+class MatchSearchTests(TestCase):
+    """
+    검색 테이블 동기화(생성/수정/삭제, 구장 이름 변경, 재색인 명령)와 검색어 일치 규칙 검사
+    """
+    def setUp(self):
+        host = User.objects.create_user(username='host', password=None)
+        self.venue = Venue.objects.create(name='상암 월드컵 구장', address='서울', surface_type='GRASS', size='11',
+                                          opening_time=time(6), closing_time=time(23))
+        self.match = Match.objects.create(title='Sunday football 풋살 모임', description='초보 환영',
+                                          match_type='SOCIAL', venue=self.venue, date=date(2030, 1, 1),
+                                          start_time=time(19), end_time=time(21), max_players=10,
+                                          price=10000, host=host)
+
+    def search(self, query):
+        return list(search_matches(Match.objects.all(), query).values_list('pk', flat=True))
+
+    def test_matches_bigrams_and_word_prefixes(self):
+        for query in ('풋살', '모임', '월드컵', '초보', 'foot', 'SUN'):
+            self.assertEqual(self.search(query), [self.match.pk], query)
+        # 영문은 단어 접두사로만 일치 (icontains와 달리 단어 중간은 찾지 않음)
+        self.assertEqual(self.search('ball'), [])
+
+    def test_index_follows_match_changes(self):
+        self.match.title = '평일 야간 매치'
+        self.match.save()
+        self.assertEqual(self.search('야간'), [self.match.pk])
+        self.assertEqual(self.search('풋살'), [])
+
+        self.match.delete()
+        self.assertEqual(self.search('야간'), [])
+
+    def test_status_only_saves_skip_reindex(self):
+        match = Match.objects.get(pk=self.match.pk)
+        with mock.patch('matches.search.SqliteMatchSearchBackend.index_rows') as index_rows:
+            match.status = 'CLOSED'
+            with self.assertNumQueries(1):  # UPDATE만 (이전 값 조회/구장 조회 없음)
+                match.save(update_fields=['status', 'updated_at'])
+            match.status = 'OPEN'
+            match.save()
+        index_rows.assert_not_called()
+
+        match.description = '중급 이상'
+        match.save()
+        self.assertEqual(self.search('중급'), [self.match.pk])
+
+    def test_venue_rename_reindexes_only_when_name_changes(self):
+        with mock.patch('venues.signals.index_matches') as index_matches:
+            self.venue.hourly_rate = 50000
+            self.venue.save()
+            Venue.objects.get(pk=self.venue.pk).save(update_fields=['rating_sum', 'review_count'])
+        index_matches.assert_not_called()
+
+        self.venue.name = '난지 한강 구장'
+        self.venue.save()
+        self.assertEqual(self.search('한강'), [self.match.pk])
+        self.assertEqual(self.search('월드컵'), [])
+
+    def test_rebuild_command_backfills_index(self):
+        get_search_backend().remove([self.match.pk])
+        self.assertEqual(self.search('풋살'), [])
+        call_command('rebuild_match_search', stdout=io.StringIO())
+        self.assertEqual(self.search('풋살'), [self.match.pk])
+
+
+class MatchRadiusFilterTests(TestCase):
+    """
+    반경 필터의 포함/제외와 거리 값, 거리 정렬 검사
+    """
+    CENTER = (37.5, 127.0)
+
+    def setUp(self):
+        host = User.objects.create_user(username='host', password=None)
+        # 중심, 북쪽 약 3km, 동쪽 약 4.4km, 북쪽 약 8km, 좌표 없음
+        coordinates = {'center': (37.5, 127.0), 'north': (37.527, 127.0), 'east': (37.5, 127.05),
+                       'far': (37.572, 127.0), 'unknown': (None, None)}
+        self.matches = {}
+        for name, (latitude, longitude) in coordinates.items():
+            venue = Venue.objects.create(name=name, address='서울', surface_type='GRASS', size='11',
+                                         opening_time=time(6), closing_time=time(23),
+                                         latitude=latitude, longitude=longitude)
+            self.matches[name] = Match.objects.create(title=name, match_type='SOCIAL', venue=venue,
+                                                      date=date(2030, 1, 1), start_time=time(19),
+                                                      end_time=time(21), max_players=10, price=10000, host=host)
+        self.client = APIClient()
+        self.client.force_authenticate(host)
+
+    def filtered(self, **params):
+        lat, lng = self.CENTER
+        queryset = MatchFilter({'lat': lat, 'lng': lng, **params}, queryset=Match.objects.all()).qs
+        return {match.title: match.distance for match in queryset}
+
+    def test_radius_includes_and_excludes_venues(self):
+        # 반경을 생략하면 기본 5km
+        self.assertEqual(set(self.filtered()), {'center', 'north', 'east'})
+        self.assertEqual(set(self.filtered(radius_km=4)), {'center', 'north'})
+        self.assertEqual(set(self.filtered(radius_km=10)), {'center', 'north', 'east', 'far'})
+        # 0km는 기본값으로 바뀌지 않고 같은 좌표의 구장만 남김
+        self.assertEqual(set(self.filtered(radius_km=0)), {'center'})
+
+    def test_distance_values_and_ordering(self):
+        distances = self.filtered(radius_km=10)
+        for name, distance in distances.items():
+            venue = self.matches[name].venue
+            self.assertAlmostEqual(distance, haversine_km(*self.CENTER, venue.latitude, venue.longitude), places=6)
+
+        params = {'lat': self.CENTER[0], 'lng': self.CENTER[1], 'radius_km': 10}
+        response = self.client.get(reverse('matches:match-list'), {**params, 'ordering': 'distance'})
+        self.assertEqual([match['title'] for match in response.data['results']], ['center', 'north', 'east', 'far'])
+        response = self.client.get(reverse('matches:match-list'), {**params, 'ordering': '-distance'})
+        self.assertEqual([match['title'] for match in response.data['results']], ['far', 'east', 'north', 'center'])
+
+
+class MatchFeedCacheTests(TestCase):
+    """
+    매치 목록 응답 캐시의 적중/무효화 동작 검사
+    """
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='viewer', password='password')
+        self.venue = Venue.objects.create(name='성수 풋살장', address='서울', surface_type='ARTIFICIAL', size='6',
+                                          opening_time=time(6), closing_time=time(23))
+        self.match = Match.objects.create(title='저녁 매치', match_type='SOCIAL', venue=self.venue,
+                                          date=date(2030, 1, 1), start_time=time(19), end_time=time(21),
+                                          max_players=12, price=10000, host=self.user)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def get_feed(self, params):
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.get(reverse('matches:match-list'), params)
+
+    def test_same_normalized_params_hit_cache(self):
+        first = self.get_feed({'status': 'OPEN', 'gender': 'MIXED'})
+        second = self.get_feed({'gender': 'MIXED', 'status': 'OPEN', 'page': '1', 'skill_level': ''})
+        self.assertEqual(first['X-Cache'], 'MISS')
+        self.assertEqual(second['X-Cache'], 'HIT')
+        self.assertEqual(first.data, second.data)
+        stats = get_feed_cache_stats()
+        self.assertEqual((stats['hits'], stats['misses']), (1, 1))
+
+    def test_writes_invalidate_cache(self):
+        self.get_feed({'status': 'OPEN'})
+        with self.captureOnCommitCallbacks(execute=True):
+            self.match.title = '주말 매치'
+            self.match.save()
+        response = self.get_feed({'status': 'OPEN'})
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.data['results'][0]['title'], '주말 매치')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse('matches:match-join', args=[self.match.pk]))
+        response = self.get_feed({'status': 'OPEN'})
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.data['results'][0]['current_players_count'], 1)
+
+
+class MatchCursorPaginationTests(TestCase):
+    """
+    키셋 커서 페이지네이션의 앞/뒤 이동과 잘못된 커서 처리 검사
+    """
+    def setUp(self):
+        cache.clear()
+        host = User.objects.create_user(username='host', password=None)
+        # 기준 좌표(37.5, 127.0)에서 가까운 순
+        self.venues = [
+            Venue.objects.create(name=f'구장 {index}', address='서울', surface_type='GRASS', size='11',
+                                 opening_time=time(6), closing_time=time(23),
+                                 latitude=37.5 + index * 0.01, longitude=127.0)
+            for index in range(3)
+        ]
+        self.matches = [
+            Match.objects.create(title='야간 매치' if index % 3 == 0 else '주간 매치', match_type='SOCIAL',
+                                 venue=self.venues[index % 3], date=date(2030, 1, 1 + index % 4),
+                                 start_time=time(18 + index % 2), end_time=time(20 + index % 2),
+                                 max_players=10, price=5000 * (1 + index % 3), host=host)
+            for index in range(27)
+        ]
+        self.client = APIClient()
+        self.client.force_authenticate(host)
+
+    def walk(self, params):
+        """
+        next 링크를 따라 끝까지 간 뒤 previous 링크로 처음까지 되돌아와 (정방향, 역방향) id 목록 반환
+        """
+        response = self.client.get(reverse('matches:match-list'), {**params, 'pagination': 'cursor'})
+        pages = [response.data]
+        while pages[-1]['next']:
+            pages.append(self.client.get(pages[-1]['next']).data)
+        forward = [match['id'] for page in pages for match in page['results']]
+
+        backward = []
+        page = pages[-1]
+        while page['previous']:
+            page = self.client.get(page['previous']).data
+            backward = [match['id'] for match in page['results']] + backward
+        backward += [match['id'] for match in pages[-1]['results']]
+        return forward, backward
+
+    def assert_walk(self, params, expected):
+        forward, backward = self.walk(params)
+        self.assertEqual(forward, expected)
+        self.assertEqual(backward, expected)
+
+    def test_default_and_price_orderings(self):
+        self.assert_walk({}, [match.pk for match in sorted(
+            self.matches, key=lambda match: (match.date, match.start_time, match.pk))])
+        self.assert_walk({'ordering': '-price'}, [match.pk for match in sorted(
+            self.matches, key=lambda match: (-match.price, -match.pk))])
+
+    def test_distance_ordering(self):
+        params = {'ordering': 'distance', 'lat': 37.5, 'lng': 127.0, 'radius_km': 10}
+        self.assert_walk(params, [match.pk for match in sorted(
+            self.matches, key=lambda match: (self.venues.index(match.venue), match.pk))])
+
+    def test_search_ordering_has_no_duplicates_or_gaps(self):
+        forward, backward = self.walk({'search': '야간'})
+        self.assertEqual(forward, backward)
+        self.assertCountEqual(forward, [match.pk for match in self.matches if match.title == '야간 매치'])
+
+    def test_cursor_is_rejected_after_ordering_changes(self):
+        response = self.client.get(reverse('matches:match-list'), {'pagination': 'cursor', 'ordering': 'price'})
+        cursor = response.data['next'].split('cursor=')[1]
+        response = self.client.get(reverse('matches:match-list'), {'cursor': cursor, 'ordering': '-price'})
+        self.assertEqual(response.status_code, 404)
+
+    def test_malformed_cursors_return_404(self):
+        ordering = ['date', 'start_time', 'id']
+        payloads = [
+            'not-base64!', json.dumps([1, 2]), json.dumps({'o': ordering, 'r': 0}),
+            json.dumps({'o': ordering, 'r': 0, 'p': 5}),
+            json.dumps({'o': ordering, 'r': 0, 'p': [{}, 1, 2]}),
+            json.dumps({'o': ordering, 'r': 0, 'p': [None, None, None]}),
+            json.dumps({'o': ordering, 'r': 0, 'p': ['어제', '19:00', '1']}),
+            json.dumps({'o': ordering, 'r': 0, 'p': ['2030-01-01', '19:00']}),
+        ]
+        for payload in payloads:
+            cursor = base64.urlsafe_b64encode(payload.encode()).decode() if payload.startswith(('[', '{')) else payload
+            response = self.client.get(reverse('matches:match-list'), {'cursor': cursor})
+            self.assertEqual(response.status_code, 404, payload)
+
+
+class MatchDetailQueryCountTests(TestCase):
+    """
+    매치 상세 조회 쿼리 수가 참가자/리뷰 수와 무관하게 일정한지 검사
+    """
+    # 조건부 GET 검증 값 + 매치(구장/호스트/결과/MVP) + 참가자 + 구장 이미지 + 구장 리뷰 + 홈팀 + 원정팀
+    EXPECTED_QUERIES = 7
+
+    def setUp(self):
+        self.host = User.objects.create_user(username='host', password='password')
+        self.venue = Venue.objects.create(name='잠실 구장', address='서울', surface_type='GRASS', size='11',
+                                          opening_time=time(6), closing_time=time(23))
+        home = Team.objects.create(name='홈팀', owner=self.host)
+        away = Team.objects.create(name='원정팀', owner=self.host)
+        TeamMember.objects.create(team=home, user=self.host)
+        self.match = Match.objects.create(title='팀 매치', match_type='TEAM', venue=self.venue,
+                                          date=date(2020, 1, 1), start_time=time(19), end_time=time(21),
+                                          max_players=40, price=10000, host=self.host,
+                                          team_match=True, home_team=home, away_team=away)
+        MatchResult.objects.create(match=self.match, home_score=2, away_score=1, mvp=self.host)
+        self.client = APIClient()
+        self.client.force_authenticate(self.host)
+        self.add_players(1)
+
+    def add_players(self, count):
+        for _ in range(count):
+            user = User.objects.create_user(username=f'player{User.objects.count()}', password=None)
+            MatchParticipant.objects.create(match=self.match, user=user)
+            VenueReview.objects.create(venue=self.venue, user=user, rating=4, comment='좋아요')
+            VenueImage.objects.create(venue=self.venue, image='venue_images/test.jpg')
+            TeamMember.objects.create(team=self.match.away_team, user=user)
+
+    def get_detail(self):
+        with self.assertNumQueries(self.EXPECTED_QUERIES):
+            response = self.client.get(reverse('matches:match-detail', args=[self.match.pk]))
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    def test_query_count_is_bounded(self):
+        self.get_detail()
+        self.add_players(20)
+        response = self.get_detail()
+        self.assertEqual(len(response.data['participants']), 21)
+        self.assertEqual(len(response.data['venue']['reviews']), 21)
+        self.assertEqual(response.data['away_team']['members_count'], 21)
+        self.assertEqual(response.data['result']['mvp']['username'], 'host')
+        self.assertFalse(response.data['is_joined'])
+
+
+class MatchDetailConditionalGetTests(TestCase):
+    """
+    매치 상세 조회의 ETag 조건부 GET 검사
+    """
+    def setUp(self):
+        self.host = User.objects.create_user(username='host', password=None)
+        self.venue = Venue.objects.create(name='목동 구장', address='서울', surface_type='FUTSAL', size='5',
+                                          opening_time=time(6), closing_time=time(23))
+        self.match = Match.objects.create(title='평일 매치', match_type='SOCIAL', venue=self.venue,
+                                          date=date(2030, 1, 1), start_time=time(19), end_time=time(21),
+                                          max_players=10, price=10000, host=self.host)
+        self.url = reverse('matches:match-detail', args=[self.match.pk])
+        self.client = APIClient()
+        self.client.force_authenticate(self.host)
+
+    def test_matching_etag_returns_304_with_one_query(self):
+        etag = self.client.get(self.url)['ETag']
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+
+    def test_related_changes_change_etag(self):
+        etag = self.client.get(self.url)['ETag']
+        player = User.objects.create_user(username='player', password=None)
+        participant = MatchParticipant.objects.create(match=self.match, user=player)
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+        etag = response['ETag']
+        participant.delete()
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_etag_differs_per_user(self):
+        etag = self.client.get(self.url)['ETag']
+        other = User.objects.create_user(username='other', password=None)
+        self.client.force_authenticate(other)
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_if_modified_since_alone_never_returns_stale_304(self):
+        player = User.objects.create_user(username='player', password=None)
+        participant = MatchParticipant.objects.create(match=self.match, user=player)
+        response = self.client.get(self.url)
+        self.assertNotIn('Last-Modified', response)
+
+        # 삭제는 남은 행의 수정 시각을 올리지 않으므로 시각 기준 검사로는 감지할 수 없음
+        participant.delete()
+        since = http_date(time_module.time() + 60)
+        self.assertEqual(self.client.get(self.url, HTTP_IF_MODIFIED_SINCE=since).status_code, 200)
+
+
+class MatchRegisteredCountTests(TestCase):
+    """
+    참가 신청/취소, 복구 명령, 관리자 수정 시 registered_count 카운터 검사
+    """
+    def setUp(self):
+        self.host = User.objects.create_user(username='host', password=None)
+        venue = Venue.objects.create(name='상암 구장', address='서울', surface_type='GRASS', size='11',
+                                     opening_time=time(6), closing_time=time(23))
+        self.match = Match.objects.create(title='카운터', match_type='SOCIAL', venue=venue,
+                                          date=date(2030, 1, 1), start_time=time(19), end_time=time(21),
+                                          max_players=3, price=10000, host=self.host)
+        self.other = Match.objects.create(title='다른 매치', match_type='SOCIAL', venue=venue,
+                                          date=date(2030, 1, 2), start_time=time(19), end_time=time(21),
+                                          max_players=3, price=10000, host=self.host)
+        self.client = APIClient()
+
+    def post_as(self, username, name):
+        user, _ = User.objects.get_or_create(username=username)
+        self.client.force_authenticate(user)
+        return self.client.post(reverse(name, args=[self.match.pk]))
+
+    def registered_count(self, match=None):
+        match = match or self.match
+        match.refresh_from_db(fields=['registered_count'])
+        return match.registered_count
+
+    def test_join_and_leave_update_counter(self):
+        for username in ('p1', 'p2'):
+            self.post_as(username, 'matches:match-join')
+        self.assertEqual(self.registered_count(), 2)
+
+        self.assertEqual(self.post_as('p1', 'matches:match-leave').status_code, 200)
+        self.assertEqual(self.registered_count(), 1)
+        # 다시 취소해도 카운터는 그대로
+        self.assertEqual(self.post_as('p1', 'matches:match-leave').status_code, 400)
+        self.assertEqual(self.registered_count(), 1)
+
+    def test_concurrent_leave_releases_spot_once(self):
+        for username in ('p1', 'p2'):
+            self.post_as(username, 'matches:match-join')
+        stale = MatchParticipant.objects.get(user__username='p1')
+        self.assertEqual(self.post_as('p1', 'matches:match-leave').status_code, 200)
+
+        # 첫 요청이 커밋되기 전에 참가 상태를 읽은 두 번째 요청
+        original_first = QuerySet.first
+        calls = []
+
+        def first(queryset):
+            if not calls and queryset.model is MatchParticipant:
+                calls.append(queryset)
+                return stale
+            return original_first(queryset)
+
+        with mock.patch.object(QuerySet, 'first', first):
+            response = self.post_as('p1', 'matches:match-leave')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(self.registered_count(), 1)
+
+    def test_recount_command_repairs_drift(self):
+        for username in ('p1', 'p2'):
+            self.post_as(username, 'matches:match-join')
+        Match.objects.filter(pk=self.match.pk).update(registered_count=7)
+        Match.objects.filter(pk=self.other.pk).update(registered_count=2)
+
+        out = io.StringIO()
+        call_command('recount_match_players', '--dry-run', stdout=out)
+        self.assertIn('2개', out.getvalue())
+        self.assertEqual(self.registered_count(), 7)
+
+        call_command('recount_match_players', '--match', str(self.match.pk), stdout=io.StringIO())
+        self.assertEqual((self.registered_count(), self.registered_count(self.other)), (2, 2))
+        call_command('recount_match_players', stdout=io.StringIO())
+        self.assertEqual((self.registered_count(), self.registered_count(self.other)), (2, 0))
+
+    def test_recount_fixes_status_in_one_update(self):
+        for username in ('p1', 'p2', 'p3'):
+            MatchParticipant.objects.create(match=self.match, user=User.objects.create_user(username=username))
+        with CaptureQueriesContext(connection) as queries:
+            self.match.recount_registered()
+        # 인원 계산과 갱신이 UPDATE 한 문장 (따로 COUNT를 읽지 않음)
+        self.assertEqual([query['sql'].split()[0] for query in queries], ['UPDATE', 'SELECT'])
+        self.assertEqual((self.match.registered_count, self.match.status), (3, 'CLOSED'))
+
+        MatchParticipant.objects.filter(user__username='p1').update(status='CANCELED')
+        self.match.recount_registered()
+        self.assertEqual((self.match.registered_count, self.match.status), (2, 'OPEN'))
+
+        Match.objects.filter(pk=self.match.pk).update(status='CANCELED')
+        MatchParticipant.objects.filter(user__username='p1').update(status='REGISTERED')
+        self.match.recount_registered()
+        self.assertEqual((self.match.registered_count, self.match.status), (3, 'CANCELED'))
+
+    def test_admin_changes_recount_affected_matches(self):
+        admin_user = User.objects.create_superuser(username='admin', password='pw', email='admin@example.com')
+        self.client.force_login(admin_user)
+        player = User.objects.create_user(username='p1', password=None)
+        add_url = reverse('admin:matches_matchparticipant_add')
+        response = self.client.post(add_url, {'match': self.match.pk, 'user': player.pk, 'status': 'REGISTERED'})
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(self.registered_count(), 1)
+
+        participant = MatchParticipant.objects.get(user=player)
+        change_url = reverse('admin:matches_matchparticipant_change', args=[participant.pk])
+        self.client.post(change_url, {'match': self.other.pk, 'user': player.pk, 'status': 'REGISTERED'})
+        self.assertEqual((self.registered_count(), self.registered_count(self.other)), (0, 1))
+
+        delete_url = reverse('admin:matches_matchparticipant_delete', args=[participant.pk])
+        self.client.post(delete_url, {'post': 'yes'})
+        self.assertEqual(self.registered_count(self.other), 0)
+
+        for username in ('p2', 'p3'):
+            MatchParticipant.objects.create(match=self.match, user=User.objects.create_user(username=username))
+        self.client.post(reverse('admin:matches_matchparticipant_changelist'), {
+            'action': 'delete_selected', 'post': 'yes',
+            '_selected_action': list(MatchParticipant.objects.values_list('pk', flat=True)),
+        })
+        self.assertEqual(self.registered_count(), 0)
+
+
+class MatchJoinCapacityTests(TestCase):
+    """
+    조건부 UPDATE 기반 참가 신청의 정원/상태 전환 검사
+    """
+    def setUp(self):
+        self.host = User.objects.create_user(username='host', password=None)
+        venue = Venue.objects.create(name='상암 구장', address='서울', surface_type='GRASS', size='11',
+                                     opening_time=time(6), closing_time=time(23))
+        self.match = Match.objects.create(title='마감 임박', match_type='SOCIAL', venue=venue,
+                                          date=date(2030, 1, 1), start_time=time(19), end_time=time(21),
+                                          max_players=2, price=10000, host=self.host)
+        self.client = APIClient()
+
+    def post_as(self, username, name):
+        user, _ = User.objects.get_or_create(username=username)
+        self.client.force_authenticate(user)
+        return self.client.post(reverse(name, args=[self.match.pk]))
+
+    def test_last_spot_closes_and_leave_reopens(self):
+        self.assertEqual(self.post_as('p1', 'matches:match-join').status_code, 201)
+        self.assertEqual(self.post_as('p1', 'matches:match-join').status_code, 400)
+        self.assertEqual(self.post_as('p2', 'matches:match-join').status_code, 201)
+        self.match.refresh_from_db()
+        self.assertEqual((self.match.registered_count, self.match.status), (2, 'CLOSED'))
+
+        self.assertEqual(self.post_as('p1', 'matches:match-leave').status_code, 200)
+        self.match.refresh_from_db()
+        self.assertEqual((self.match.registered_count, self.match.status), (1, 'OPEN'))
+        self.assertEqual(self.post_as('p3', 'matches:match-join').status_code, 201)
+
+    def test_full_match_waitlists_and_promotes_in_order(self):
+        self.post_as('p1', 'matches:match-join')
+        self.post_as('p2', 'matches:match-join')
+        positions = [self.post_as(name, 'matches:match-join').data['waitlist_position'] for name in ('w1', 'w2', 'w3')]
+        self.assertEqual(positions, [1, 2, 3])
+
+        # 대기자가 먼저 빠져도 순서는 유지
+        self.post_as('w1', 'matches:match-leave')
+        self.post_as('p1', 'matches:match-leave')
+        self.match.refresh_from_db()
+        self.assertEqual((self.match.registered_count, self.match.status), (2, 'CLOSED'))
+        statuses = dict(self.match.participants.values_list('user__username', 'status'))
+        self.assertEqual(statuses, {'p1': 'CANCELED', 'p2': 'REGISTERED', 'w1': 'CANCELED',
+                                    'w2': 'REGISTERED', 'w3': 'WAITLISTED'})
+
+    def test_spot_freed_before_waitlisting_registers_joiner(self):
+        self.post_as('p1', 'matches:match-join')
+        self.post_as('p2', 'matches:match-join')
+        original_reserve = Match.reserve_spot
+        calls = []
+
+        def reserve_spot(match):
+            reserved = original_reserve(match)
+            if not calls:
+                # 자리 확보 실패 직후, 대기자가 없는 상태에서 커밋된 다른 사용자의 취소
+                calls.append(match)
+                MatchParticipant.objects.filter(user__username='p1').update(status='CANCELED')
+                Match.objects.get(pk=match.pk).release_spot()
+            return reserved
+
+        with mock.patch.object(Match, 'reserve_spot', reserve_spot):
+            response = self.post_as('w1', 'matches:match-join')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual((response.data['status'], response.data['waitlist_position']), ('REGISTERED', None))
+        self.match.refresh_from_db()
+        self.assertEqual((self.match.registered_count, self.match.status), (2, 'CLOSED'))
+
+        # 늦게 온 신청자는 빈자리를 가로채지 못하고 대기열로
+        self.assertEqual(self.post_as('w2', 'matches:match-join').data['status'], 'WAITLISTED')
+
+    def test_leave_locks_match_before_releasing_spot(self):
+        self.post_as('p1', 'matches:match-join')
+        calls = []
+        original_lock, original_release = Match.lock_for_update, Match.release_spot
+
+        def lock_for_update(match):
+            calls.append('lock')
+            original_lock(match)
+
+        def release_spot(match):
+            calls.append('release')
+            original_release(match)
+
+        with mock.patch.object(Match, 'lock_for_update', lock_for_update), \
+                mock.patch.object(Match, 'release_spot', release_spot):
+            self.assertEqual(self.post_as('p1', 'matches:match-leave').status_code, 200)
+        self.assertEqual(calls, ['lock', 'release'])
+
+    def test_join_rejected_when_not_recruiting(self):
+        Match.objects.filter(pk=self.match.pk).update(status='CANCELED')
+        response = self.post_as('p1', 'matches:match-join')
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(self.match.participants.exists())
+
+
+class MatchBulkCreateTests(TestCase):
+    """
+    반복 매치 일괄 생성의 쿼리 수와 일정 충돌 검사
+    """
+    def setUp(self):
+        self.host = User.objects.create_user(username='operator', password=None)
+        self.venue = Venue.objects.create(name='탄천 구장', address='성남', surface_type='ARTIFICIAL', size='6',
+                                          opening_time=time(6), closing_time=time(23))
+        self.client = APIClient()
+        self.client.force_authenticate(self.host)
+        self.template = {
+            'title': '주중 리그', 'match_type': 'SOCIAL', 'venue': self.venue.pk,
+            'start_time': '20:00', 'end_time': '22:00', 'max_players': 12, 'price': 10000,
+        }
+
+    def post(self, payload):
+        return self.client.post(reverse('matches:match-bulk-create'), payload, format='json')
+
+    def test_season_is_created_with_bounded_queries(self):
+        recurrence = {'freq': 'DAILY', 'dtstart': '2030-01-01', 'count': 500}
+        get_search_backend().is_available()  # 검색 테이블 존재 확인은 최초 1회만 수행되므로 미리 실행
+        with CaptureQueriesContext(connection) as queries:
+            response = self.post({'template': self.template, 'recurrence': recurrence})
+        self.assertEqual(response.status_code, 201)
+        inserts = [query for query in queries if query['sql'].startswith('INSERT INTO "matches_match"')]
+        # 구장 조회, savepoint, 구장 잠금, 충돌 조회, 검색 색인, release (배치 INSERT 제외)
+        self.assertLessEqual(len(queries) - len(inserts), 7)
+        # SQLite는 바인드 변수 개수 제한 때문에 배치가 여러 번으로 나뉨
+        self.assertLessEqual(len(inserts), 20)
+        self.assertEqual(response.data['created'], 500)
+        self.assertEqual(Match.objects.filter(venue=self.venue).count(), 500)
+
+    def test_weekly_recurrence_and_conflicts(self):
+        recurrence = {'freq': 'WEEKLY', 'byweekday': ['TU', 'TH'], 'dtstart': '2030-01-01', 'until': '2030-01-31'}
+        response = self.post({'template': self.template, 'recurrence': recurrence})
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual([match['date'] for match in response.data['matches']][:4],
+                         ['2030-01-01', '2030-01-03', '2030-01-08', '2030-01-10'])
+        self.assertEqual(response.data['created'], 10)
+
+        overlapping = dict(self.template, start_time='21:00', end_time='23:00')
+        response = self.post({'template': overlapping, 'dates': ['2030-01-02', '2030-01-03']})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(len(response.data['date']), 1)
+        self.assertEqual(Match.objects.count(), 10)
+
+
+class MatchStatusTransitionTaskTests(TestCase):
+    """
+    종료된 매치 상태 전환 태스크 검사
+    """
+    def setUp(self):
+        self.host = User.objects.create_user(username='host', password=None)
+        venue = Venue.objects.create(name='난지 구장', address='서울', surface_type='GRASS', size='11',
+                                     opening_time=time(6), closing_time=time(23))
+        today = date.today()
+        defaults = dict(match_type='SOCIAL', venue=venue, start_time=time(20), end_time=time(22),
+                        max_players=10, price=10000, host=self.host)
+        self.past_open = Match.objects.create(title='지난 매치', date=today - timedelta(days=1), **defaults)
+        self.past_closed = Match.objects.create(title='지난 마감', date=today - timedelta(days=2), status='CLOSED', **defaults)
+        self.past_canceled = Match.objects.create(title='취소', date=today - timedelta(days=1), status='CANCELED', **defaults)
+        self.future = Match.objects.create(title='다음 매치', date=today + timedelta(days=1), **defaults)
+        MatchParticipant.objects.create(match=self.past_closed, user=self.host, status='WAITLISTED', waitlist_position=1)
+
+    def test_expired_matches_are_completed_in_bulk(self):
+        counts = transition_match_statuses.apply().get()
+        self.assertEqual(counts, {'completed': 2, 'waitlist_canceled': 1})
+        statuses = dict(Match.objects.values_list('title', 'status'))
+        self.assertEqual(statuses, {'지난 매치': 'COMPLETED', '지난 마감': 'COMPLETED',
+                                    '취소': 'CANCELED', '다음 매치': 'OPEN'})
+        self.assertEqual(transition_match_statuses.apply().get()['completed'], 0)
+
+    def test_upcoming_filter_excludes_past_matches(self):
+        client = APIClient()
+        client.force_authenticate(self.host)
+        response = client.get(reverse('matches:match-list'), {'upcoming': 'true'})
+        self.assertEqual([match['title'] for match in response.data['results']], ['다음 매치'])
+
+
+class MatchScheduleConflictTests(TestCase):
+    """
+    같은 구장 시간 겹침 매치 생성/수정 거부 검사
+    """
+    def setUp(self):
+        self.host = User.objects.create_user(username='host', password=None)
+        self.venue = Venue.objects.create(name='효창 구장', address='서울', surface_type='GRASS', size='11',
+                                          opening_time=time(0), closing_time=time(0))
+        self.client = APIClient()
+        self.client.force_authenticate(self.host)
+
+    def create(self, day, start, end):
+        return self.client.post(reverse('matches:match-create'), {
+            'title': '야간 매치', 'match_type': 'SOCIAL', 'venue': self.venue.pk, 'date': day,
+            'start_time': start, 'end_time': end, 'max_players': 10, 'price': 10000,
+        })
+
+    def test_overlapping_bookings_are_rejected(self):
+        self.assertEqual(self.create('2030-01-01', '22:00', '01:00').status_code, 201)
+        # 자정을 넘긴 전날 매치와 겹침
+        self.assertEqual(self.create('2030-01-02', '00:30', '02:00').status_code, 400)
+        self.assertEqual(self.create('2030-01-01', '21:00', '22:30').status_code, 400)
+        # 맞닿은 시간대는 허용
+        self.assertEqual(self.create('2030-01-02', '01:00', '02:00').status_code, 201)
+        self.assertEqual(Match.objects.count(), 2)
+
+    def test_update_into_overlap_is_rejected(self):
+        self.create('2030-01-01', '18:00', '20:00')
+        self.create('2030-01-01', '20:00', '22:00')
+        later = Match.objects.get(start_time=time(20))
+        url = reverse('matches:match-update', args=[later.pk])
+        self.assertEqual(self.client.patch(url, {'start_time': '19:00'}).status_code, 400)
+        self.assertEqual(self.client.patch(url, {'start_time': '20:30'}).status_code, 200)
+
+
+class MatchResultRatingTests(TestCase):
+    """
+    결과 등록 후 비동기 레이팅/전적 반영 검사
+    """
+    def setUp(self):
+        self.host = User.objects.create_user(username='host', password=None)
+        self.home_player = User.objects.create_user(username='home', password=None)
+        self.away_player = User.objects.create_user(username='away', password=None)
+        self.home = Team.objects.create(name='홈팀', owner=self.host)
+        self.away = Team.objects.create(name='원정팀', owner=self.host)
+        venue = Venue.objects.create(name='잠실 구장', address='서울', surface_type='GRASS', size='11',
+                                     opening_time=time(6), closing_time=time(23))
+        self.match = Match.objects.create(
+            title='팀 매치', match_type='TEAM', venue=venue, date=date.today() - timedelta(days=1),
+            start_time=time(20), end_time=time(22), max_players=10, price=10000, host=self.host,
+            team_match=True, home_team=self.home, away_team=self.away,
+        )
+        MatchParticipant.objects.create(match=self.match, user=self.home_player, team=self.home)
+        MatchParticipant.objects.create(match=self.match, user=self.away_player, team=self.away)
+        MatchParticipant.objects.create(match=self.match, user=self.host)
+        self.client = APIClient()
+        self.client.force_authenticate(self.host)
+
+    def test_result_is_applied_once_after_commit(self):
+        url = reverse('matches:match-result-create', args=[self.match.pk])
+        response = self.client.post(url, {'home_score': 3, 'away_score': 1})
+        self.assertEqual(response.status_code, 201)
+        # 요청 경로에서는 레이팅을 바꾸지 않고 커밋 후 작업만 예약
+        self.assertEqual(User.objects.get(pk=self.home_player.pk).rating, 1000)
+
+        result = MatchResult.objects.get(match=self.match)
+        self.assertTrue(apply_match_result.apply(args=[result.pk]).get()['applied'])
+        self.assertFalse(apply_match_result.apply(args=[result.pk]).get()['applied'])
+
+        home, away = Team.objects.get(pk=self.home.pk), Team.objects.get(pk=self.away.pk)
+        self.assertEqual((home.rating, away.rating), (1016, 984))
+        self.assertEqual((home.matches_played, home.wins, home.goals_scored, home.goals_conceded), (1, 1, 3, 1))
+        self.assertEqual((away.matches_played, away.losses, away.goals_scored, away.goals_conceded), (1, 1, 1, 3))
+        players = {user.username: user for user in User.objects.all()}
+        self.assertEqual((players['home'].rating, players['home'].wins), (1016, 1))
+        self.assertEqual((players['away'].rating, players['away'].losses), (984, 1))
+        self.assertEqual((players['host'].rating, players['host'].matches_played, players['host'].wins), (1000, 1, 0))
+
+
+class ReplayRatingsCommandTests(TestCase):
+    """
+    레이팅 재생 명령이 결과를 순서대로 하나씩 반영한 것과 같은 값을 만드는지 검사
+    """
+    def test_replay_matches_sequential_application(self):
+        host = User.objects.create_user(username='host', password=None)
+        players = [User.objects.create_user(username=f'player{i}', password=None) for i in range(6)]
+        teams = [Team.objects.create(name=f'팀{i}', owner=host) for i in range(3)]
+        venue = Venue.objects.create(name='보라매 구장', address='서울', surface_type='GRASS', size='11',
+                                     opening_time=time(0), closing_time=time(0))
+        rng = random.Random(7)
+        results = []
+        for day in range(12):
+            home, away = rng.sample(teams, 2)
+            team_match = day % 4 != 3
+            match = Match.objects.create(
+                title=f'매치 {day}', match_type='TEAM', venue=venue, date=date(2024, 3, 1) + timedelta(days=day),
+                start_time=time(20), end_time=time(22), max_players=10, price=0, host=host,
+                home_team=home if team_match else None, away_team=away if team_match else None,
+            )
+            for player in rng.sample(players, 4):
+                MatchParticipant.objects.create(match=match, user=player, team=rng.choice([home, away, None]))
+            results.append(MatchResult.objects.create(match=match, home_score=rng.randint(0, 3),
+                                                      away_score=rng.randint(0, 3)))
+        for result in results:
+            apply_match_result.apply(args=[result.pk])
+
+        expected = self.snapshot()
+        self.assertNotEqual(expected[0][players[0].pk][0], 1000)
+        self.assertTrue(expected[2])
+        User.objects.update(rating=1500, wins=9)
+        Team.objects.update(rating=1500, goals_scored=9)
+        RatingHistory.objects.filter(pk=RatingHistory.objects.first().pk).delete()
+
+        call_command('replay_ratings', chunk_size=5, stdout=io.StringIO())
+        self.assertEqual(self.snapshot(), expected)
+
+    def snapshot(self):
+        fields = ('rating', 'matches_played', 'wins', 'draws', 'losses')
+        users = {pk: (round(rating, 6), *counts) for pk, rating, *counts in User.objects.values_list('pk', *fields)}
+        teams = {pk: (round(rating, 6), *counts)
+                 for pk, rating, *counts in Team.objects.values_list('pk', *fields, 'goals_scored', 'goals_conceded')}
+        history = RatingHistory.objects.order_by('result_id', 'user_id', 'team_id').values_list(
+            'user_id', 'team_id', 'result_id', 'recorded_at', 'rating', 'delta')
+        return users, teams, [(*row[:4], round(row[4], 6), round(row[5], 6)) for row in history]
+
+
+class RatingHistoryViewTests(TestCase):
+    """
+    레이팅 이력 다운샘플링 조회 검사
+    """
+    def setUp(self):
+        self.player = User.objects.create_user(username='player', password=None)
+        self.team = Team.objects.create(name='팀', owner=self.player)
+        venue = Venue.objects.create(name='목동 구장', address='서울', surface_type='GRASS', size='11',
+                                     opening_time=time(0), closing_time=time(0))
+        match = Match.objects.create(title='매치', match_type='SOCIAL', venue=venue, date=date(2024, 1, 1),
+                                     start_time=time(20), end_time=time(22), max_players=10, price=0, host=self.player)
+        result = MatchResult.objects.create(match=match, home_score=1, away_score=0)
+        started = match.ends_at
+        RatingHistory.objects.bulk_create([
+            RatingHistory(user=self.player, result=result, rating=1000 + (i % 50), delta=1,
+                          recorded_at=started + timedelta(days=i))
+            for i in range(3000)
+        ])
+        self.client = APIClient()
+        self.client.force_authenticate(self.player)
+
+    def test_history_is_downsampled(self):
+        url = reverse('users:user_rating_history', args=[self.player.pk])
+        for method in ('average', 'lttb'):
+            response = self.client.get(url, {'points': 100, 'method': method})
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.data['count'], 3000)
+            self.assertEqual(len(response.data['points']), 100)
+        # LTTB는 처음/마지막 점을 유지
+        self.assertEqual(response.data['points'][0]['rating'], 1000)
+        self.assertEqual(self.client.get(url, {'points': 1}).status_code, 400)
+
+        response = self.client.get(reverse('teams:team_rating_history', args=[self.team.pk]))
+        self.assertEqual((response.data['count'], response.data['points']), (0, []))
+
+
+class LeaderboardTests(TestCase):
+    """
+    정렬 집합 기반 팀/선수 리더보드 검사
+    """
+    def setUp(self):
+        team_keys, user_keys = all_board_keys()
+        get_sorted_set().delete(*team_keys, *user_keys)
+        self.owner = User.objects.create_user(username='owner', password=None)
+        self.client = APIClient()
+        self.client.force_authenticate(self.owner)
+
+    def test_team_rankings_follow_rating_and_region_changes(self):
+        ratings = {'a': 1200, 'b': 1100, 'c': 1100, 'd': 900}
+        with self.captureOnCommitCallbacks(execute=True):
+            teams = {name: Team.objects.create(name=name, owner=self.owner, rating=rating, region='seoul')
+                     for name, rating in ratings.items()}
+        response = self.client.get(reverse('teams:team_leaderboard'), {'region': 'seoul', 'limit': 3})
+        self.assertEqual(response.data['total'], 4)
+        self.assertEqual([(row['team']['name'], row['rank']) for row in response.data['results']],
+                         [('a', 1), ('b', 2), ('c', 2)])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            teams['d'].rating = 1300
+            teams['d'].region = 'incheon'
+            teams['d'].save()
+        ranks = self.client.get(reverse('teams:team_rank', args=[teams['d'].pk])).data['ranks']
+        self.assertEqual(ranks['overall'], {'rank': 1, 'rating': 1300, 'total': 4})
+        self.assertEqual(ranks['region']['total'], 1)
+        self.assertEqual(self.client.get(reverse('teams:team_leaderboard'), {'region': 'seoul'}).data['total'], 3)
+
+    def test_empty_board_is_rebuilt_from_database(self):
+        User.objects.bulk_create([User(username=f'p{i}', rating=1000 + i, skill_level='INT') for i in range(5)])
+        response = self.client.get(reverse('users:user_leaderboard'), {'skill_level': 'INT', 'limit': 2})
+        self.assertEqual(response.data['total'], 5)
+        self.assertEqual([row['user']['username'] for row in response.data['results']], ['p4', 'p3'])
+        user = User.objects.get(username='p2')
+        self.assertEqual(self.client.get(reverse('users:user_rank', args=[user.pk])).data['ranks']['skill_level']['rank'], 3)
+
+
+class MatchExportTests(TestCase):
+    """
+    관리자 스트리밍 내보내기 검사
+    """
+    def setUp(self):
+        self.admin = User.objects.create_user(username='admin', password=None, is_staff=True)
+        venue = Venue.objects.create(name='상암 구장', address='서울', surface_type='GRASS', size='11',
+                                     opening_time=time(0), closing_time=time(0))
+        for i in range(5):
+            match = Match.objects.create(
+                title=f'매치 {i}', match_type='SOCIAL', venue=venue, date=date(2030, 1, 1) + timedelta(days=i),
+                start_time=time(20), end_time=time(22), max_players=10, price=0, host=self.admin,
+                status='CLOSED' if i % 2 else 'OPEN',
+            )
+            MatchParticipant.objects.create(match=match, user=self.admin)
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+        self.url = reverse('matches:match-export')
+
+    def export(self, params):
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        return b''.join(response.streaming_content).decode()
+
+    def test_exports_filtered_rows_as_ndjson_and_csv(self):
+        lines = self.export({'status': 'OPEN'}).splitlines()
+        self.assertEqual([json.loads(line)['title'] for line in lines], ['매치 0', '매치 2', '매치 4'])
+
+        rows = list(csv.DictReader(io.StringIO(self.export({'dataset': 'participants', 'output': 'csv',
+                                                            'status': 'CLOSED'}))))
+        self.assertEqual(len(rows), 2)
+        self.assertEqual(rows[0]['user__username'], 'admin')
+
+    def test_export_is_admin_only(self):
+        self.client.force_authenticate(User.objects.create_user(username='member', password=None))
+        self.assertEqual(self.client.get(self.url).status_code, 403)
+
+
+class MatchRecommendationTests(TestCase):
+    """
+    개인화 매치 추천 점수/제외 조건과 쿼리 수 검사
+    """
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='player', password=None, skill_level='INT', rating=1100)
+        self.host = User.objects.create_user(username='host', password=None)
+        friend = User.objects.create_user(username='friend', password=None)
+        Friendship.objects.create(from_user=friend, to_user=self.user, status='ACCEPTED')
+
+        def venue(name, latitude, longitude):
+            return Venue.objects.create(name=name, address='서울', surface_type='GRASS', size='11',
+                                        latitude=latitude, longitude=longitude,
+                                        opening_time=time(0), closing_time=time(0))
+        near = venue('상암 구장', 37.568, 126.897)
+        nearby = venue('망원 구장', 37.556, 126.901)
+        far = venue('부산 구장', 35.180, 129.076)
+
+        tomorrow = timezone.localdate() + timedelta(days=1)
+        self.matches = {}
+        for title, match_venue, extra in [
+            ('친구 매치', near, {}),
+            ('고급 매치', nearby, {'skill_level': 'ADV'}),
+            ('여성 매치', near, {'gender': 'FEMALE'}),
+            ('원거리 매치', far, {}),
+            ('신청한 매치', near, {}),
+            ('마감 매치', near, {'status': 'CLOSED'}),
+            ('내 매치', nearby, {'host': self.user}),
+        ]:
+            self.matches[title] = Match.objects.create(**{
+                'title': title, 'match_type': 'SOCIAL', 'venue': match_venue, 'date': tomorrow,
+                'start_time': time(20), 'end_time': time(22), 'max_players': 10, 'price': 0,
+                'host': self.host, **extra,
+            })
+        MatchParticipant.objects.create(match=self.matches['친구 매치'], user=friend)
+        MatchParticipant.objects.create(match=self.matches['신청한 매치'], user=self.user)
+
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.url = reverse('matches:match-recommended')
+
+    def titles(self, params):
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, 200)
+        return [row['title'] for row in response.data['results']]
+
+    def test_scores_friends_skill_and_excludes_ineligible(self):
+        self.assertEqual(self.titles({'gender': 'MALE'}), ['친구 매치', '원거리 매치', '고급 매치'])
+
+        response = self.client.get(self.url, {'lat': 37.566, 'lng': 126.978, 'radius_km': 20})
+        results = {row['title']: row for row in response.data['results']}
+        self.assertEqual(list(results), ['친구 매치', '여성 매치', '고급 매치'])
+        self.assertEqual(results['친구 매치']['friends_attending'], 1)
+        self.assertAlmostEqual(results['친구 매치']['distance_km'], 7.2, delta=0.5)
+
+    def test_uses_precomputed_candidates_without_per_match_queries(self):
+        build_recommendation_candidates.apply()
+        # 친구, 이전 구장, 신청한 매치, 추천 매치 본문 조회
+        with self.assertNumQueries(4):
+            self.assertEqual(len(self.titles({})), 4)
+
+    def test_rejects_partial_location(self):
+        self.assertEqual(self.client.get(self.url, {'lat': 37.5}).status_code, 400)
+
+
+class MatchmakingTests(TestCase):
+    """
+    팀 매치메이킹 등록 권한, 레이팅 밴드 확장, 매치 생성 검사
+    """
+    def setUp(self):
+        self.venue = Venue.objects.create(name='상암 구장', address='서울', surface_type='GRASS', size='11',
+                                          opening_time=time(0), closing_time=time(0))
+        self.date = timezone.localdate() + timedelta(days=1)
+        self.teams = {}
+        for name, rating in [('A', 1000), ('B', 1030), ('C', 1300), ('D', 1600)]:
+            captain = User.objects.create_user(username=f'captain-{name}', password=None)
+            team = Team.objects.create(name=f'FC {name}', owner=captain, rating=rating)
+            TeamMember.objects.create(team=team, user=captain, role='CAPTAIN')
+            self.teams[name] = (team, captain)
+        self.client = APIClient()
+        self.url = reverse('matches:matchmaking-create')
+
+    def enqueue(self, name, **extra):
+        team, captain = self.teams[name]
+        self.client.force_authenticate(captain)
+        return self.client.post(self.url, {
+            'team': team.pk, 'date': self.date, 'earliest_start': '18:00', 'latest_end': '22:00',
+            'venues': [self.venue.pk], **extra,
+        }, format='json')
+
+    def test_only_captain_can_enqueue_once(self):
+        team, _ = self.teams['A']
+        player = User.objects.create_user(username='player', password=None)
+        TeamMember.objects.create(team=team, user=player, role='PLAYER')
+        self.client.force_authenticate(player)
+        response = self.client.post(self.url, {
+            'team': team.pk, 'date': self.date, 'earliest_start': '18:00', 'latest_end': '22:00',
+            'venues': [self.venue.pk],
+        }, format='json')
+        self.assertEqual(response.status_code, 403)
+
+        self.assertEqual(self.enqueue('A').status_code, 201)
+        self.assertEqual(self.enqueue('A').status_code, 400)
+        self.assertEqual(self.enqueue('B', latest_end='19:00').status_code, 400)
+        self.assertEqual(MatchmakingTicket.objects.get().region, 'seoul')
+
+    def test_pairs_closest_rating_and_widens_band_over_time(self):
+        Match.objects.create(title='기존 매치', match_type='SOCIAL', venue=self.venue, date=self.date,
+                             start_time=time(18), end_time=time(20), max_players=10, price=0,
+                             host=self.teams['A'][1])
+        for name in 'ABCD':
+            self.assertEqual(self.enqueue(name).status_code, 201)
+
+        self.assertEqual(run_matchmaking()['matched'], 1)
+        match = Match.objects.get(team_match=True)
+        self.assertEqual((match.home_team, match.away_team), (self.teams['A'][0], self.teams['B'][0]))
+        self.assertEqual((match.start_time, match.end_time), (time(20), time(22)))
+        self.assertEqual(match.max_players, 22)
+        self.assertEqual(set(MatchmakingTicket.objects.filter(match=match).values_list('status', flat=True)),
+                         {'MATCHED'})
+
+        # C(1300)와 D(1600)는 처음엔 밴드 밖이고, 한 시간 뒤 밴드 안에 들어와도 빈 슬롯이 없으면 대기
+        self.assertEqual(run_matchmaking()['matched'], 0)
+        later = timezone.now() + timedelta(hours=1)
+        self.assertEqual(run_matchmaking(now=later)['matched'], 0)
+        self.assertEqual(MatchmakingTicket.objects.filter(status='WAITING').count(), 2)
+
+        existing = Match.objects.get(title='기존 매치')
+        existing.status = 'CANCELED'
+        existing.save()
+        self.assertEqual(run_matchmaking(now=later)['matched'], 1)
+        match = Match.objects.filter(team_match=True).latest('pk')
+        self.assertEqual((match.home_team, match.start_time), (self.teams['C'][0], time(18)))
+
+    def test_captain_cancels_waiting_ticket(self):
+        ticket_id = self.enqueue('A').data['id']
+        url = reverse('matches:matchmaking-cancel', args=[ticket_id])
+        self.assertEqual(self.client.post(url).data['status'], 'CANCELED')
+        self.assertEqual(self.client.post(url).status_code, 400)
+        self.assertEqual(self.client.get(reverse('matches:matchmaking-detail', args=[ticket_id])).status_code, 200)
@@ -1,8 +1,10 @@
 from django.urls import path
 from .views import (
-    MatchListView, MatchDetailView, MatchCreateView, MatchUpdateView, 
+    MatchListView, MatchDetailView, MatchCreateView, MatchBulkCreateView, MatchUpdateView, 
     MatchDeleteView, MatchJoinView, MatchLeaveView, MatchParticipantsView,
-    MatchResultView, MatchResultCreateView
+    MatchResultView, MatchResultCreateView, MatchFeedCacheStatsView, MatchExportView,
+    MatchRecommendationView, MatchmakingTicketCreateView, MatchmakingTicketDetailView,
+    MatchmakingTicketCancelView
 )
 
 app_name = 'matches'
@@ -11,16 +13,25 @@ urlpatterns = [
     # 매치 관련 URL
     path('', MatchListView.as_view(), name='match-list'),
     path('<int:pk>/', MatchDetailView.as_view(), name='match-detail'),
+    path('cache-stats/', MatchFeedCacheStatsView.as_view(), name='match-cache-stats'),
+    path('export/', MatchExportView.as_view(), name='match-export'),
+    path('recommended/', MatchRecommendationView.as_view(), name='match-recommended'),
     path('create/', MatchCreateView.as_view(), name='match-create'),
+    path('bulk-create/', MatchBulkCreateView.as_view(), name='match-bulk-create'),
     path('<int:pk>/update/', MatchUpdateView.as_view(), name='match-update'),
     path('<int:pk>/delete/', MatchDeleteView.as_view(), name='match-delete'),
     
     # 매치 참가 관련 URL
-    path('<int:pk>/join/', MatchJoinView.as_view(), name='match-join'),
-    path('<int:pk>/leave/', MatchLeaveView.as_view(), name='match-leave'),
-    path('<int:pk>/participants/', MatchParticipantsView.as_view(), name='match-participants'),
+    path('<int:match_id>/join/', MatchJoinView.as_view(), name='match-join'),
+    path('<int:match_id>/leave/', MatchLeaveView.as_view(), name='match-leave'),
+    path('<int:match_id>/participants/', MatchParticipantsView.as_view(), name='match-participants'),
+    
+    # 팀 매치메이킹 관련 URL
+    path('matchmaking/', MatchmakingTicketCreateView.as_view(), name='matchmaking-create'),
+    path('matchmaking/<int:pk>/', MatchmakingTicketDetailView.as_view(), name='matchmaking-detail'),
+    path('matchmaking/<int:pk>/cancel/', MatchmakingTicketCancelView.as_view(), name='matchmaking-cancel'),
     
     # 매치 결과 관련 URL
-    path('<int:pk>/result/', MatchResultView.as_view(), name='match-result'),
-    path('<int:pk>/result/create/', MatchResultCreateView.as_view(), name='match-result-create'),
+    path('<int:match_id>/result/', MatchResultView.as_view(), name='match-result'),
+    path('<int:match_id>/result/create/', MatchResultCreateView.as_view(), name='match-result-create'),
 ] 
\ No newline at end of file
@@ -1,18 +1,43 @@
+from datetime import datetime, timezone as dt_timezone
+from django.http import StreamingHttpResponse
 from django.shortcuts import render, get_object_or_404
-from rest_framework import generics, permissions, status, filters
+from django.core.cache import cache
+from django.utils import timezone
+from django.db import IntegrityError, transaction
+from django.db.models import Count, OuterRef, Prefetch
+from rest_framework import generics, permissions, status
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from django_filters.rest_framework import DjangoFilterBackend
-from .models import Match, MatchParticipant, MatchResult
+from django.contrib.auth import get_user_model
+from config.conditional import ConditionalRetrieveMixin, latest_change, row_count
+from teams.models import Team, TeamMember
+from venues.models import VenueImage, VenueReview
+from venues.stats import schedule_today_stats_refresh
+from .models import Match, MatchmakingTicket, MatchParticipant, MatchResult, RatingHistory
 from .serializers import (
     MatchListSerializer,
     MatchDetailSerializer,
     MatchCreateSerializer,
+    MatchBulkCreateSerializer,
     MatchUpdateSerializer,
     MatchParticipantSerializer,
-    MatchResultCreateSerializer
+    MatchResultCreateSerializer,
+    RatingHistoryQuerySerializer,
+    MatchExportQuerySerializer,
+    MatchRecommendationQuerySerializer,
+    MatchmakingTicketSerializer,
+    RecommendedMatchSerializer
 )
-from .filters import MatchFilter
+from .filters import MatchFilter, MatchOrderingFilter
+from .pagination import MatchCursorPagination
+from .export import EXPORT_FORMATS, stream_export
+from .rating import DOWNSAMPLE_METHODS
+from .recommendation import recommend_matches
+from .cache import bump_feed_version, get_feed_cache_key, get_feed_cache_stats, get_feed_timeout, record_feed_lookup
+
+User = get_user_model()
 
 # Create your views here.
 
@@ -22,13 +47,78 @@ class MatchListView(generics.ListAPIView):
     매치 목록 조회 뷰
     """
     serializer_class = MatchListSerializer
-    filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
+    filter_backends = [DjangoFilterBackend, MatchOrderingFilter]
     filterset_class = MatchFilter
-    ordering_fields = ['date', 'start_time', 'price']
+    ordering_fields = ['date', 'start_time', 'price', 'distance']
     ordering = ['date', 'start_time']
     
     def get_queryset(self):
         return Match.objects.all().select_related('venue', 'host')
+    
+    def list(self, request, *args, **kwargs):
+        """
+        정규화된 필터/정렬/페이지 파라미터 기준으로 응답을 캐시
+        """
+        cache_key = get_feed_cache_key(request)
+        data = cache.get(cache_key)
+        if data is not None:
+            record_feed_lookup(hit=True)
+            return Response(data, headers={'X-Cache': 'HIT'})
+        
+        record_feed_lookup(hit=False)
+        response = super().list(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            cache.set(cache_key, response.data, get_feed_timeout())
+        response['X-Cache'] = 'MISS'
+        return response
+    
+    @property
+    def paginator(self):
+        """
+        cursor 파라미터(또는 pagination=cursor)가 있으면 키셋 페이지네이션 사용
+        """
+        if not hasattr(self, '_paginator'):
+            params = self.request.query_params
+            if MatchCursorPagination.cursor_query_param in params or params.get('pagination') == 'cursor':
+                self._paginator = MatchCursorPagination()
+            elif self.pagination_class is None:
+                self._paginator = None
+            else:
+                self._paginator = self.pagination_class()
+        return self._paginator
+
+class MatchRecommendationView(APIView):
+    """
+    로그인한 사용자에게 맞춘 추천 매치 조회 뷰
+
+    미리 만든 후보 집합을 한 번에 점수화하고, 상위 매치만 한 번의 쿼리로 다시 읽어
+    그 사이 마감/취소된 매치는 제외합니다.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    
+    def get(self, request):
+        serializer = MatchRecommendationQuerySerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        params = serializer.validated_data
+        recommended = recommend_matches(
+            request.user, latitude=params.get('lat'), longitude=params.get('lng'),
+            radius_km=params['radius_km'], gender=params.get('gender'),
+            days=params['days'], limit=params['limit'],
+        )
+        
+        matches = Match.objects.select_related('venue', 'host').filter(
+            pk__in=[match_id for match_id, *_ in recommended], status='OPEN'
+        ).in_bulk()
+        results = []
+        for match_id, score, distance, friends in recommended:
+            match = matches.get(match_id)
+            if match is None:
+                continue
+            match.score = round(score, 4)
+            match.distance_km = None if distance is None else round(distance, 2)
+            match.friends_attending = friends
+            results.append(match)
+        return Response({'results': RecommendedMatchSerializer(results, many=True).data})
 
 class MatchCreateView(generics.CreateAPIView):
     """
@@ -41,13 +131,65 @@ class MatchCreateView(generics.CreateAPIView):
         context = super().get_serializer_context()
         return context
 
-class MatchDetailView(generics.RetrieveAPIView):
+class MatchBulkCreateView(generics.CreateAPIView):
+    """
+    반복/일괄 매치 생성 뷰
+    """
+    serializer_class = MatchBulkCreateSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    
+    def create(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        matches = serializer.save()
+        return Response({
+            "created": len(matches),
+            "matches": MatchListSerializer(matches, many=True).data
+        }, status=status.HTTP_201_CREATED)
+
+class MatchDetailView(ConditionalRetrieveMixin, generics.RetrieveAPIView):
     """
     매치 상세 조회 뷰
     """
-    queryset = Match.objects.all()
     serializer_class = MatchDetailSerializer
     
+    def get_validators(self):
+        """
+        매치와 참가자/결과/구장/팀의 변경 시각을 한 번의 쿼리로 조회
+        """
+        participants = MatchParticipant.objects.filter(match=OuterRef('pk'))
+        reviews = VenueReview.objects.filter(venue=OuterRef('venue'))
+        return Match.objects.filter(pk=self.kwargs['pk']).values(
+            'updated_at', 'registered_count', 'status', 'host__updated_at',
+            'result__updated_at', 'result__mvp__updated_at', 'venue__updated_at', 'home_team__updated_at', 'away_team__updated_at',
+        ).annotate(
+            participants_changed=latest_change(participants),
+            participants_count=row_count(participants),
+            players_changed=latest_change(User.objects.filter(matchparticipant__match=OuterRef('pk'))),
+            reviews_changed=latest_change(reviews),
+            reviews_count=row_count(reviews),
+            images_count=row_count(VenueImage.objects.filter(venue=OuterRef('venue'))),
+            home_members_changed=latest_change(TeamMember.objects.filter(team=OuterRef('home_team'))),
+            home_members_count=row_count(TeamMember.objects.filter(team=OuterRef('home_team'))),
+            away_members_changed=latest_change(TeamMember.objects.filter(team=OuterRef('away_team'))),
+            away_members_count=row_count(TeamMember.objects.filter(team=OuterRef('away_team'))),
+        ).first()
+    
+    def get_queryset(self):
+        """
+        참가자/리뷰 수와 관계없이 쿼리 수가 일정하도록 연관 객체를 한 번에 로드
+        """
+        teams = Team.objects.select_related('owner').annotate(members_count=Count('members'))
+        return Match.objects.select_related(
+            'venue', 'host', 'result__mvp'
+        ).prefetch_related(
+            Prefetch('participants', queryset=MatchParticipant.objects.select_related('user')),
+            'venue__images',
+            Prefetch('venue__reviews', queryset=VenueReview.objects.select_related('user')),
+            Prefetch('home_team', queryset=teams),
+            Prefetch('away_team', queryset=teams),
+        )
+    
     def get_serializer_context(self):
         context = super().get_serializer_context()
         return context
@@ -105,25 +247,24 @@ class MatchJoinView(APIView):
         if MatchParticipant.objects.filter(match=match, user=user).exists():
             return Response({"detail": "이미 참가 신청한 매치입니다."}, status=status.HTTP_400_BAD_REQUEST)
         
-        # 매치가 모집 중이 아닌 경우
-        if match.status != 'OPEN':
-            return Response({"detail": "모집 중인 매치가 아닙니다."}, status=status.HTTP_400_BAD_REQUEST)
-        
-        # 매치가 가득 찬 경우
-        if match.current_players.count() >= match.max_players:
-            return Response({"detail": "매치 인원이 가득 찼습니다."}, status=status.HTTP_400_BAD_REQUEST)
-        
-        # 참가 신청
-        participant = MatchParticipant.objects.create(
-            match=match,
-            user=user,
-            status='REGISTERED'
-        )
-        
-        # 매치가 가득 찼는지 확인하고 상태 업데이트
-        if match.current_players.count() >= match.max_players:
-            match.status = 'CLOSED'
-            match.save()
+        try:
+            with transaction.atomic():
+                # 자리 확보 (조건부 UPDATE 한 번으로 정원 초과 방지, 마감 시 CLOSED 전환)
+                if match.reserve_spot():
+                    # 참가 신청
+                    participant = MatchParticipant.objects.create(
+                        match=match,
+                        user=user,
+                        status='REGISTERED'
+                    )
+                else:
+                    # 인원이 가득 찬 경우 대기열에 추가 (잠금 후 빈자리가 생겼으면 바로 등록)
+                    participant = match.enqueue_waitlist(user)
+                    if participant is None:
+                        return Response({"detail": "모집 중인 매치가 아닙니다."}, status=status.HTTP_400_BAD_REQUEST)
+        except IntegrityError:
+            # 동시에 들어온 중복 신청 (확보한 자리는 롤백됨)
+            return Response({"detail": "이미 참가 신청한 매치입니다."}, status=status.HTTP_400_BAD_REQUEST)
         
         serializer = MatchParticipantSerializer(participant)
         return Response(serializer.data, status=status.HTTP_201_CREATED)
@@ -147,14 +288,31 @@ class MatchLeaveView(APIView):
         if match.is_past:
             return Response({"detail": "이미 종료된 매치는 취소할 수 없습니다."}, status=status.HTTP_400_BAD_REQUEST)
         
-        # 참가 취소
-        participant.status = 'CANCELED'
-        participant.save()
+        # 이미 취소한 경우
+        if participant.status == 'CANCELED':
+            return Response({"detail": "이미 취소된 참가 신청입니다."}, status=status.HTTP_400_BAD_REQUEST)
         
-        # 매치 상태 업데이트
-        if match.status == 'CLOSED':
-            match.status = 'OPEN'
-            match.save()
+        with transaction.atomic():
+            # 대기열 추가와 같은 매치 행 잠금으로 직렬화 (커밋 전 대기자를 놓치고 자리를 비우지 않도록)
+            match.lock_for_update()
+            # 읽은 상태 그대로일 때만 취소 (동시에 들어온 취소 요청은 한 번만 반영)
+            was_waitlisted = participant.status == 'WAITLISTED'
+            canceled = MatchParticipant.objects.filter(pk=participant.pk, status=participant.status).update(
+                status='CANCELED', waitlist_position=None, updated_at=timezone.now()
+            )
+            if not canceled:
+                return Response({"detail": "이미 취소된 참가 신청입니다."}, status=status.HTTP_400_BAD_REQUEST)
+            # update()는 시그널을 보내지 않으므로 목록 캐시 무효화와 통계 갱신 예약을 직접 처리
+            transaction.on_commit(bump_feed_version)
+            transaction.on_commit(lambda: schedule_today_stats_refresh(match.venue_id, [match.date]))
+            
+            if not was_waitlisted:
+                # 대기자가 있으면 자리를 넘기고, 없으면 인원 감소 및 마감 상태 해제
+                promoted = None
+                if match.status in ('OPEN', 'CLOSED'):
+                    promoted = match.promote_waitlisted()
+                if promoted is None:
+                    match.release_spot()
         
         return Response({"detail": "매치 참가가 취소되었습니다."}, status=status.HTTP_200_OK)
 
@@ -209,3 +367,128 @@ class MatchResultCreateView(generics.CreateAPIView):
             self.permission_denied(self.request, message="아직 종료되지 않은 매치입니다.")
         
         serializer.save()
+
+
+def is_team_captain(user, team_id):
+    return TeamMember.objects.filter(team_id=team_id, user=user, role='CAPTAIN').exists()
+
+class MatchmakingTicketCreateView(generics.CreateAPIView):
+    """
+    팀 매치메이킹 대기 등록 뷰 (팀 주장만 가능)
+    """
+    serializer_class = MatchmakingTicketSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    
+    def perform_create(self, serializer):
+        team = serializer.validated_data['team']
+        if not is_team_captain(self.request.user, team.pk):
+            self.permission_denied(self.request, message="팀 주장만 매치메이킹을 신청할 수 있습니다.")
+        try:
+            with transaction.atomic():
+                serializer.save(created_by=self.request.user)
+        except IntegrityError:
+            # 동시에 들어온 등록 요청 (팀당 대기 항목 하나 제약)
+            raise ValidationError({"detail": "이미 매치메이킹 대기 중인 팀입니다."})
+
+class MatchmakingTicketDetailView(generics.RetrieveAPIView):
+    """
+    팀 매치메이킹 대기 상태 조회 뷰 (팀원만 조회 가능)
+    """
+    serializer_class = MatchmakingTicketSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    
+    def get_queryset(self):
+        return MatchmakingTicket.objects.filter(team__teammember__user=self.request.user).distinct()
+
+class MatchmakingTicketCancelView(APIView):
+    """
+    팀 매치메이킹 대기 취소 뷰 (팀 주장만 가능)
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    
+    def post(self, request, pk):
+        ticket = get_object_or_404(MatchmakingTicket, pk=pk)
+        if not is_team_captain(request.user, ticket.team_id):
+            self.permission_denied(request, message="팀 주장만 매치메이킹을 취소할 수 있습니다.")
+        # 매칭 작업과 동시에 실행돼도 대기 상태일 때만 취소되도록 조건부 UPDATE
+        canceled = MatchmakingTicket.objects.filter(pk=pk, status='WAITING').update(
+            status='CANCELED', updated_at=timezone.now()
+        )
+        if not canceled:
+            return Response({"detail": "대기 중인 항목만 취소할 수 있습니다."}, status=status.HTTP_400_BAD_REQUEST)
+        ticket.refresh_from_db()
+        return Response(MatchmakingTicketSerializer(ticket).data)
+
+
+class MatchFeedCacheStatsView(APIView):
+    """
+    매치 목록 캐시 적중/미스 통계 조회 뷰 (관리자 전용)
+    """
+    permission_classes = [permissions.IsAdminUser]
+    
+    def get(self, request):
+        return Response(get_feed_cache_stats())
+
+
+
+class MatchExportView(APIView):
+    """
+    매치/참가자/결과 스트리밍 내보내기 뷰 (관리자 전용)
+
+    dataset(matches, participants, results)과 output(ndjson, csv) 외의 쿼리 파라미터는
+    MatchFilter로 매치를 거르는 데 사용합니다.
+    """
+    permission_classes = [permissions.IsAdminUser]
+    
+    def get(self, request):
+        serializer = MatchExportQuerySerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        dataset = serializer.validated_data['dataset']
+        output = serializer.validated_data['output']
+        
+        match_filter = MatchFilter(request.query_params, queryset=Match.objects.all(), request=request)
+        if not match_filter.is_valid():
+            return Response(match_filter.errors, status=status.HTTP_400_BAD_REQUEST)
+        
+        response = StreamingHttpResponse(
+            stream_export(dataset, output, match_filter.qs), content_type=EXPORT_FORMATS[output]
+        )
+        filename = f"{dataset}-{timezone.localdate():%Y%m%d}.{output}"
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        # 프록시가 응답 전체를 모았다가 보내지 않도록 버퍼링 해제
+        response['X-Accel-Buffering'] = 'no'
+        return response
+
+class RatingHistoryView(APIView):
+    """
+    레이팅 이력 조회 뷰 (서버에서 points개 이하로 다운샘플링)
+
+    users/teams 앱에서 owner_model과 RatingHistory의 소유자 필드(owner_field)를 지정해 사용합니다.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    owner_model = None
+    owner_field = None
+    
+    def get(self, request, pk):
+        owner = get_object_or_404(self.owner_model, pk=pk)
+        serializer = RatingHistoryQuerySerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        method = serializer.validated_data['method']
+        
+        series = [
+            (recorded_at.timestamp(), rating)
+            for recorded_at, rating in RatingHistory.objects.filter(
+                **{self.owner_field: owner}
+            ).values_list('recorded_at', 'rating')
+        ]
+        sampled = DOWNSAMPLE_METHODS[method](series, serializer.validated_data['points'])
+        return Response({
+            "id": owner.pk,
+            "rating": owner.rating,
+            "count": len(series),
+            "method": method,
+            "points": [
+                {"recorded_at": datetime.fromtimestamp(timestamp, tz=dt_timezone.utc), "rating": round(rating, 2)}
+                for timestamp, rating in sampled
+            ],
+        })
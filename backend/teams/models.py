@@ -85,6 +85,7 @@ class TeamMember(models.Model):
     role = models.CharField(_('역할'), max_length=10, choices=ROLE_CHOICES, default='PLAYER')
     position = models.CharField(_('포지션'), max_length=2, choices=POSITION_CHOICES, blank=True, null=True)
     joined_at = models.DateTimeField(_('가입일'), auto_now_add=True)
+    updated_at = models.DateTimeField(_('수정일'), auto_now=True)
     
     class Meta:
         verbose_name = _('팀 멤버')
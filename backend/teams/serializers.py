@@ -55,6 +55,9 @@ class TeamSerializer(serializers.ModelSerializer):
                   'created_at')
     
     def get_members_count(self, obj):
+        # annotate된 값이 있으면 추가 쿼리 없이 사용
+        if hasattr(obj, 'members_count'):
+            return obj.members_count
         return obj.members.count()
 
 class TeamDetailSerializer(serializers.ModelSerializer):
@@ -141,4 +144,14 @@ class TeamCreateSerializer(serializers.ModelSerializer):
         # 팀 생성자를 팀의 주장으로 추가
         TeamMember.objects.create(team=team, user=user, role='CAPTAIN')
         
-        return team 
\ No newline at end of file
+        return team 
+
+
+class TeamLeaderboardQuerySerializer(serializers.Serializer):
+    """
+    팀 리더보드 조회 조건 시리얼라이저
+    """
+    region = serializers.ChoiceField(choices=Team.REGION_CHOICES, required=False)
+    level = serializers.ChoiceField(choices=Team.LEVEL_CHOICES, required=False)
+    limit = serializers.IntegerField(min_value=1, max_value=100, default=20)
+    offset = serializers.IntegerField(min_value=0, default=0)
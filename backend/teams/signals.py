@@ -0,0 +1,44 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+from matches.leaderboard import ranking_fields_changed, remove_rankings, team_board_keys, update_team_rankings
+from .models import Team
+
+
+# 리더보드에 영향을 주는 필드
+TEAM_RANKING_FIELDS = ('region', 'level', 'rating')
+
+
+@receiver(pre_save, sender=Team)
+def remember_team_ranking(sender, instance, raw=False, using=None, update_fields=None, **kwargs):
+    """
+    리더보드 갱신 여부를 판단할 수 있도록 저장 전 지역/수준/레이팅을 기록
+    """
+    instance._previous_ranking = None
+    if not raw and ranking_fields_changed(instance, TEAM_RANKING_FIELDS, update_fields):
+        instance._previous_ranking = Team.objects.using(using).filter(
+            pk=instance.pk
+        ).values_list(*TEAM_RANKING_FIELDS).first()
+
+
+@receiver(post_save, sender=Team)
+def update_team_leaderboard(sender, instance, created=False, raw=False, using=None, **kwargs):
+    """
+    팀 생성 또는 지역/수준/레이팅 변경 시 커밋 후 리더보드 갱신
+    """
+    previous = getattr(instance, '_previous_ranking', None)
+    current = tuple(getattr(instance, field) for field in TEAM_RANKING_FIELDS)
+    if raw or (not created and (previous is None or previous == current)):
+        return
+    stale = set(team_board_keys(*previous[:2])) - set(team_board_keys(*current[:2])) if previous else set()
+
+    def update():
+        remove_rankings(stale, instance.pk)
+        update_team_rankings([(instance.pk, *current)])
+    transaction.on_commit(update, using=using)
+
+
+@receiver(post_delete, sender=Team)
+def remove_team_from_leaderboard(sender, instance, using=None, **kwargs):
+    keys, pk = team_board_keys(instance.region, instance.level), instance.pk
+    transaction.on_commit(lambda: remove_rankings(keys, pk), using=using)
@@ -1,3 +1,65 @@
+from django.contrib.auth import get_user_model
+from django.db.models import F
 from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from .models import Team, TeamJoinRequest, TeamMember
 
-# Create your tests here.
+User = get_user_model()
+
+
+class TeamDetailConditionalGetTests(TestCase):
+    """
+    팀 상세 조회의 ETag 조건부 GET 검사
+    """
+    def setUp(self):
+        self.owner = User.objects.create_user(username='owner', password=None)
+        self.team = Team.objects.create(name='FC 목동', owner=self.owner)
+        TeamMember.objects.create(team=self.team, user=self.owner, role='CAPTAIN')
+        self.url = reverse('teams:team_detail', args=[self.team.pk])
+        self.client = APIClient()
+        self.client.force_authenticate(self.owner)
+
+    def assertEtagChanged(self, etag):
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+        return response['ETag']
+
+    def test_matching_etag_returns_304_with_one_query(self):
+        etag = self.client.get(self.url)['ETag']
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+
+    def test_member_add_and_remove_change_etag(self):
+        etag = self.client.get(self.url)['ETag']
+        player = User.objects.create_user(username='player', password=None)
+        TeamMember.objects.create(team=self.team, user=player)
+        etag = self.assertEtagChanged(etag)
+
+        response = self.client.delete(reverse('teams:team_member_remove', args=[self.team.pk, player.pk]))
+        self.assertEqual(response.status_code, 204)
+        self.assertEtagChanged(etag)
+
+    def test_join_request_changes_etag(self):
+        etag = self.client.get(self.url)['ETag']
+        applicant = User.objects.create_user(username='applicant', password=None)
+        TeamJoinRequest.objects.create(team=self.team, user=applicant, message='가입 희망합니다')
+        self.assertEtagChanged(etag)
+
+    def test_member_rating_and_team_changes_change_etag(self):
+        etag = self.client.get(self.url)['ETag']
+        # 경기 결과 반영과 같은 방식으로 레이팅과 수정일을 함께 갱신
+        User.objects.filter(pk=self.owner.pk).update(rating=F('rating') + 16, updated_at=timezone.now())
+        etag = self.assertEtagChanged(etag)
+
+        self.team.description = '주말 오전 모임'
+        self.team.save()
+        self.assertEtagChanged(etag)
+
+    def test_missing_team_returns_404(self):
+        response = self.client.get(reverse('teams:team_detail', args=[self.team.pk + 100]))
+        self.assertEqual(response.status_code, 404)
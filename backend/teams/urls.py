@@ -7,9 +7,12 @@ urlpatterns = [
     # 팀 관련 URL
     path('', views.TeamListView.as_view(), name='team_list'),
     path('create/', views.TeamCreateView.as_view(), name='team_create'),
+    path('leaderboard/', views.TeamLeaderboardView.as_view(), name='team_leaderboard'),
     path('<int:pk>/', views.TeamDetailView.as_view(), name='team_detail'),
     path('<int:pk>/update/', views.TeamUpdateView.as_view(), name='team_update'),
     path('<int:pk>/delete/', views.TeamDeleteView.as_view(), name='team_delete'),
+    path('<int:pk>/rating-history/', views.TeamRatingHistoryView.as_view(), name='team_rating_history'),
+    path('<int:pk>/rank/', views.TeamRankView.as_view(), name='team_rank'),
     
     # 팀 멤버 관련 URL
     path('<int:team_id>/members/', views.TeamMemberListView.as_view(), name='team_member_list'),
@@ -1,6 +1,12 @@
-from django.shortcuts import render
+from django.shortcuts import render, get_object_or_404
+from django.db.models import Count, OuterRef
 from rest_framework import generics, permissions
-from .serializers import TeamSerializer, TeamDetailSerializer, TeamCreateSerializer, TeamMemberSerializer, TeamJoinRequestSerializer
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from config.conditional import ConditionalRetrieveMixin, latest_change, row_count
+from matches.leaderboard import get_leaderboard, get_rank, team_board_key
+from matches.views import RatingHistoryView
+from .serializers import TeamSerializer, TeamDetailSerializer, TeamCreateSerializer, TeamMemberSerializer, TeamJoinRequestSerializer, TeamLeaderboardQuerySerializer
 from .models import Team, TeamMember, TeamJoinRequest
 import traceback
 
@@ -74,10 +80,73 @@ class TeamCreateView(generics.CreateAPIView):
     def perform_create(self, serializer):
         serializer.save()
 
-class TeamDetailView(generics.RetrieveAPIView):
+class TeamDetailView(ConditionalRetrieveMixin, generics.RetrieveAPIView):
     permission_classes = [permissions.IsAuthenticated]
     serializer_class = TeamDetailSerializer
     queryset = Team.objects.all()
+    
+    def get_validators(self):
+        # 팀, 팀원, 가입 요청의 변경 시각과 개수를 한 번의 쿼리로 조회
+        members = TeamMember.objects.filter(team=OuterRef('pk'))
+        join_requests = TeamJoinRequest.objects.filter(team=OuterRef('pk'))
+        return Team.objects.filter(pk=self.kwargs['pk']).values(
+            'updated_at', 'owner__updated_at'
+        ).annotate(
+            members_changed=latest_change(members),
+            members_count=row_count(members),
+            member_users_changed=latest_change(members, 'user__updated_at'),
+            join_requests_changed=latest_change(join_requests),
+            join_requests_count=row_count(join_requests),
+        ).first()
+
+class TeamRatingHistoryView(RatingHistoryView):
+    """
+    팀 레이팅 이력 조회 뷰
+    """
+    owner_model = Team
+    owner_field = 'team'
+
+class TeamLeaderboardView(APIView):
+    """
+    팀 리더보드 조회 뷰 (지역/수준별 레이팅 순위)
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    
+    def get(self, request):
+        serializer = TeamLeaderboardQuerySerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        region = serializer.validated_data.get('region')
+        level = serializer.validated_data.get('level')
+        total, entries = get_leaderboard(team_board_key(region, level), serializer.validated_data['limit'],
+                                         serializer.validated_data['offset'])
+        
+        teams = Team.objects.select_related('owner').annotate(
+            members_count=Count('members')
+        ).in_bulk([pk for pk, _, _ in entries])
+        results = [
+            {"rank": rank, "rating": rating, "team": TeamSerializer(teams[pk], context={'request': request}).data}
+            for pk, rating, rank in entries if pk in teams
+        ]
+        return Response({"region": region, "level": level, "total": total, "results": results})
+
+class TeamRankView(APIView):
+    """
+    팀의 전체/지역/수준별 순위 조회 뷰
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    
+    def get(self, request, pk):
+        team = get_object_or_404(Team, pk=pk)
+        return Response({
+            "team": team.pk,
+            "rating": team.rating,
+            "ranks": {
+                "overall": get_rank(team_board_key(), team.pk),
+                "region": get_rank(team_board_key(region=team.region), team.pk),
+                "level": get_rank(team_board_key(level=team.level), team.pk),
+                "region_level": get_rank(team_board_key(team.region, team.level), team.pk),
+            },
+        })
 
 class TeamUpdateView(generics.UpdateAPIView):
     permission_classes = [permissions.IsAuthenticated]
@@ -23,6 +23,7 @@ class User(AbstractUser):
     draws = models.IntegerField(_('무승부 수'), default=0)
     losses = models.IntegerField(_('패배 수'), default=0)
     bio = models.TextField(_('자기소개'), blank=True)
+    updated_at = models.DateTimeField(_('수정일'), auto_now=True)
     
     class Meta:
         verbose_name = _('사용자')
@@ -17,6 +17,15 @@ class UserSerializer(serializers.ModelSerializer):
                   'matches_played', 'wins', 'draws', 'losses', 'bio')
         read_only_fields = ('rating', 'matches_played', 'wins', 'draws', 'losses')
 
+class UserRankingSerializer(serializers.ModelSerializer):
+    """
+    리더보드용 사용자 공개 정보 시리얼라이저
+    """
+    class Meta:
+        model = User
+        fields = ('id', 'username', 'profile_image', 'skill_level', 'rating',
+                  'matches_played', 'wins', 'draws', 'losses')
+
 class UserRegistrationSerializer(serializers.ModelSerializer):
     """
     사용자 등록 시리얼라이저
@@ -170,4 +179,13 @@ class FriendshipCreateSerializer(serializers.ModelSerializer):
             status='PENDING'
         )
         
-        return friendship 
\ No newline at end of file
+        return friendship 
+
+
+class UserLeaderboardQuerySerializer(serializers.Serializer):
+    """
+    선수 리더보드 조회 조건 시리얼라이저
+    """
+    skill_level = serializers.ChoiceField(choices=User.SKILL_CHOICES, required=False)
+    limit = serializers.IntegerField(min_value=1, max_value=100, default=20)
+    offset = serializers.IntegerField(min_value=0, default=0)
@@ -0,0 +1,45 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+from matches.leaderboard import ranking_fields_changed, remove_rankings, update_user_rankings, user_board_keys
+from .models import User
+
+
+# 리더보드에 영향을 주는 필드
+USER_RANKING_FIELDS = ('skill_level', 'rating')
+
+
+@receiver(pre_save, sender=User)
+def remember_user_ranking(sender, instance, raw=False, using=None, update_fields=None, **kwargs):
+    """
+    리더보드 갱신 여부를 판단할 수 있도록 저장 전 실력 수준/레이팅을 기록
+    (로그인 시각만 저장하는 경우처럼 관련 없는 update_fields면 조회하지 않음)
+    """
+    instance._previous_ranking = None
+    if not raw and ranking_fields_changed(instance, USER_RANKING_FIELDS, update_fields):
+        instance._previous_ranking = sender.objects.using(using).filter(
+            pk=instance.pk
+        ).values_list(*USER_RANKING_FIELDS).first()
+
+
+@receiver(post_save, sender=User)
+def update_user_leaderboard(sender, instance, created=False, raw=False, using=None, **kwargs):
+    """
+    사용자 생성 또는 실력 수준/레이팅 변경 시 커밋 후 리더보드 갱신
+    """
+    previous = getattr(instance, '_previous_ranking', None)
+    current = tuple(getattr(instance, field) for field in USER_RANKING_FIELDS)
+    if raw or (not created and (previous is None or previous == current)):
+        return
+    stale = set(user_board_keys(previous[0])) - set(user_board_keys(current[0])) if previous else set()
+
+    def update():
+        remove_rankings(stale, instance.pk)
+        update_user_rankings([(instance.pk, *current)])
+    transaction.on_commit(update, using=using)
+
+
+@receiver(post_delete, sender=User)
+def remove_user_from_leaderboard(sender, instance, using=None, **kwargs):
+    keys, pk = user_board_keys(instance.skill_level), instance.pk
+    transaction.on_commit(lambda: remove_rankings(keys, pk), using=using)
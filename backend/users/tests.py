@@ -1,3 +1,76 @@
+from django.contrib.auth import get_user_model
+from django.db.models import F
 from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
 
-# Create your tests here.
+User = get_user_model()
+
+
+class UserConditionalGetTests(TestCase):
+    """
+    내 프로필, 사용자 상세(username/ID) 조회의 ETag 조건부 GET 검사
+    """
+    def setUp(self):
+        self.user = User.objects.create_user(username='viewer', password=None)
+        self.other = User.objects.create_user(username='striker', password=None)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def detail_urls(self):
+        return [
+            reverse('users:user_detail', args=[self.other.username]),
+            reverse('users:user_detail_by_id', args=[self.other.pk]),
+        ]
+
+    def assertEtagChanged(self, url, etag):
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_profile_matching_etag_returns_304_without_query(self):
+        url = reverse('users:profile')
+        etag = self.client.get(url)['ETag']
+        with self.assertNumQueries(0):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+
+    def test_profile_update_changes_etag(self):
+        url = reverse('users:profile')
+        etag = self.client.get(url)['ETag']
+        response = self.client.patch(reverse('users:profile_update'), {'bio': '왼발 윙어'}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEtagChanged(url, etag)
+
+    def test_detail_matching_etag_returns_304_with_one_query(self):
+        for url in self.detail_urls():
+            with self.subTest(url=url):
+                etag = self.client.get(url)['ETag']
+                with self.assertNumQueries(1):
+                    response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+                self.assertEqual(response.status_code, 304)
+                self.assertEqual(response['ETag'], etag)
+
+    def test_detail_profile_change_changes_etag(self):
+        etags = [self.client.get(url)['ETag'] for url in self.detail_urls()]
+        self.other.bio = '수비형 미드필더'
+        self.other.save()
+        for url, etag in zip(self.detail_urls(), etags):
+            with self.subTest(url=url):
+                self.assertEtagChanged(url, etag)
+
+    def test_detail_rating_change_changes_etag(self):
+        etags = [self.client.get(url)['ETag'] for url in self.detail_urls()]
+        # 경기 결과 반영과 같은 방식으로 레이팅과 수정일을 함께 갱신
+        User.objects.filter(pk=self.other.pk).update(rating=F('rating') - 16, updated_at=timezone.now())
+        for url, etag in zip(self.detail_urls(), etags):
+            with self.subTest(url=url):
+                self.assertEtagChanged(url, etag)
+
+    def test_missing_user_returns_404(self):
+        for url in (reverse('users:user_detail', args=['nobody']),
+                    reverse('users:user_detail_by_id', args=[self.other.pk + 100])):
+            with self.subTest(url=url):
+                self.assertEqual(self.client.get(url).status_code, 404)
@@ -19,10 +19,15 @@ urlpatterns = [
     # 사용자 검색 API
     path('search/', views.UserSearchView.as_view(), name='user_search'),
     
+    # 리더보드
+    path('leaderboard/', views.UserLeaderboardView.as_view(), name='user_leaderboard'),
+    
     # 사용자 ID로 프로필 조회
     path('<int:pk>/', views.UserDetailByIdView.as_view(), name='user_detail_by_id'),
     path('<int:pk>/teams/', views.UserTeamsView.as_view(), name='user_teams'),
     path('<int:pk>/matches/', views.UserMatchesView.as_view(), name='user_matches'),
+    path('<int:pk>/rating-history/', views.UserRatingHistoryView.as_view(), name='user_rating_history'),
+    path('<int:pk>/rank/', views.UserRankView.as_view(), name='user_rank'),
     
     # 친구 관련 URL
     path('friends/', views.FriendshipListView.as_view(), name='friend_list'),
@@ -1,4 +1,4 @@
-from django.shortcuts import render
+from django.shortcuts import render, get_object_or_404
 from rest_framework import generics, permissions, status, filters
 from rest_framework.response import Response
 from rest_framework.views import APIView
@@ -10,8 +10,13 @@ from .serializers import (
     UserProfileUpdateSerializer,
     PasswordChangeSerializer,
     FriendshipSerializer,
-    FriendshipCreateSerializer
+    FriendshipCreateSerializer,
+    UserRankingSerializer,
+    UserLeaderboardQuerySerializer
 )
+from config.conditional import ConditionalRetrieveMixin
+from matches.leaderboard import get_leaderboard, get_rank, user_board_key
+from matches.views import RatingHistoryView
 from .models import Friendship
 
 User = get_user_model()
@@ -35,7 +40,7 @@ class UserRegistrationView(generics.CreateAPIView):
             "user": UserSerializer(user, context=self.get_serializer_context()).data
         }, status=status.HTTP_201_CREATED)
 
-class UserProfileView(generics.RetrieveAPIView):
+class UserProfileView(ConditionalRetrieveMixin, generics.RetrieveAPIView):
     """
     사용자 프로필 조회 뷰
     """
@@ -44,6 +49,10 @@ class UserProfileView(generics.RetrieveAPIView):
     
     def get_object(self):
         return self.request.user
+    
+    def get_validators(self):
+        # 인증 과정에서 이미 읽어 온 사용자 정보를 그대로 사용 (추가 쿼리 없음)
+        return {'updated_at': self.request.user.updated_at}
 
 class UserProfileUpdateView(generics.UpdateAPIView):
     """
@@ -67,7 +76,7 @@ class UserProfileUpdateView(generics.UpdateAPIView):
             "user": UserSerializer(instance, context=self.get_serializer_context()).data
         })
 
-class UserDetailView(generics.RetrieveAPIView):
+class UserDetailView(ConditionalRetrieveMixin, generics.RetrieveAPIView):
     """
     다른 사용자 프로필 조회 뷰
     """
@@ -75,14 +84,20 @@ class UserDetailView(generics.RetrieveAPIView):
     serializer_class = UserSerializer
     permission_classes = [permissions.IsAuthenticated]
     lookup_field = 'username'
+    
+    def get_validators(self):
+        return User.objects.filter(username=self.kwargs['username']).values('updated_at').first()
 
-class UserDetailByIdView(generics.RetrieveAPIView):
+class UserDetailByIdView(ConditionalRetrieveMixin, generics.RetrieveAPIView):
     """
     사용자 ID로 프로필 조회 뷰
     """
     queryset = User.objects.all()
     serializer_class = UserSerializer
     permission_classes = [permissions.IsAuthenticated]
+    
+    def get_validators(self):
+        return User.objects.filter(pk=self.kwargs['pk']).values('updated_at').first()
 
 class UserTeamsView(generics.ListAPIView):
     """
@@ -140,6 +155,50 @@ class UserMatchesView(generics.ListAPIView):
         serializer = MatchSerializer(queryset, many=True, context={'request': request})
         return Response(serializer.data)
 
+class UserRatingHistoryView(RatingHistoryView):
+    """
+    사용자 레이팅 이력 조회 뷰
+    """
+    owner_model = User
+    owner_field = 'user'
+
+class UserLeaderboardView(APIView):
+    """
+    선수 리더보드 조회 뷰 (실력 수준별 레이팅 순위)
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    
+    def get(self, request):
+        serializer = UserLeaderboardQuerySerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        skill_level = serializer.validated_data.get('skill_level')
+        total, entries = get_leaderboard(user_board_key(skill_level), serializer.validated_data['limit'],
+                                         serializer.validated_data['offset'])
+        
+        users = User.objects.in_bulk([pk for pk, _, _ in entries])
+        results = [
+            {"rank": rank, "rating": rating, "user": UserRankingSerializer(users[pk], context={'request': request}).data}
+            for pk, rating, rank in entries if pk in users
+        ]
+        return Response({"skill_level": skill_level, "total": total, "results": results})
+
+class UserRankView(APIView):
+    """
+    선수의 전체/실력 수준별 순위 조회 뷰
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    
+    def get(self, request, pk):
+        user = get_object_or_404(User, pk=pk)
+        return Response({
+            "user": user.pk,
+            "rating": user.rating,
+            "ranks": {
+                "overall": get_rank(user_board_key(), user.pk),
+                "skill_level": get_rank(user_board_key(user.skill_level), user.pk),
+            },
+        })
+
 class PasswordChangeView(APIView):
     """
     비밀번호 변경 뷰
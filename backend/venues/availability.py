@@ -0,0 +1,176 @@
+"""
+구장 예약 현황(시간대별 예약/빈 시간) 계산
+
+하루 단위로 매치 시간 구간을 병합해 예약 구간을 만들고, 운영 시간에서
+예약 구간을 뺀 나머지를 빈 구간으로 계산합니다. 자정을 넘기는 매치는 다음 날
+0시부터 종료 시각까지도 예약 구간에 포함합니다. 결과는 (구장, 날짜)별로
+캐시합니다. 캐시 키에는 구장별 버전과 (구장, 날짜)별 버전이 함께 들어갑니다.
+매치가 바뀌면 invalidate_availability()로 해당 날짜의 버전만 올리고,
+운영 시간처럼 구장 자체가 바뀌면 구장별 버전을 올려 모든 날짜를 무효화합니다.
+키를 지우지 않고 버전을 올리므로, 변경이 커밋되기 전에 DB를 읽은 요청이 무효화 뒤에
+저장한 값은 더 이상 읽히지 않는 키에 남습니다.
+"""
+import time
+from datetime import timedelta
+from django.core.cache import cache
+
+MINUTES_PER_DAY = 24 * 60
+AVAILABILITY_CACHE_TIMEOUT = 60 * 60
+# 날짜별 버전은 만료되어도 새 값으로 다시 시작하므로 (이전 키는 다시 읽히지 않음) 하루만 유지
+AVAILABILITY_DAY_VERSION_TIMEOUT = 24 * 60 * 60
+MAX_AVAILABILITY_DAYS = 31
+
+
+def to_minutes(value):
+    return value.hour * 60 + value.minute
+
+
+def format_minutes(minutes):
+    # 자정까지 운영하는 경우 24:00으로 표시
+    return f'{minutes // 60:02d}:{minutes % 60:02d}'
+
+
+def merge_intervals(intervals):
+    """
+    (시작, 끝, 매치 id) 구간들을 정렬해 겹치거나 맞닿은 구간끼리 병합
+    """
+    merged = []
+    for start, end, match_id in sorted(intervals):
+        if merged and start <= merged[-1]['end']:
+            merged[-1]['end'] = max(merged[-1]['end'], end)
+            merged[-1]['match_ids'].append(match_id)
+        else:
+            merged.append({'start': start, 'end': end, 'match_ids': [match_id]})
+    return merged
+
+
+def build_day(venue, day, intervals):
+    """
+    하루치 예약 구간과 빈 구간 계산 (시간은 자정 기준 분 단위로 처리)
+    """
+    opening = to_minutes(venue.opening_time)
+    closing = to_minutes(venue.closing_time)
+    if closing <= opening:
+        closing = MINUTES_PER_DAY
+
+    booked = merge_intervals(intervals)
+    free = []
+    cursor = opening
+    for block in booked:
+        if block['start'] > cursor:
+            free.append({'start': cursor, 'end': min(block['start'], closing)})
+        cursor = max(cursor, block['end'])
+        if cursor >= closing:
+            break
+    if cursor < closing:
+        free.append({'start': cursor, 'end': closing})
+
+    def render(blocks):
+        return [dict(block, start=format_minutes(block['start']), end=format_minutes(block['end']))
+                for block in blocks if block['end'] > block['start']]
+
+    return {
+        'date': day.isoformat(),
+        'opening_time': format_minutes(opening),
+        'closing_time': format_minutes(closing),
+        'booked': render(booked),
+        'free': render(free),
+    }
+
+
+def get_availability_version(venue_id):
+    key = f'venues:availability:{venue_id}:version'
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, time.time_ns(), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def bump_availability_version(venue_id):
+    """
+    구장의 모든 날짜 예약 현황 캐시 무효화
+    """
+    key = f'venues:availability:{venue_id}:version'
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, time.time_ns(), timeout=None)
+
+
+def day_version_key(venue_id, day):
+    return f'venues:availability:{venue_id}:{day.isoformat()}:version'
+
+
+def get_day_versions(venue_id, days):
+    """
+    날짜별 버전을 한 번에 조회 (없는 날짜는 새로 추가)
+    """
+    keys = {day: day_version_key(venue_id, day) for day in days}
+    versions = cache.get_many(list(keys.values()))
+    missing = [key for key in keys.values() if key not in versions]
+    if missing:
+        for key in missing:
+            cache.add(key, time.time_ns(), timeout=AVAILABILITY_DAY_VERSION_TIMEOUT)
+        versions.update(cache.get_many(missing))
+    return {day: versions.get(key) for day, key in keys.items()}
+
+
+def availability_cache_keys(venue_id, days):
+    version = get_availability_version(venue_id)
+    day_versions = get_day_versions(venue_id, days)
+    return {
+        day: f'venues:availability:{venue_id}:v{version}:{day.isoformat()}:v{day_versions[day]}'
+        for day in days
+    }
+
+
+def get_availability(venue, date_from, date_to):
+    """
+    date_from ~ date_to(포함) 날짜별 예약 현황
+
+    캐시에 없는 날짜만 모아 매치 테이블을 범위 쿼리 한 번으로 조회합니다.
+    """
+    from matches.models import Match
+
+    days = [date_from + timedelta(days=offset) for offset in range((date_to - date_from).days + 1)]
+    keys = availability_cache_keys(venue.pk, days)
+    cached = cache.get_many(list(keys.values()))
+    missing = [day for day in days if keys[day] not in cached]
+
+    if missing:
+        intervals = {day: [] for day in missing}
+        # 전날 시작해 자정을 넘기는 매치도 포함하도록 하루 앞부터 조회
+        rows = Match.objects.filter(
+            venue=venue, date__range=(missing[0] - timedelta(days=1), missing[-1])
+        ).exclude(status='CANCELED').values_list('id', 'date', 'start_time', 'end_time')
+        for match_id, day, start_time, end_time in rows:
+            start = to_minutes(start_time)
+            end = to_minutes(end_time)
+            if end <= start:
+                # 자정을 넘기는 매치는 당일 자정까지, 다음 날 0시부터 종료 시각까지로 나눔
+                following = day + timedelta(days=1)
+                if following in intervals and end > 0:
+                    intervals[following].append((0, end, match_id))
+                end = MINUTES_PER_DAY
+            if day in intervals:
+                intervals[day].append((start, end, match_id))
+
+        computed = {keys[day]: build_day(venue, day, intervals[day]) for day in missing}
+        cache.set_many(computed, AVAILABILITY_CACHE_TIMEOUT)
+        cached.update(computed)
+
+    return [cached[keys[day]] for day in days]
+
+
+def invalidate_availability(venue_id, days):
+    """
+    해당 구장의 지정한 날짜 버전만 올려 예약 현황 캐시 무효화 (자정을 넘긴 매치가 걸치는 다음 날 포함)
+    """
+    days = set(days) | {day + timedelta(days=1) for day in days}
+    for day in days:
+        key = day_version_key(venue_id, day)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, time.time_ns(), timeout=AVAILABILITY_DAY_VERSION_TIMEOUT)
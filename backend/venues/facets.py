@@ -0,0 +1,90 @@
+"""
+구장 검색 패싯(표면/크기/편의시설별 개수)
+
+검색 조건에 맞는 구장 집합에서 패싯 값별 개수를 조건부 집계(COUNT ... FILTER) 쿼리 한 번으로
+계산합니다. 각 패싯의 개수에는 그 패싯 자신의 조건을 빼고 나머지 조건만 적용하므로
+(예: 표면을 GRASS로 고른 상태에서도 다른 표면의 개수가 보임) 화면에서 바로 조건을 바꿔 볼 수 있습니다.
+
+결과는 검색 조건 시그니처별로 캐시하고, 구장이 바뀌면 공간 인덱스 버전이 올라가
+이전 캐시는 더 이상 사용되지 않습니다.
+"""
+import hashlib
+import json
+from django.core.cache import cache
+from django.db.models import Count, Q
+from .geo import filter_within_radius
+from .models import Venue
+from .spatial import AMENITY_FLAGS, get_spatial_version
+
+FACET_CACHE_TIMEOUT = 5 * 60
+
+BOOLEAN_CHOICES = [(True, '있음'), (False, '없음')]
+
+FACET_CHOICES = {
+    'surface_type': Venue.SURFACE_CHOICES,
+    'size': Venue.SIZE_CHOICES,
+    **{field: BOOLEAN_CHOICES for field in AMENITY_FLAGS},
+}
+
+
+def facet_conditions(params):
+    """
+    검색 조건 중 패싯에 해당하는 {필드: Q} (편의시설은 필요(True)로 지정한 경우만)
+    """
+    conditions = {}
+    for field in ('surface_type', 'size'):
+        if params.get(field):
+            conditions[field] = Q(**{field: params[field]})
+    for field in AMENITY_FLAGS:
+        if params.get(field):
+            conditions[field] = Q(**{field: True})
+    return conditions
+
+
+def facet_cache_key(params):
+    # 반경이 없으면 위치와 관계없이 전체 구장 기준이므로 좌표를 키에서 제외
+    signature = {field: params.get(field) for field in ('surface_type', 'size', *AMENITY_FLAGS)}
+    if params.get('radius_km') is not None:
+        signature.update(lat=params['lat'], lng=params['lng'], radius_km=params['radius_km'])
+    digest = hashlib.sha1(json.dumps(signature, sort_keys=True).encode()).hexdigest()
+    return f'venues:facets:v{get_spatial_version()}:{digest}'
+
+
+def compute_facets(params):
+    """
+    {패싯: [{'value', 'label', 'count'}, ...]} 계산 (집계 쿼리 한 번)
+
+    반경(radius_km)이 있으면 반경 안의 구장, 없으면 좌표가 있는 전체 구장을 기준으로 셉니다.
+    """
+    queryset = Venue.objects.filter(latitude__isnull=False, longitude__isnull=False)
+    if params.get('radius_km') is not None:
+        queryset = filter_within_radius(queryset, params['lat'], params['lng'], params['radius_km'])
+
+    conditions = facet_conditions(params)
+    aggregates = {}
+    for field, choices in FACET_CHOICES.items():
+        # 자기 자신을 제외한 나머지 패싯 조건
+        others = Q(*[condition for other, condition in conditions.items() if other != field])
+        for position, (value, _) in enumerate(choices):
+            aggregates[f'{field}_{position}'] = Count('pk', filter=others & Q(**{field: value}))
+    counts = queryset.aggregate(**aggregates)
+
+    return {
+        field: [
+            {'value': value, 'label': str(label), 'count': counts[f'{field}_{position}']}
+            for position, (value, label) in enumerate(choices)
+        ]
+        for field, choices in FACET_CHOICES.items()
+    }
+
+
+def get_facets(params):
+    """
+    검색 조건 시그니처별로 캐시한 패싯 개수
+    """
+    key = facet_cache_key(params)
+    facets = cache.get(key)
+    if facets is None:
+        facets = compute_facets(params)
+        cache.set(key, facets, FACET_CACHE_TIMEOUT)
+    return facets
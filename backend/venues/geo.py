@@ -0,0 +1,114 @@
+"""
+구장 위치 검색 유틸리티
+
+위도/경도를 GRID_SIZE_DEG 크기의 격자로 나눈 셀 번호(grid_cell)를 구장에 저장해
+반경 검색 시 인덱스로 후보 구장을 먼저 좁히고, 정확한 하버사인 거리는
+그 후보에 대해서만 계산합니다. 셀 번호는 행 우선(row-major)이라
+바운딩 박스의 한 행은 연속된 번호 구간(range)이 됩니다.
+"""
+import math
+from django.db.models import F, FloatField, Q
+from django.db.models.functions import ASin, Cos, Power, Radians, Sin, Sqrt
+
+EARTH_RADIUS_KM = 6371.0088
+GRID_SIZE_DEG = 0.05  # 위도 기준 약 5.5km
+GRID_COLUMNS = int(round(360 / GRID_SIZE_DEG))
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180
+
+MAX_RADIUS_KM = 200.0
+DEFAULT_RADIUS_KM = 5.0
+
+
+def grid_cell(latitude, longitude):
+    """
+    위도/경도가 속한 격자 셀 번호 (좌표가 없으면 None)
+    """
+    if latitude is None or longitude is None:
+        return None
+    row = int(math.floor((min(max(latitude, -90.0), 90.0) + 90.0) / GRID_SIZE_DEG))
+    column = int(math.floor((min(max(longitude, -180.0), 180.0) + 180.0) / GRID_SIZE_DEG))
+    return row * GRID_COLUMNS + min(column, GRID_COLUMNS - 1)
+
+
+def bounding_box(latitude, longitude, radius_km):
+    """
+    중심점에서 radius_km 반경을 감싸는 (최소 위도, 최대 위도, 최소 경도, 최대 경도)
+
+    날짜 변경선(경도 ±180)을 넘는 경우는 고려하지 않고 범위를 잘라냅니다.
+    """
+    delta_lat = radius_km / KM_PER_DEGREE
+    cos_lat = math.cos(math.radians(latitude))
+    delta_lng = 180.0 if cos_lat < 1e-6 else min(180.0, delta_lat / cos_lat)
+    return (
+        max(-90.0, latitude - delta_lat),
+        min(90.0, latitude + delta_lat),
+        max(-180.0, longitude - delta_lng),
+        min(180.0, longitude + delta_lng),
+    )
+
+
+def grid_cell_ranges(bbox):
+    """
+    바운딩 박스를 덮는 격자 셀 번호 구간 목록 (격자 한 행당 한 구간)
+    """
+    min_lat, max_lat, min_lng, max_lng = bbox
+    first = grid_cell(min_lat, min_lng)
+    last = grid_cell(max_lat, max_lng)
+    first_row, first_column = divmod(first, GRID_COLUMNS)
+    last_row, last_column = divmod(last, GRID_COLUMNS)
+    return [
+        (row * GRID_COLUMNS + first_column, row * GRID_COLUMNS + last_column)
+        for row in range(first_row, last_row + 1)
+    ]
+
+
+def haversine_km(lat1, lng1, lat2, lng2):
+    """
+    두 좌표 사이의 대원 거리(km)
+    """
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    d_phi = phi2 - phi1
+    d_lambda = math.radians(lng2 - lng1)
+    a = math.sin(d_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def haversine_expression(latitude, longitude, prefix=''):
+    """
+    DB에서 계산하는 하버사인 거리(km) 표현식
+    """
+    lat_field = Radians(F(f'{prefix}latitude'))
+    lng_field = Radians(F(f'{prefix}longitude'))
+    lat0 = math.radians(latitude)
+    lng0 = math.radians(longitude)
+    a = (
+        Power(Sin((lat_field - lat0) / 2), 2) +
+        math.cos(lat0) * Cos(lat_field) * Power(Sin((lng_field - lng0) / 2), 2)
+    )
+    return 2 * EARTH_RADIUS_KM * ASin(Sqrt(a), output_field=FloatField())
+
+
+def filter_within_radius(queryset, latitude, longitude, radius_km, prefix=''):
+    """
+    반경 radius_km 안의 행만 남기고 distance(km)를 annotate
+
+    1) 격자 셀 구간(인덱스) → 2) 위도/경도 바운딩 박스 → 3) 하버사인 거리 순으로
+    좁혀 가므로 정확한 거리 계산은 후보 행에 대해서만 수행됩니다.
+    prefix는 Match처럼 구장을 FK로 참조할 때 'venue__'를 넘깁니다.
+    """
+    bbox = bounding_box(latitude, longitude, radius_km)
+    min_lat, max_lat, min_lng, max_lng = bbox
+
+    cells = Q()
+    for start, end in grid_cell_ranges(bbox):
+        cells |= Q(**{f'{prefix}grid_cell__range': (start, end)})
+
+    return queryset.filter(
+        cells,
+        **{
+            f'{prefix}latitude__range': (min_lat, max_lat),
+            f'{prefix}longitude__range': (min_lng, max_lng),
+        }
+    ).annotate(
+        distance=haversine_expression(latitude, longitude, prefix)
+    ).filter(distance__lte=radius_km)
@@ -0,0 +1,59 @@
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import date, timedelta
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Max, Min
+from django.utils import timezone
+from matches.models import Match
+from venues.stats import refresh_daily_stats
+
+
+class Command(BaseCommand):
+    """
+    구장 일간 통계 전체 이력을 날짜 구간별로 나눠 병렬로 다시 집계하는 명령
+
+    구간마다 집계 쿼리 2번과 upsert 한 번으로 처리하며, 각 스레드는 자신의 DB 커넥션을 사용합니다.
+    기간을 지정하지 않으면 첫 매치 날짜부터 마지막 매치 날짜(최대 오늘)까지 처리합니다.
+    """
+    help = '구장 일간 통계를 날짜 구간별로 병렬 백필합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--date-from', type=date.fromisoformat, help='시작일 (YYYY-MM-DD)')
+        parser.add_argument('--date-to', type=date.fromisoformat, help='종료일 (YYYY-MM-DD, 포함)')
+        parser.add_argument('--chunk-days', type=int, default=30, help='한 작업이 처리할 일 수')
+        parser.add_argument('--workers', type=int, default=4, help='동시 실행 스레드 수')
+
+    def handle(self, *args, **options):
+        bounds = Match.objects.aggregate(first=Min('date'), last=Max('date'))
+        date_from = options['date_from'] or bounds['first']
+        date_to = options['date_to'] or min(bounds['last'] or timezone.localdate(), timezone.localdate())
+        if date_from is None:
+            self.stdout.write('집계할 매치가 없습니다.')
+            return
+        if date_to < date_from:
+            raise CommandError('--date-to는 --date-from 이후여야 합니다.')
+
+        chunks = []
+        start = date_from
+        while start <= date_to:
+            end = min(start + timedelta(days=options['chunk_days'] - 1), date_to)
+            chunks.append((start, end))
+            start = end + timedelta(days=1)
+
+        def refresh(chunk):
+            try:
+                return chunk, refresh_daily_stats(*chunk)
+            finally:
+                connection.close()
+
+        started = time.perf_counter()
+        total = 0
+        with ThreadPoolExecutor(max_workers=options['workers']) as executor:
+            for future in as_completed([executor.submit(refresh, chunk) for chunk in chunks]):
+                (chunk_from, chunk_to), count = future.result()
+                total += count
+                self.stdout.write(f'{chunk_from} ~ {chunk_to}: {count}건')
+        self.stdout.write(self.style.SUCCESS(
+            f'{date_from} ~ {date_to} 구간 {len(chunks)}개, {total}건 집계 ({time.perf_counter() - started:.1f}초)'
+        ))
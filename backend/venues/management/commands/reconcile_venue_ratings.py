@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+from venues.ratings import find_drifted_venues, reconcile_venue_ratings
+
+
+class Command(BaseCommand):
+    """
+    구장 평점 집계(rating_sum, review_count)를 리뷰 테이블과 비교해 차이가 있는 구장만 바로잡는 명령
+    """
+    help = '구장 평점 집계와 실제 리뷰의 차이를 찾아 보정합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000, help='UPDATE 한 번에 처리할 구장 수')
+        parser.add_argument('--dry-run', action='store_true', help='보정하지 않고 차이만 출력')
+
+    def handle(self, *args, **options):
+        drifted = find_drifted_venues()
+        for pk, rating_sum, review_count, actual_sum, actual_count in drifted:
+            self.stdout.write(f'구장 #{pk}: 합계 {rating_sum} → {actual_sum}, 리뷰 수 {review_count} → {actual_count}')
+        if not drifted:
+            self.stdout.write(self.style.SUCCESS('차이가 있는 구장이 없습니다.'))
+            return
+        if options['dry_run']:
+            self.stdout.write(f'{len(drifted)}개 구장에 차이가 있습니다. (dry-run)')
+            return
+        updated = reconcile_venue_ratings([row[0] for row in drifted], options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'{updated}개 구장의 평점 집계를 보정했습니다.'))
@@ -0,0 +1,29 @@
+# Generated by Django 4.2.7 on 2026-10-18 13:41
+
+from django.db import migrations, models
+
+
+def backfill_grid_cell(apps, schema_editor):
+    from venues.geo import grid_cell
+
+    Venue = apps.get_model('venues', 'Venue')
+    venues = list(Venue.objects.exclude(latitude=None).exclude(longitude=None))
+    for venue in venues:
+        venue.grid_cell = grid_cell(venue.latitude, venue.longitude)
+    Venue.objects.bulk_update(venues, ['grid_cell'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('venues', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='venue',
+            name='grid_cell',
+            field=models.BigIntegerField(blank=True, db_index=True, editable=False, null=True, verbose_name='격자 셀'),
+        ),
+        migrations.RunPython(backfill_grid_cell, migrations.RunPython.noop),
+    ]
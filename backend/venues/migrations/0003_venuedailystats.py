@@ -0,0 +1,40 @@
+# Generated by Django 4.2.7 on 2026-10-18 14:13
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('venues', '0002_venue_grid_cell'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='VenueDailyStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(verbose_name='날짜')),
+                ('matches_count', models.PositiveIntegerField(default=0, verbose_name='매치 수')),
+                ('canceled_count', models.PositiveIntegerField(default=0, verbose_name='취소 매치 수')),
+                ('capacity', models.PositiveIntegerField(default=0, verbose_name='정원 합계')),
+                ('registrations', models.PositiveIntegerField(default=0, verbose_name='참가 인원')),
+                ('attended', models.PositiveIntegerField(default=0, verbose_name='참석 인원')),
+                ('noshows', models.PositiveIntegerField(default=0, verbose_name='불참 인원')),
+                ('revenue', models.DecimalField(decimal_places=2, default=0, max_digits=14, verbose_name='매출')),
+                ('refreshed_at', models.DateTimeField(auto_now=True, verbose_name='집계일')),
+                ('venue', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_stats', to='venues.venue')),
+            ],
+            options={
+                'verbose_name': '구장 일간 통계',
+                'verbose_name_plural': '구장 일간 통계들',
+                'ordering': ['date', 'venue'],
+                'indexes': [models.Index(fields=['date'], name='venue_daily_stats_date_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='venuedailystats',
+            constraint=models.UniqueConstraint(fields=('venue', 'date'), name='venue_daily_stats_unique'),
+        ),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 4.2.7 on 2026-10-18 14:25
+
+from django.db import migrations, models
+import django.db.models.expressions
+import django.db.models.functions.comparison
+
+
+def backfill_rating_aggregates(apps, schema_editor):
+    Venue = apps.get_model('venues', 'Venue')
+    VenueReview = apps.get_model('venues', 'VenueReview')
+    reviews = VenueReview.objects.filter(venue=models.OuterRef('pk')).order_by().values('venue')
+    Venue.objects.update(
+        rating_sum=django.db.models.functions.comparison.Coalesce(
+            models.Subquery(reviews.annotate(total=models.Sum('rating')).values('total')), 0
+        ),
+        review_count=django.db.models.functions.comparison.Coalesce(
+            models.Subquery(reviews.annotate(total=models.Count('pk')).values('total')), 0
+        ),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('venues', '0003_venuedailystats'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='venue',
+            name='rating_sum',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='평점 합계'),
+        ),
+        migrations.AddField(
+            model_name='venue',
+            name='review_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='리뷰 수'),
+        ),
+        migrations.AddIndex(
+            model_name='venue',
+            index=models.Index(models.OrderBy(django.db.models.functions.comparison.Coalesce(django.db.models.expressions.CombinedExpression(django.db.models.functions.comparison.Cast(models.F('rating_sum'), models.FloatField()), '/', django.db.models.functions.comparison.NullIf(models.F('review_count'), 0)), models.Value(0.0)), descending=True), models.OrderBy(models.F('id'), descending=True), name='venue_rating_idx'),
+        ),
+        migrations.RunPython(backfill_rating_aggregates, migrations.RunPython.noop),
+    ]
@@ -1,5 +1,17 @@
 from django.db import models
+from django.db.models import F, FloatField, Value
+from django.db.models.functions import Cast, Coalesce, NullIf
 from django.utils.translation import gettext_lazy as _
+from .geo import grid_cell
+
+
+def average_rating_expression():
+    """
+    리뷰 평균 평점 표현식 (리뷰가 없으면 0)
+
+    venue_rating_idx 인덱스와 같은 식이어야 정렬에 인덱스를 사용합니다.
+    """
+    return Coalesce(Cast(F('rating_sum'), FloatField()) / NullIf(F('review_count'), 0), Value(0.0))
 
 class Venue(models.Model):
     """
@@ -22,6 +34,7 @@ class Venue(models.Model):
     address = models.CharField(_('주소'), max_length=255)
     latitude = models.FloatField(_('위도'), null=True, blank=True)
     longitude = models.FloatField(_('경도'), null=True, blank=True)
+    grid_cell = models.BigIntegerField(_('격자 셀'), null=True, blank=True, editable=False, db_index=True)
     description = models.TextField(_('설명'), blank=True)
     surface_type = models.CharField(_('구장 표면'), max_length=20, choices=SURFACE_CHOICES)
     size = models.CharField(_('구장 크기'), max_length=2, choices=SIZE_CHOICES)
@@ -32,15 +45,37 @@ class Venue(models.Model):
     has_parking = models.BooleanField(_('주차 가능 여부'), default=False)
     has_shower = models.BooleanField(_('샤워 시설 여부'), default=False)
     has_locker = models.BooleanField(_('락커 여부'), default=False)
+    # 리뷰 평점 집계 (리뷰 생성/수정/삭제 시그널이 F 표현식으로 갱신, reconcile_venue_ratings로 보정)
+    rating_sum = models.PositiveIntegerField(_('평점 합계'), default=0, editable=False)
+    review_count = models.PositiveIntegerField(_('리뷰 수'), default=0, editable=False)
     created_at = models.DateTimeField(_('생성일'), auto_now_add=True)
     updated_at = models.DateTimeField(_('수정일'), auto_now=True)
     
     class Meta:
         verbose_name = _('구장')
         verbose_name_plural = _('구장들')
+        indexes = [
+            # 평균 평점 순 정렬
+            models.Index(average_rating_expression().desc(), F('id').desc(), name='venue_rating_idx'),
+        ]
         
     def __str__(self):
         return self.name
+    
+    @property
+    def average_rating(self):
+        """평균 평점 (리뷰가 없으면 0)"""
+        if not self.review_count:
+            return 0
+        return self.rating_sum / self.review_count
+    
+    def save(self, *args, **kwargs):
+        # 반경 검색용 격자 셀 번호를 위치와 함께 갱신
+        self.grid_cell = grid_cell(self.latitude, self.longitude)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and {'latitude', 'longitude'} & set(update_fields):
+            kwargs['update_fields'] = set(update_fields) | {'grid_cell'}
+        super().save(*args, **kwargs)
 
 class VenueImage(models.Model):
     """
@@ -76,3 +111,48 @@ class VenueReview(models.Model):
         
     def __str__(self):
         return f"{self.venue.name} - {self.user.username} - {self.rating}점"
+
+class VenueDailyStats(models.Model):
+    """
+    구장별 일간 운영 통계 (venues.stats에서 집계해 저장)
+    """
+    venue = models.ForeignKey(Venue, on_delete=models.CASCADE, related_name='daily_stats')
+    date = models.DateField(_('날짜'))
+    matches_count = models.PositiveIntegerField(_('매치 수'), default=0)
+    canceled_count = models.PositiveIntegerField(_('취소 매치 수'), default=0)
+    capacity = models.PositiveIntegerField(_('정원 합계'), default=0)
+    registrations = models.PositiveIntegerField(_('참가 인원'), default=0)
+    attended = models.PositiveIntegerField(_('참석 인원'), default=0)
+    noshows = models.PositiveIntegerField(_('불참 인원'), default=0)
+    revenue = models.DecimalField(_('매출'), max_digits=14, decimal_places=2, default=0)  # 참가비 × 참가 인원
+    refreshed_at = models.DateTimeField(_('집계일'), auto_now=True)
+    
+    class Meta:
+        verbose_name = _('구장 일간 통계')
+        verbose_name_plural = _('구장 일간 통계들')
+        ordering = ['date', 'venue']
+        constraints = [
+            models.UniqueConstraint(fields=['venue', 'date'], name='venue_daily_stats_unique'),
+        ]
+        indexes = [
+            # 전체 구장 기간 조회
+            models.Index(fields=['date'], name='venue_daily_stats_date_idx'),
+        ]
+        
+    def __str__(self):
+        return f"{self.venue.name} - {self.date}"
+    
+    @property
+    def fill_rate(self):
+        """정원 대비 참가율"""
+        if self.capacity == 0:
+            return 0
+        return self.registrations / self.capacity
+    
+    @property
+    def noshow_rate(self):
+        """출석 체크된 인원 중 불참 비율"""
+        checked = self.attended + self.noshows
+        if checked == 0:
+            return 0
+        return self.noshows / checked
@@ -0,0 +1,61 @@
+"""
+구장 리뷰 평점 집계 (Venue.rating_sum, Venue.review_count)
+
+리뷰가 생성/수정/삭제될 때 시그널이 adjust_venue_rating()으로 변화량만 F 표현식으로 더하므로
+목록/상세 조회에서 리뷰 테이블을 읽지 않고 평균을 계산할 수 있습니다.
+update()/bulk_create처럼 시그널을 거치지 않는 변경으로 생긴 차이는
+reconcile_venue_ratings(관리 명령 reconcile_venue_ratings)로 바로잡습니다.
+"""
+from django.db.models import Count, F, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+from .models import Venue, VenueReview
+
+
+def adjust_venue_rating(venue_id, rating_delta, count_delta, using='default'):
+    """
+    구장 평점 합계/리뷰 수에 변화량을 더함 (UPDATE 한 번)
+    """
+    Venue.objects.using(using).filter(pk=venue_id).update(
+        rating_sum=F('rating_sum') + rating_delta,
+        review_count=F('review_count') + count_delta,
+        updated_at=timezone.now(),
+    )
+
+
+def actual_rating_aggregates():
+    """
+    리뷰 테이블에서 다시 계산한 (평점 합계, 리뷰 수) 서브쿼리
+    """
+    reviews = VenueReview.objects.filter(venue=OuterRef('pk')).order_by().values('venue')
+    return (
+        Coalesce(Subquery(reviews.annotate(total=Sum('rating')).values('total')), 0),
+        Coalesce(Subquery(reviews.annotate(total=Count('pk')).values('total')), 0),
+    )
+
+
+def find_drifted_venues():
+    """
+    집계 컬럼이 실제 리뷰와 다른 구장의 (id, 저장된 합계, 저장된 수, 실제 합계, 실제 수) 목록
+    """
+    actual_sum, actual_count = actual_rating_aggregates()
+    return list(Venue.objects.annotate(
+        actual_sum=actual_sum, actual_count=actual_count,
+    ).exclude(
+        rating_sum=F('actual_sum'), review_count=F('actual_count'),
+    ).order_by('pk').values_list('pk', 'rating_sum', 'review_count', 'actual_sum', 'actual_count'))
+
+
+def reconcile_venue_ratings(venue_ids, batch_size=1000):
+    """
+    지정한 구장의 집계를 리뷰 테이블 기준으로 다시 계산해 저장하고 갱신한 행 수를 반환
+
+    UPDATE 문 안에서 서브쿼리로 다시 계산하므로 확인 이후 추가된 리뷰도 반영됩니다.
+    """
+    actual_sum, actual_count = actual_rating_aggregates()
+    updated = 0
+    for start in range(0, len(venue_ids), batch_size):
+        updated += Venue.objects.filter(pk__in=venue_ids[start:start + batch_size]).update(
+            rating_sum=actual_sum, review_count=actual_count, updated_at=timezone.now(),
+        )
+    return updated
@@ -1,5 +1,9 @@
+from datetime import timedelta
+from django.utils import timezone
 from rest_framework import serializers
-from .models import Venue, VenueImage, VenueReview
+from .availability import MAX_AVAILABILITY_DAYS
+from .geo import MAX_RADIUS_KM
+from .models import Venue, VenueDailyStats, VenueImage, VenueReview
 
 class VenueImageSerializer(serializers.ModelSerializer):
     """
@@ -38,38 +42,98 @@ class VenueSerializer(serializers.ModelSerializer):
     """
     images = VenueImageSerializer(many=True, read_only=True)
     reviews = VenueReviewSerializer(many=True, read_only=True)
-    average_rating = serializers.SerializerMethodField()
+    average_rating = serializers.FloatField(read_only=True)
     
     class Meta:
         model = Venue
         fields = ('id', 'name', 'address', 'latitude', 'longitude', 'description',
                   'surface_type', 'size', 'image', 'hourly_rate', 'opening_time',
                   'closing_time', 'has_parking', 'has_shower', 'has_locker',
-                  'images', 'reviews', 'average_rating')
-    
-    def get_average_rating(self, obj):
-        reviews = obj.reviews.all()
-        if not reviews:
-            return 0
-        return sum(review.rating for review in reviews) / len(reviews)
+                  'images', 'reviews', 'average_rating', 'review_count')
 
 class VenueListSerializer(serializers.ModelSerializer):
     """
-    구장 목록 시리얼라이저 (간략한 정보)
+    구장 목록 시리얼라이저 (간략한 정보, 평점은 Venue의 집계 컬럼 사용)
     """
-    average_rating = serializers.SerializerMethodField()
-    review_count = serializers.SerializerMethodField()
+    average_rating = serializers.FloatField(read_only=True)
     
     class Meta:
         model = Venue
         fields = ('id', 'name', 'address', 'surface_type', 'size', 'image',
                   'hourly_rate', 'average_rating', 'review_count')
+
+class VenueSearchResultSerializer(VenueListSerializer):
+    """
+    구장 위치 검색 결과 시리얼라이저 (검색 위치로부터 거리 포함)
+    """
+    distance_km = serializers.FloatField(read_only=True)
+    
+    class Meta(VenueListSerializer.Meta):
+        fields = VenueListSerializer.Meta.fields + ('latitude', 'longitude', 'distance_km')
+
+MAX_VENUE_SEARCH_RESULTS = 100
+
+class VenueSearchQuerySerializer(serializers.Serializer):
+    """
+    구장 위치 검색 조건 시리얼라이저
+
+    radius_km가 없으면 최근접 k개, 있으면 반경 안에서 가까운 순으로 최대 k개를 찾습니다.
+    """
+    lat = serializers.FloatField(min_value=-90, max_value=90)
+    lng = serializers.FloatField(min_value=-180, max_value=180)
+    k = serializers.IntegerField(min_value=1, max_value=MAX_VENUE_SEARCH_RESULTS, default=10)
+    radius_km = serializers.FloatField(min_value=0, max_value=MAX_RADIUS_KM, required=False)
+    surface_type = serializers.ChoiceField(choices=Venue.SURFACE_CHOICES, required=False)
+    size = serializers.ChoiceField(choices=Venue.SIZE_CHOICES, required=False)
+    has_parking = serializers.BooleanField(default=False)
+    has_shower = serializers.BooleanField(default=False)
+    has_locker = serializers.BooleanField(default=False)
+
+class VenueAvailabilityQuerySerializer(serializers.Serializer):
+    """
+    구장 예약 현황 조회 기간 시리얼라이저
+    """
+    date_from = serializers.DateField(required=False)
+    date_to = serializers.DateField(required=False)
     
-    def get_average_rating(self, obj):
-        reviews = obj.reviews.all()
-        if not reviews:
-            return 0
-        return sum(review.rating for review in reviews) / len(reviews)
+    def validate(self, data):
+        date_from = data.get('date_from') or timezone.localdate()
+        date_to = data.get('date_to') or date_from + timedelta(days=6)
+        if date_to < date_from:
+            raise serializers.ValidationError("date_to는 date_from 이후여야 합니다.")
+        if (date_to - date_from).days >= MAX_AVAILABILITY_DAYS:
+            raise serializers.ValidationError(f"최대 {MAX_AVAILABILITY_DAYS}일까지 조회할 수 있습니다.")
+        return {'date_from': date_from, 'date_to': date_to}
+
+MAX_STATS_DAYS = 366
+
+class VenueDailyStatsSerializer(serializers.ModelSerializer):
+    """
+    구장 일간 통계 시리얼라이저
+    """
+    venue_name = serializers.CharField(source='venue.name', read_only=True)
+    fill_rate = serializers.FloatField(read_only=True)
+    noshow_rate = serializers.FloatField(read_only=True)
+    
+    class Meta:
+        model = VenueDailyStats
+        fields = ('venue', 'venue_name', 'date', 'matches_count', 'canceled_count', 'capacity',
+                  'registrations', 'attended', 'noshows', 'revenue', 'fill_rate', 'noshow_rate',
+                  'refreshed_at')
+
+class VenueStatsQuerySerializer(serializers.Serializer):
+    """
+    구장 일간 통계 조회 조건 시리얼라이저 (기본 최근 30일)
+    """
+    venue = serializers.IntegerField(required=False)
+    date_from = serializers.DateField(required=False)
+    date_to = serializers.DateField(required=False)
     
-    def get_review_count(self, obj):
-        return obj.reviews.count() 
\ No newline at end of file
+    def validate(self, data):
+        date_to = data.get('date_to') or timezone.localdate()
+        date_from = data.get('date_from') or date_to - timedelta(days=29)
+        if date_to < date_from:
+            raise serializers.ValidationError("date_to는 date_from 이후여야 합니다.")
+        if (date_to - date_from).days >= MAX_STATS_DAYS:
+            raise serializers.ValidationError(f"최대 {MAX_STATS_DAYS}일까지 조회할 수 있습니다.")
+        return dict(data, date_from=date_from, date_to=date_to)
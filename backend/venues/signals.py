@@ -0,0 +1,99 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+from matches.cache import bump_feed_version
+from matches.models import Match
+from matches.search import index_matches
+from .availability import bump_availability_version
+from .models import Venue, VenueReview
+from .ratings import adjust_venue_rating
+from .spatial import bump_spatial_version
+
+
+@receiver(pre_save, sender=Venue)
+def remember_venue_name(sender, instance, raw=False, using=None, update_fields=None, **kwargs):
+    """
+    이름이 바뀐 경우에만 매치를 다시 색인할 수 있도록 저장 전 이름을 기록
+    (평점 집계처럼 이름과 관계없는 update_fields면 조회하지 않음)
+    """
+    instance._previous_name = None
+    if instance.pk and not raw and (update_fields is None or 'name' in update_fields):
+        instance._previous_name = Venue.objects.using(using).filter(
+            pk=instance.pk
+        ).values_list('name', flat=True).first()
+
+
+@receiver(post_save, sender=Venue)
+def reindex_venue_matches(sender, instance, created=False, raw=False, using=None, **kwargs):
+    """
+    구장 이름이 바뀌면 해당 구장의 매치를 다시 색인
+    """
+    previous = getattr(instance, '_previous_name', None)
+    if raw or created or previous is None or previous == instance.name:
+        return
+    index_matches(Match.objects.using(using).filter(venue=instance))
+
+
+@receiver(post_save, sender=Venue)
+@receiver(post_delete, sender=Venue)
+def invalidate_match_feed(sender, using=None, **kwargs):
+    """
+    구장이 바뀌면 커밋 후 매치 목록 캐시 버전을 올림 (목록에 구장 이름이 포함됨)
+    """
+    transaction.on_commit(bump_feed_version, using=using)
+
+
+@receiver(post_save, sender=Venue)
+def invalidate_venue_availability(sender, instance, using=None, **kwargs):
+    """
+    운영 시간 등 구장 정보가 바뀌면 모든 날짜의 예약 현황 캐시 무효화
+    """
+    transaction.on_commit(lambda: bump_availability_version(instance.pk), using=using)
+
+
+@receiver(post_save, sender=Venue)
+@receiver(post_delete, sender=Venue)
+def invalidate_venue_spatial_index(sender, using=None, **kwargs):
+    """
+    구장이 추가/수정/삭제되면 커밋 후 공간 인덱스 버전을 올려 각 워커가 다시 만들게 함
+    """
+    transaction.on_commit(bump_spatial_version, using=using)
+
+
+@receiver(pre_save, sender=VenueReview)
+def remember_review_rating(sender, instance, raw=False, using=None, **kwargs):
+    """
+    리뷰 수정 시 평점 차이만 반영할 수 있도록 저장 전 (구장, 평점)을 기록
+    """
+    instance._previous_rating = None
+    if instance.pk and not raw:
+        instance._previous_rating = VenueReview.objects.using(using).filter(
+            pk=instance.pk
+        ).values_list('venue_id', 'rating').first()
+
+
+@receiver(post_save, sender=VenueReview)
+def apply_review_rating(sender, instance, created=False, raw=False, using=None, **kwargs):
+    """
+    리뷰 생성/수정 시 구장 평점 집계를 F 표현식으로 갱신
+    """
+    if raw:
+        return
+    previous = getattr(instance, '_previous_rating', None)
+    if created or previous is None:
+        adjust_venue_rating(instance.venue_id, instance.rating, 1, using)
+        return
+    venue_id, rating = previous
+    if venue_id != instance.venue_id:
+        adjust_venue_rating(venue_id, -rating, -1, using)
+        adjust_venue_rating(instance.venue_id, instance.rating, 1, using)
+    elif rating != instance.rating:
+        adjust_venue_rating(venue_id, instance.rating - rating, 0, using)
+
+
+@receiver(post_delete, sender=VenueReview)
+def remove_review_rating(sender, instance, using=None, **kwargs):
+    """
+    리뷰 삭제 시 구장 평점 집계에서 제외
+    """
+    adjust_venue_rating(instance.venue_id, -instance.rating, -1, using)
@@ -0,0 +1,191 @@
+"""
+구장 최근접/반경 검색용 프로세스 메모리 공간 인덱스
+
+좌표가 있는 구장을 단위 구 위의 3차원 점으로 바꿔 KD-트리(리프당 LEAF_SIZE개)에 담습니다.
+두 점 사이 직선(현) 거리는 대원 거리와 순서가 같으므로 날짜 변경선/극 근처에서도 정확합니다.
+검색은 노드 바운딩 박스까지의 최소 거리로 가지치기하는 최선 우선 탐색이라 k개를 찾으면
+나머지 노드는 보지 않으며, 표면/크기/편의시설 조건은 리프에서 함께 확인합니다.
+
+인덱스는 워커(프로세스)마다 처음 검색할 때 만들고, 구장이 바뀌면 시그널이 캐시의
+버전을 올려 다음 검색에서 다시 만듭니다. 검색 자체는 구장 테이블을 읽지 않습니다.
+"""
+import heapq
+import math
+import threading
+import time
+import numpy as np
+from django.core.cache import cache
+from .geo import EARTH_RADIUS_KM
+
+SPATIAL_VERSION_KEY = 'venues:spatial:version'
+LEAF_SIZE = 16
+
+AMENITY_FLAGS = {'has_parking': 1, 'has_shower': 2, 'has_locker': 4}
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_spatial_version():
+    version = cache.get(SPATIAL_VERSION_KEY)
+    if version is None:
+        cache.add(SPATIAL_VERSION_KEY, time.time_ns(), timeout=None)
+        version = cache.get(SPATIAL_VERSION_KEY)
+    return version
+
+
+def bump_spatial_version():
+    """
+    모든 워커의 공간 인덱스를 무효화 (다음 검색에서 다시 만듦)
+    """
+    try:
+        cache.incr(SPATIAL_VERSION_KEY)
+    except ValueError:
+        cache.set(SPATIAL_VERSION_KEY, time.time_ns(), timeout=None)
+
+
+def to_unit_vectors(latitudes, longitudes):
+    phi = np.radians(latitudes)
+    lam = np.radians(longitudes)
+    return np.column_stack((np.cos(phi) * np.cos(lam), np.cos(phi) * np.sin(lam), np.sin(phi)))
+
+
+def chord_to_km(chord):
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.minimum(chord / 2, 1.0))
+
+
+def km_to_chord(distance_km):
+    return 2 * math.sin(min(distance_km / (2 * EARTH_RADIUS_KM), math.pi / 2))
+
+
+class VenueSpatialIndex:
+    """
+    구장 KD-트리
+
+    점과 속성 배열은 트리 순서로 재배열해 각 리프가 연속 구간 [start, end)를 갖게 하고,
+    노드마다 바운딩 박스(최소/최대 좌표)를 저장합니다.
+    """
+
+    def __init__(self, rows, version=None):
+        # rows: (id, 위도, 경도, 표면, 크기, 편의시설 비트) 목록
+        self.version = version
+        ids, latitudes, longitudes, surfaces, sizes, amenities = list(zip(*rows)) or [()] * 6
+        self.ids = np.array(ids, dtype=np.int64)
+        self.points = to_unit_vectors(np.array(latitudes, dtype=np.float64), np.array(longitudes, dtype=np.float64))
+        self.surfaces = np.array(surfaces, dtype=object)
+        self.sizes = np.array(sizes, dtype=object)
+        self.amenities = np.array(amenities, dtype=np.int8)
+
+        self.lower, self.upper, self.children, self.ranges = [], [], [], []
+        order = np.arange(len(self.ids))
+        if len(order):
+            self._build(order, 0, len(order))
+        for name in ('ids', 'points', 'surfaces', 'sizes', 'amenities'):
+            setattr(self, name, getattr(self, name)[order])
+        self.lower = np.array(self.lower)
+        self.upper = np.array(self.upper)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def _build(self, order, start, end):
+        """
+        order[start:end]를 범위가 가장 넓은 축의 중앙값으로 나누며 노드를 만들고 노드 번호를 반환
+        """
+        node = len(self.children)
+        points = self.points[order[start:end]]
+        self.lower.append(points.min(axis=0))
+        self.upper.append(points.max(axis=0))
+        self.children.append(None)
+        self.ranges.append((start, end))
+        if end - start > LEAF_SIZE:
+            axis = int(np.argmax(self.upper[node] - self.lower[node]))
+            middle = (end - start) // 2
+            order[start:end] = order[start:end][np.argpartition(points[:, axis], middle)]
+            self.children[node] = (self._build(order, start, start + middle),
+                                   self._build(order, start + middle, end))
+        return node
+
+    def _box_distance(self, node, point):
+        gap = np.maximum(np.maximum(self.lower[node] - point, point - self.upper[node]), 0.0)
+        return float(np.sqrt(gap @ gap))
+
+    def _leaf_matches(self, start, end, point, surface_type, size, amenities):
+        """
+        리프 구간에서 조건에 맞는 (트리 위치, 현 거리) 배열
+        """
+        mask = np.ones(end - start, dtype=bool)
+        if surface_type:
+            mask &= self.surfaces[start:end] == surface_type
+        if size:
+            mask &= self.sizes[start:end] == size
+        if amenities:
+            mask &= (self.amenities[start:end] & amenities) == amenities
+        positions = np.flatnonzero(mask) + start
+        offsets = self.points[positions] - point
+        return positions, np.sqrt(np.einsum('ij,ij->i', offsets, offsets))
+
+    def search(self, latitude, longitude, k=None, radius_km=None, surface_type=None, size=None, amenities=0):
+        """
+        가까운 순 [(구장 id, 거리(km)), ...]
+
+        k만 주면 최근접 k개, radius_km만 주면 반경 안 전체, 둘 다 주면 반경 안에서 최근접 k개입니다.
+        """
+        if not len(self):
+            return []
+        point = to_unit_vectors(np.array([latitude]), np.array([longitude]))[0]
+        bound = km_to_chord(radius_km) if radius_km is not None else math.inf
+        found = []  # k가 있으면 (-거리, 위치) 최대 힙
+        nodes = [(self._box_distance(0, point), 0)]
+        while nodes:
+            distance, node = heapq.heappop(nodes)
+            if distance > bound:
+                break
+            if self.children[node] is not None:
+                for child in self.children[node]:
+                    child_distance = self._box_distance(child, point)
+                    if child_distance <= bound:
+                        heapq.heappush(nodes, (child_distance, child))
+                continue
+            positions, distances = self._leaf_matches(*self.ranges[node], point, surface_type, size, amenities)
+            for position, chord in zip(positions.tolist(), distances.tolist()):
+                if chord > bound:
+                    continue
+                if k is None:
+                    found.append((-chord, position))
+                elif len(found) < k:
+                    heapq.heappush(found, (-chord, position))
+                elif chord < -found[0][0]:
+                    heapq.heapreplace(found, (-chord, position))
+            if k is not None and len(found) == k:
+                # k개를 찾은 뒤에는 현재 k번째보다 먼 노드를 볼 필요가 없음
+                bound = -found[0][0]
+        found.sort(reverse=True)
+        return [(int(self.ids[position]), float(chord_to_km(-negative))) for negative, position in found]
+
+
+def build_index(version=None):
+    from .models import Venue
+
+    rows = []
+    for pk, latitude, longitude, surface_type, size, *flags in Venue.objects.filter(
+        latitude__isnull=False, longitude__isnull=False
+    ).values_list('pk', 'latitude', 'longitude', 'surface_type', 'size', *AMENITY_FLAGS):
+        amenities = sum(flag for flag, enabled in zip(AMENITY_FLAGS.values(), flags) if enabled)
+        rows.append((pk, latitude, longitude, surface_type, size, amenities))
+    return VenueSpatialIndex(rows, version)
+
+
+def get_venue_index():
+    """
+    현재 버전의 공간 인덱스 (버전이 바뀌었으면 다시 만듦)
+    """
+    global _index
+    version = get_spatial_version()
+    index = _index
+    if index is None or index.version != version:
+        with _index_lock:
+            if _index is None or _index.version != version:
+                _index = build_index(version)
+            index = _index
+    return index
@@ -0,0 +1,117 @@
+"""
+구장 일간 통계 집계
+
+매치/참가자 테이블을 (구장, 날짜) 단위로 집계해 VenueDailyStats에 저장합니다.
+지난 날짜는 매일 밤 tasks.refresh_recent_venue_stats가 최근 며칠을 다시 집계하고
+(경기 후 출석/불참 체크 반영), 오늘 날짜는 매치/참가자 변경 시 해당 (구장, 날짜)만
+다시 집계합니다. 오늘 통계 갱신은 요청 안에서 하지 않고 구장별로 STATS_REFRESH_DELAY초
+동안의 변경을 모아 Celery 작업 한 번으로 처리합니다. 전체 이력은 backfill_venue_stats
+명령으로 채웁니다.
+"""
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, DecimalField, ExpressionWrapper, F, Q, Sum
+from django.utils import timezone
+from .models import VenueDailyStats
+
+STATS_FIELDS = ('matches_count', 'canceled_count', 'capacity', 'registrations', 'attended', 'noshows', 'revenue')
+
+# 경기 후 출석 체크가 늦게 반영되는 것을 고려해 매일 다시 집계하는 기간(일)
+VENUE_STATS_LOOKBACK_DAYS = 3
+
+# 오늘 통계 갱신을 모으는 시간(초)
+STATS_REFRESH_DELAY = 30
+
+
+def aggregate_daily_stats(date_from, date_to, venue_ids=None):
+    """
+    기간 내 {(구장 id, 날짜): 통계 dict} 계산 (집계 쿼리 2번)
+
+    취소된 매치는 매치 수/취소 수에만 포함하고 정원/참가/매출/출석에서는 제외합니다.
+    """
+    from matches.models import Match, MatchParticipant
+
+    matches = Match.objects.filter(date__range=(date_from, date_to))
+    participants = MatchParticipant.objects.filter(
+        match__date__range=(date_from, date_to)
+    ).exclude(match__status='CANCELED')
+    if venue_ids is not None:
+        matches = matches.filter(venue_id__in=venue_ids)
+        participants = participants.filter(match__venue_id__in=venue_ids)
+
+    active = ~Q(status='CANCELED')
+    revenue = ExpressionWrapper(F('price') * F('registered_count'),
+                                output_field=DecimalField(max_digits=14, decimal_places=2))
+    stats = {}
+    for row in matches.order_by().values('venue_id', 'date').annotate(
+        matches_count=Count('id'),
+        canceled_count=Count('id', filter=Q(status='CANCELED')),
+        capacity=Sum('max_players', filter=active, default=0),
+        registrations=Sum('registered_count', filter=active, default=0),
+        revenue=Sum(revenue, filter=active, default=0),
+    ):
+        key = (row.pop('venue_id'), row.pop('date'))
+        stats[key] = dict(row, attended=0, noshows=0)
+
+    for row in participants.order_by().values('match__venue_id', 'match__date').annotate(
+        attended=Count('id', filter=Q(status='ATTENDED')),
+        noshows=Count('id', filter=Q(status='NOSHOW')),
+    ):
+        key = (row['match__venue_id'], row['match__date'])
+        if key in stats:
+            stats[key].update(attended=row['attended'], noshows=row['noshows'])
+    return stats
+
+
+def refresh_daily_stats(date_from, date_to, venue_ids=None):
+    """
+    기간 내 통계를 다시 집계해 저장하고 저장한 행 수를 반환
+
+    (구장, 날짜) 유니크 제약으로 upsert한 뒤, 이번 갱신에서 다시 쓰지 않은 칸
+    (매치가 모두 없어진 날짜)을 지웁니다. 트랜잭션을 쓰기로 시작하므로 SQLite에서도
+    여러 갱신이 동시에 실행될 때 잠금 승격 충돌이 생기지 않습니다.
+    """
+    stats = aggregate_daily_stats(date_from, date_to, venue_ids)
+    started = timezone.now()
+    stale = VenueDailyStats.objects.filter(date__range=(date_from, date_to), refreshed_at__lt=started)
+    if venue_ids is not None:
+        stale = stale.filter(venue_id__in=venue_ids)
+
+    with transaction.atomic():
+        VenueDailyStats.objects.bulk_create(
+            [VenueDailyStats(venue_id=venue_id, date=day, **values) for (venue_id, day), values in stats.items()],
+            batch_size=1000,
+            update_conflicts=True,
+            unique_fields=['venue', 'date'],
+            update_fields=[*STATS_FIELDS, 'refreshed_at'],
+        )
+        stale.delete()
+    return len(stats)
+
+
+def pending_refresh_key(venue_id, day):
+    return f'venues:stats:pending:{venue_id}:{day.isoformat()}'
+
+
+def refresh_today_stats(venue_id):
+    """
+    해당 구장의 오늘 통계만 다시 집계 (예약 표시를 먼저 지워 집계 중 들어온 변경은 다시 예약되게 함)
+    """
+    today = timezone.localdate()
+    cache.delete(pending_refresh_key(venue_id, today))
+    refresh_daily_stats(today, today, [venue_id])
+
+
+def schedule_today_stats_refresh(venue_id, days):
+    """
+    days 중 오늘 날짜가 있으면 해당 구장의 오늘 통계 갱신을 예약 (이미 예약돼 있으면 생략)
+
+    커밋 후에 호출합니다.
+    """
+    from .tasks import refresh_today_venue_stats
+
+    today = timezone.localdate()
+    if today not in set(days):
+        return
+    if cache.add(pending_refresh_key(venue_id, today), 1, timeout=STATS_REFRESH_DELAY * 2):
+        refresh_today_venue_stats.apply_async(args=[venue_id], countdown=STATS_REFRESH_DELAY)
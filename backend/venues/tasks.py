@@ -0,0 +1,28 @@
+import logging
+from datetime import timedelta
+from celery import shared_task
+from django.utils import timezone
+from .stats import VENUE_STATS_LOOKBACK_DAYS, refresh_daily_stats, refresh_today_stats
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def refresh_recent_venue_stats(days=VENUE_STATS_LOOKBACK_DAYS):
+    """
+    최근 days일(오늘 포함)의 구장 일간 통계를 다시 집계 (매일 밤 실행)
+
+    마감된 날짜의 늦은 출석/불참 체크를 반영하고 새로 시작된 오늘 통계를 만듭니다.
+    """
+    today = timezone.localdate()
+    refreshed = refresh_daily_stats(today - timedelta(days=days), today)
+    logger.info('구장 일간 통계 갱신: %s ~ %s, %d건', today - timedelta(days=days), today, refreshed)
+    return refreshed
+
+
+@shared_task
+def refresh_today_venue_stats(venue_id):
+    """
+    매치/참가자 변경 후 예약된 구장의 오늘 통계 갱신
+    """
+    refresh_today_stats(venue_id)
@@ -1,3 +1,323 @@
+import io
+from datetime import date, time
+from decimal import Decimal
+from unittest import mock
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
 from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from matches.models import Match, MatchParticipant
+from .models import Venue, VenueDailyStats, VenueReview
+from .stats import STATS_REFRESH_DELAY, refresh_daily_stats
+from .tasks import refresh_today_venue_stats
 
-# Create your tests here.
+User = get_user_model()
+
+
+class VenueAvailabilityTests(TestCase):
+    """
+    구장 예약 현황 계산과 캐시 무효화 검사
+    """
+    def setUp(self):
+        cache.clear()
+        self.host = User.objects.create_user(username='host', password=None)
+        self.venue = Venue.objects.create(name='보라매 구장', address='서울', surface_type='ARTIFICIAL', size='6',
+                                          opening_time=time(8), closing_time=time(23))
+        self.client = APIClient()
+        self.client.force_authenticate(self.host)
+        self.url = reverse('venues:venue_availability', args=[self.venue.pk])
+
+    def create_match(self, day, start, end, **kwargs):
+        with self.captureOnCommitCallbacks(execute=True):
+            return Match.objects.create(title='매치', match_type='SOCIAL', venue=self.venue, date=day,
+                                        start_time=start, end_time=end, max_players=10, price=10000,
+                                        host=self.host, **kwargs)
+
+    def get_days(self, **params):
+        response = self.client.get(self.url, {'date_from': '2030-01-01', 'date_to': '2030-01-02', **params})
+        self.assertEqual(response.status_code, 200)
+        return response.data['days']
+
+    def test_intervals_are_merged_into_free_and_booked_slots(self):
+        first = self.create_match(date(2030, 1, 1), time(10), time(12))
+        second = self.create_match(date(2030, 1, 1), time(12), time(13))
+        third = self.create_match(date(2030, 1, 1), time(13), time(14))
+        self.create_match(date(2030, 1, 1), time(12), time(14), status='CANCELED')
+        self.create_match(date(2030, 1, 1), time(22), time(1))
+
+        day, next_day = self.get_days()
+        self.assertEqual(day['booked'][0], {'start': '10:00', 'end': '14:00',
+                                            'match_ids': [first.pk, second.pk, third.pk]})
+        self.assertEqual(day['booked'][1]['end'], '24:00')
+        self.assertEqual(day['free'], [{'start': '08:00', 'end': '10:00'}, {'start': '14:00', 'end': '22:00'}])
+        self.assertEqual(next_day['free'], [{'start': '08:00', 'end': '23:00'}])
+
+    def test_cached_days_skip_query_and_match_changes_invalidate(self):
+        self.get_days()
+        with self.assertNumQueries(1):  # 구장 조회만 수행
+            self.get_days()
+
+        match = self.create_match(date(2030, 1, 2), time(9), time(11))
+        self.assertEqual(self.get_days()[1]['booked'][0]['match_ids'], [match.pk])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            match.date = date(2030, 1, 1)
+            match.save()
+        day, next_day = self.get_days()
+        self.assertEqual(day['booked'][0]['match_ids'], [match.pk])
+        self.assertEqual(next_day['booked'], [])
+
+    def test_overnight_match_spills_into_next_day(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.venue.opening_time = self.venue.closing_time = time(0)  # 24시간 운영
+            self.venue.save()
+        earlier = self.create_match(date(2029, 12, 31), time(23), time(1))
+        self.get_days()  # 다음 날 현황이 캐시된 상태에서도 무효화되는지 확인
+        match = self.create_match(date(2030, 1, 1), time(22), time(2))
+
+        day, next_day = self.get_days()
+        self.assertEqual(day['booked'], [{'start': '00:00', 'end': '01:00', 'match_ids': [earlier.pk]},
+                                         {'start': '22:00', 'end': '24:00', 'match_ids': [match.pk]}])
+        self.assertEqual(next_day['booked'], [{'start': '00:00', 'end': '02:00', 'match_ids': [match.pk]}])
+        self.assertEqual(next_day['free'], [{'start': '02:00', 'end': '24:00'}])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            match.end_time = time(23, 30)
+            match.save()
+        self.assertEqual(self.get_days()[1]['booked'], [])
+
+    def test_late_write_after_invalidation_is_not_served(self):
+        original_set_many = cache.set_many
+        created = []
+
+        def set_many(data, *args, **kwargs):
+            if not created:
+                # 현황 계산 뒤 캐시에 쓰기 전에 다른 요청의 매치 생성이 커밋되고 무효화됨
+                created.append(self.create_match(date(2030, 1, 1), time(9), time(11)))
+            return original_set_many(data, *args, **kwargs)
+
+        with mock.patch.object(cache, 'set_many', set_many):
+            self.assertEqual(self.get_days()[0]['booked'], [])
+        self.assertEqual([block['match_ids'] for block in self.get_days()[0]['booked']], [[created[0].pk]])
+
+    def test_range_is_limited(self):
+        response = self.client.get(self.url, {'date_from': '2030-01-01', 'date_to': '2030-03-01'})
+        self.assertEqual(response.status_code, 400)
+
+
+class VenueDailyStatsTests(TestCase):
+    """
+    구장 일간 통계 집계와 오늘 통계 실시간 갱신 검사
+    """
+    def setUp(self):
+        self.admin = User.objects.create_user(username='admin', password=None, is_staff=True)
+        self.venue = Venue.objects.create(name='난지 구장', address='서울', surface_type='GRASS', size='11',
+                                          opening_time=time(0), closing_time=time(0))
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def create_match(self, day, hour, **kwargs):
+        return Match.objects.create(title='매치', match_type='SOCIAL', venue=self.venue, date=day,
+                                    start_time=time(hour), end_time=time(hour + 1), max_players=10,
+                                    price=Decimal('10000'), host=self.admin, **kwargs)
+
+    def test_refresh_aggregates_and_removes_empty_days(self):
+        day = date(2024, 5, 1)
+        match = self.create_match(day, 10, registered_count=4)
+        self.create_match(day, 12, registered_count=6)
+        self.create_match(day, 14, registered_count=3, status='CANCELED')
+        players = [User.objects.create_user(username=f'p{i}', password=None) for i in range(3)]
+        for player, status in zip(players, ['ATTENDED', 'ATTENDED', 'NOSHOW']):
+            MatchParticipant.objects.create(match=match, user=player, status=status)
+
+        self.assertEqual(refresh_daily_stats(day, day), 1)
+        stats = VenueDailyStats.objects.get(venue=self.venue, date=day)
+        self.assertEqual(
+            (stats.matches_count, stats.canceled_count, stats.capacity, stats.registrations,
+             stats.attended, stats.noshows, stats.revenue),
+            (3, 1, 20, 10, 2, 1, Decimal('100000')),
+        )
+        self.assertEqual(stats.fill_rate, 0.5)
+
+        response = self.client.get(reverse('venues:venue_daily_stats'), {'date_from': day, 'date_to': day})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['totals']['registrations'], 10)
+        self.assertEqual(len(response.data['days']), 1)
+
+        Match.objects.filter(date=day).delete()
+        self.assertEqual(refresh_daily_stats(day, day), 0)
+        self.assertFalse(VenueDailyStats.objects.exists())
+
+    def test_today_is_updated_on_change(self):
+        today = timezone.localdate()
+        with self.captureOnCommitCallbacks(execute=True):
+            match = self.create_match(today, 18)
+        with self.captureOnCommitCallbacks(execute=True):
+            MatchParticipant.objects.create(match=match, user=self.admin, status='NOSHOW')
+        stats = VenueDailyStats.objects.get(venue=self.venue, date=today)
+        self.assertEqual((stats.matches_count, stats.noshows), (1, 1))
+
+    def test_today_refresh_is_deferred_and_coalesced(self):
+        cache.clear()
+        today = timezone.localdate()
+        match = self.create_match(today, 18)
+        players = [User.objects.create_user(username=f'p{index}', password=None) for index in range(3)]
+        with mock.patch('venues.tasks.refresh_today_venue_stats.apply_async') as apply_async:
+            with self.captureOnCommitCallbacks(execute=True):
+                MatchParticipant.objects.create(match=match, user=players[0])
+            with self.captureOnCommitCallbacks(execute=True):
+                MatchParticipant.objects.create(match=match, user=players[1])
+        # 요청 안에서는 집계하지 않고, 구장당 작업 한 번만 예약
+        self.assertFalse(VenueDailyStats.objects.exists())
+        apply_async.assert_called_once_with(args=[self.venue.pk], countdown=STATS_REFRESH_DELAY)
+
+        refresh_today_venue_stats(self.venue.pk)
+        self.assertTrue(VenueDailyStats.objects.filter(venue=self.venue, date=today).exists())
+        # 작업이 실행된 뒤의 변경은 다시 예약
+        with mock.patch('venues.tasks.refresh_today_venue_stats.apply_async') as apply_async:
+            with self.captureOnCommitCallbacks(execute=True):
+                MatchParticipant.objects.create(match=match, user=players[2])
+        apply_async.assert_called_once()
+
+
+class VenueSearchTests(TestCase):
+    """
+    공간 인덱스 기반 구장 최근접/반경 검색 검사
+    """
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='player', password=None)
+
+        def venue(name, latitude, longitude, **extra):
+            return Venue.objects.create(**{
+                'name': name, 'address': '서울', 'surface_type': 'ARTIFICIAL', 'size': '11',
+                'latitude': latitude, 'longitude': longitude,
+                'opening_time': time(6), 'closing_time': time(23), **extra,
+            })
+        venue('시청 구장', 37.5663, 126.9779, has_parking=True)
+        venue('상암 구장', 37.5683, 126.8972, has_parking=True, has_shower=True)
+        venue('잠실 구장', 37.5145, 127.0736, surface_type='GRASS')
+        venue('수원 구장', 37.2867, 127.0369, has_parking=True, has_shower=True)
+        venue('부산 구장', 35.1796, 129.0756, size='5')
+        venue('주소 미상 구장', None, None)
+
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.url = reverse('venues:venue_search')
+
+    def names(self, params):
+        response = self.client.get(self.url, {'lat': 37.5665, 'lng': 126.9780, **params})
+        self.assertEqual(response.status_code, 200)
+        return [row['name'] for row in response.data['results']]
+
+    def test_nearest_and_radius_queries_with_filters(self):
+        self.assertEqual(self.names({'k': 3}), ['시청 구장', '상암 구장', '잠실 구장'])
+        self.assertEqual(self.names({'radius_km': 15}), ['시청 구장', '상암 구장', '잠실 구장'])
+        self.assertEqual(self.names({'has_parking': 'true', 'has_shower': 'true'}), ['상암 구장', '수원 구장'])
+        self.assertEqual(self.names({'surface_type': 'GRASS'}), ['잠실 구장'])
+        self.assertEqual(self.names({'size': '5', 'radius_km': 100}), [])
+
+        response = self.client.get(self.url, {'lat': 37.5665, 'lng': 126.9780, 'k': 1})
+        self.assertAlmostEqual(response.data['results'][0]['distance_km'], 0.02, delta=0.01)
+        self.assertEqual(self.client.get(self.url, {'lat': 37.5665}).status_code, 400)
+
+    def test_warm_index_skips_venue_scan_and_rebuilds_after_change(self):
+        self.names({})
+        # 결과 구장 본문만 조회
+        with self.assertNumQueries(1):
+            self.names({'k': 2})
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Venue.objects.create(name='광화문 구장', address='서울', surface_type='ARTIFICIAL', size='11',
+                                 latitude=37.5700, longitude=126.9768,
+                                 opening_time=time(6), closing_time=time(23))
+        self.assertEqual(self.names({'k': 2}), ['시청 구장', '광화문 구장'])
+
+    def test_facet_counts_exclude_own_filter_and_are_cached(self):
+        self.names({})
+        params = {'lat': 37.5665, 'lng': 126.9780, 'radius_km': 50, 'has_parking': 'true'}
+        # 결과 구장 조회 + 패싯 집계 한 번
+        with self.assertNumQueries(2):
+            facets = self.client.get(self.url, params).data['facets']
+        surfaces = {row['value']: row['count'] for row in facets['surface_type']}
+        self.assertEqual(surfaces, {'GRASS': 0, 'ARTIFICIAL': 3, 'FUTSAL': 0})
+        parking = {row['value']: row['count'] for row in facets['has_parking']}
+        self.assertEqual(parking, {True: 3, False: 1})
+        self.assertEqual({row['value']: row['count'] for row in facets['size']}['11'], 3)
+
+        with self.assertNumQueries(1):
+            self.assertEqual(self.client.get(self.url, params).data['facets'], facets)
+
+        # 반경이 없으면 좌표가 있는 전체 구장 기준
+        facets = self.client.get(self.url, {'lat': 37.5665, 'lng': 126.9780}).data['facets']
+        self.assertEqual({row['value']: row['count'] for row in facets['size']}['5'], 1)
+
+
+class VenueRatingAggregateTests(TestCase):
+    """
+    리뷰 평점 집계 컬럼 갱신, 평점순 목록, 보정 명령 검사
+    """
+    def setUp(self):
+        self.users = [User.objects.create_user(username=f'reviewer{i}', password=None) for i in range(3)]
+        self.venues = [
+            Venue.objects.create(name=name, address='서울', surface_type='GRASS', size='11',
+                                 opening_time=time(6), closing_time=time(23))
+            for name in ('상암 구장', '잠실 구장', '목동 구장')
+        ]
+        self.client = APIClient()
+        self.client.force_authenticate(self.users[0])
+
+    def review(self, venue, user, rating):
+        return VenueReview.objects.create(venue=venue, user=user, rating=rating, comment='좋아요')
+
+    def test_aggregates_follow_review_changes(self):
+        venue = self.venues[0]
+        first = self.review(venue, self.users[0], 5)
+        second = self.review(venue, self.users[1], 3)
+        venue.refresh_from_db()
+        self.assertEqual((venue.rating_sum, venue.review_count, venue.average_rating), (8, 2, 4.0))
+
+        second.rating = 1
+        second.save()
+        first.venue = self.venues[1]
+        first.save()
+        venue.refresh_from_db()
+        self.assertEqual((venue.rating_sum, venue.review_count), (1, 1))
+        self.venues[1].refresh_from_db()
+        self.assertEqual((self.venues[1].rating_sum, self.venues[1].review_count), (5, 1))
+
+        second.delete()
+        venue.refresh_from_db()
+        self.assertEqual((venue.rating_sum, venue.review_count, venue.average_rating), (0, 0, 0))
+
+    def test_list_sorts_by_rating_without_reading_reviews(self):
+        self.review(self.venues[1], self.users[0], 5)
+        self.review(self.venues[2], self.users[0], 4)
+        self.review(self.venues[2], self.users[1], 2)
+        # 페이지 COUNT와 목록 조회만 실행
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse('venues:venue_list'))
+        self.assertEqual([row['name'] for row in response.data['results']], ['잠실 구장', '목동 구장', '상암 구장'])
+        self.assertEqual(response.data['results'][1]['average_rating'], 3.0)
+
+        response = self.client.get(reverse('venues:venue_list'), {'ordering': 'rating'})
+        self.assertEqual(response.data['results'][0]['name'], '상암 구장')
+
+    def test_reconcile_command_fixes_drift(self):
+        self.review(self.venues[0], self.users[0], 4)
+        Venue.objects.filter(pk=self.venues[1].pk).update(rating_sum=9, review_count=2)
+        VenueReview.objects.filter(venue=self.venues[0]).update(rating=2)
+
+        call_command('reconcile_venue_ratings', '--dry-run', stdout=io.StringIO())
+        self.assertEqual(Venue.objects.get(pk=self.venues[1].pk).review_count, 2)
+
+        output = io.StringIO()
+        call_command('reconcile_venue_ratings', stdout=output)
+        self.assertIn('2개 구장', output.getvalue())
+        self.assertEqual(
+            list(Venue.objects.order_by('pk').values_list('rating_sum', 'review_count')),
+            [(2, 1), (0, 0), (0, 0)],
+        )
@@ -8,6 +8,8 @@ urlpatterns = [
     path('', views.VenueListView.as_view(), name='venue_list'),
     path('<int:pk>/', views.VenueDetailView.as_view(), name='venue_detail'),
     path('search/', views.VenueSearchView.as_view(), name='venue_search'),
+    path('stats/', views.VenueDailyStatsView.as_view(), name='venue_daily_stats'),
+    path('<int:venue_id>/availability/', views.VenueAvailabilityView.as_view(), name='venue_availability'),
     
     # 구장 리뷰 관련 URL
     path('<int:venue_id>/reviews/', views.VenueReviewListView.as_view(), name='venue_review_list'),
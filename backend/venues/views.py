@@ -1,20 +1,79 @@
-from django.shortcuts import render
-from rest_framework import generics, permissions
+from django.db.models import Prefetch, Sum
+from django.shortcuts import render, get_object_or_404
+from rest_framework import filters, generics, permissions
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from .availability import get_availability
+from .facets import get_facets
+from .models import Venue, VenueDailyStats, VenueReview, average_rating_expression
+from .serializers import (
+    VenueAvailabilityQuerySerializer, VenueDailyStatsSerializer, VenueListSerializer, VenueSearchQuerySerializer,
+    VenueSearchResultSerializer, VenueSerializer, VenueStatsQuerySerializer,
+)
+from .spatial import AMENITY_FLAGS, get_venue_index
+from .stats import STATS_FIELDS
 
 # Create your views here.
 
 # 임시 뷰 클래스 (나중에 구현 예정)
 class VenueListView(generics.ListAPIView):
+    """
+    구장 목록 뷰 (기본 평균 평점 높은 순)
+
+    평균 평점은 집계 컬럼으로 계산하므로 리뷰 테이블을 읽지 않고,
+    rating 정렬은 venue_rating_idx 인덱스와 같은 식을 사용합니다.
+    """
     permission_classes = [permissions.IsAuthenticated]
+    serializer_class = VenueListSerializer
+    filter_backends = [filters.OrderingFilter]
+    ordering_fields = ['rating', 'review_count', 'name', 'hourly_rate']
+    ordering = ['-rating', '-id']
     
     def get_queryset(self):
-        return []  # 임시로 빈 리스트 반환
+        return Venue.objects.annotate(rating=average_rating_expression())
 
 class VenueDetailView(generics.RetrieveAPIView):
+    """
+    구장 상세 뷰
+    """
     permission_classes = [permissions.IsAuthenticated]
+    serializer_class = VenueSerializer
+    queryset = Venue.objects.prefetch_related(
+        'images', Prefetch('reviews', queryset=VenueReview.objects.select_related('user'))
+    )
+
+class VenueSearchView(APIView):
+    """
+    구장 최근접/반경 검색 뷰
 
-class VenueSearchView(generics.ListAPIView):
+    프로세스 메모리 공간 인덱스로 후보 id와 거리를 구한 뒤 결과 구장만 DB에서 읽습니다.
+    표면/크기/편의시설별 개수(facets)는 조건부 집계 쿼리 한 번으로 계산해 조건별로 캐시합니다.
+    """
     permission_classes = [permissions.IsAuthenticated]
+    
+    def get(self, request):
+        serializer = VenueSearchQuerySerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        params = serializer.validated_data
+        found = get_venue_index().search(
+            params['lat'], params['lng'], k=params['k'], radius_km=params.get('radius_km'),
+            surface_type=params.get('surface_type'), size=params.get('size'),
+            amenities=sum(flag for field, flag in AMENITY_FLAGS.items() if params[field]),
+        )
+        
+        venues = Venue.objects.in_bulk([venue_id for venue_id, _ in found])
+        results = []
+        for venue_id, distance in found:
+            venue = venues.get(venue_id)
+            if venue is None:
+                continue  # 인덱스 갱신 전에 삭제된 구장
+            venue.distance_km = round(distance, 3)
+            results.append(venue)
+        return Response({
+            'count': len(results),
+            'results': VenueSearchResultSerializer(results, many=True).data,
+            'facets': get_facets(params),
+        })
 
 class VenueReviewListView(generics.ListAPIView):
     permission_classes = [permissions.IsAuthenticated]
@@ -27,3 +86,54 @@ class VenueReviewDetailView(generics.RetrieveUpdateDestroyAPIView):
 
 class VenueImageListView(generics.ListAPIView):
     permission_classes = [permissions.IsAuthenticated]
+
+
+class VenueAvailabilityView(APIView):
+    """
+    구장 날짜별 예약/빈 시간대 조회 뷰
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    
+    def get(self, request, venue_id):
+        venue = get_object_or_404(Venue, id=venue_id)
+        serializer = VenueAvailabilityQuerySerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        date_from = serializer.validated_data['date_from']
+        date_to = serializer.validated_data['date_to']
+        return Response({
+            'venue': venue.id,
+            'date_from': date_from,
+            'date_to': date_to,
+            'days': get_availability(venue, date_from, date_to),
+        })
+
+class VenueDailyStatsView(APIView):
+    """
+    구장 일간 통계 조회 뷰 (관리자 전용)
+
+    미리 집계된 VenueDailyStats만 읽으며, 기간 합계로 전체 참가율/불참률도 함께 반환합니다.
+    """
+    permission_classes = [permissions.IsAdminUser]
+    
+    def get(self, request):
+        serializer = VenueStatsQuerySerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        date_from = serializer.validated_data['date_from']
+        date_to = serializer.validated_data['date_to']
+        venue_id = serializer.validated_data.get('venue')
+        
+        queryset = VenueDailyStats.objects.filter(date__range=(date_from, date_to)).select_related('venue')
+        if venue_id is not None:
+            queryset = queryset.filter(venue_id=venue_id)
+        totals = VenueDailyStats(**queryset.aggregate(**{field: Sum(field, default=0) for field in STATS_FIELDS}))
+        return Response({
+            'venue': venue_id,
+            'date_from': date_from,
+            'date_to': date_to,
+            'totals': {
+                **{field: getattr(totals, field) for field in STATS_FIELDS},
+                'fill_rate': totals.fill_rate,
+                'noshow_rate': totals.noshow_rate,
+            },
+            'days': VenueDailyStatsSerializer(queryset, many=True).data,
+        })